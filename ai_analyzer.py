@@ -1,20 +1,24 @@
 import json
 from typing import Dict, Optional, List
-from openai import AzureOpenAI
-from azure.ai.inference import ChatCompletionsClient
-from azure.ai.inference.models import SystemMessage, UserMessage
-from azure.core.credentials import AzureKeyCredential
 import config
+from profiling import profiler
 
 # AIDEV-NOTE: AI analyzer using Azure OpenAI and DeepSeek for startup analysis
 # Follows the configuration from CLAUDE.md
+# SDKs are imported inside the branch that needs them - each run only loads one of them
 
 class AIAnalyzer:
     def __init__(self, use_deepseek: bool = False):
         self.use_deepseek = use_deepseek
         
+        # Usage counters for budget enforcement
+        self.reset_usage()
+        
         if use_deepseek:
             # Initialize DeepSeek client
+            from azure.ai.inference import ChatCompletionsClient
+            from azure.core.credentials import AzureKeyCredential
+            
             self.client = ChatCompletionsClient(
                 endpoint=config.AZURE_DEEPSEEK_ENDPOINT,
                 credential=AzureKeyCredential(config.AZURE_DEEPSEEK_API_KEY),
@@ -23,6 +27,8 @@ class AIAnalyzer:
             self.model_name = config.DEEPSEEK_MODEL
         else:
             # Initialize Azure OpenAI client
+            from openai import AzureOpenAI
+            
             self.client = AzureOpenAI(
                 api_version=config.API_VERSION,
                 azure_endpoint=config.AZURE_OPENAI_ENDPOINT,
@@ -30,6 +36,41 @@ class AIAnalyzer:
             )
             self.deployment = config.GPT_4_1_DEPLOYMENT  # Using GPT-4.1 for better analysis
     
+    def reset_usage(self):
+        """Start a fresh per-run budget"""
+        self.requests_made = 0
+        self.tokens_used = 0
+        self.consecutive_errors = 0
+    
+    def is_failing(self) -> bool:
+        """The API keeps failing (quota, rate limit, outage) - leave the rest for the next run"""
+        return self.consecutive_errors >= config.LLM_MAX_CONSECUTIVE_ERRORS
+    
+    def has_budget(self) -> bool:
+        """Check whether another analysis fits in the configured request/token budget"""
+        if self.is_failing():
+            return False
+        
+        if config.LLM_REQUEST_BUDGET and self.requests_made >= config.LLM_REQUEST_BUDGET:
+            return False
+        
+        if config.LLM_TOKEN_BUDGET:
+            # Reserve the average cost of a request so we don't overshoot the cap
+            expected = (self.tokens_used / self.requests_made if self.requests_made
+                        else config.LLM_TOKENS_PER_REQUEST)
+            if self.tokens_used + expected > config.LLM_TOKEN_BUDGET:
+                return False
+        
+        return True
+    
+    def _record_usage(self, response):
+        self.requests_made += 1
+        usage = getattr(response, 'usage', None)
+        tokens = getattr(usage, 'total_tokens', 0) or config.LLM_TOKENS_PER_REQUEST
+        self.tokens_used += tokens
+        profiler.incr('llm.requests')
+        profiler.incr('llm.tokens', tokens)
+    
     def analyze_startup(self, post: Dict) -> Optional[Dict]:
         """
         Analyze a HN post to extract startup information
@@ -38,6 +79,7 @@ class AIAnalyzer:
             Dict with analysis results or None if error
         """
         prompt = self._create_analysis_prompt(post)
+        requests_before = self.requests_made
         
         try:
             if self.use_deepseek:
@@ -46,9 +88,16 @@ class AIAnalyzer:
                 response = self._call_openai(prompt)
             
             # Parse JSON response
-            return self._parse_response(response)
+            analysis = self._parse_response(response)
+            self.consecutive_errors = 0
+            return analysis
             
         except Exception as e:
+            # Failed calls count against the request budget too
+            if self.requests_made == requests_before:
+                self.requests_made += 1
+            self.consecutive_errors += 1
+            profiler.incr('llm.errors')
             print(f"Error analyzing post {post.get('id')}: {e}")
             return None
     
@@ -105,6 +154,7 @@ Set type="other" if it's just news about existing companies or not a technical i
 
         return prompt
     
+    @profiler.timed('llm.openai')
     def _call_openai(self, prompt: str) -> str:
         """Call Azure OpenAI API"""
         response = self.client.chat.completions.create(
@@ -123,11 +173,15 @@ Set type="other" if it's just news about existing companies or not a technical i
             model=self.deployment,
             response_format={"type": "json_object"}  # Force JSON response
         )
+        self._record_usage(response)
         
         return response.choices[0].message.content
     
+    @profiler.timed('llm.deepseek')
     def _call_deepseek(self, prompt: str) -> str:
         """Call DeepSeek API"""
+        from azure.ai.inference.models import SystemMessage, UserMessage
+        
         response = self.client.complete(
             messages=[
                 SystemMessage(content="You are an expert startup analyst. Analyze Hacker News posts to identify promising startups. Always respond with valid JSON."),
@@ -137,6 +191,7 @@ Set type="other" if it's just news about existing companies or not a technical i
             model=self.model_name,
             temperature=0.3
         )
+        self._record_usage(response)
         
         return response.choices[0].message.content
     
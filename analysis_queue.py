@@ -0,0 +1,114 @@
+import os
+import json
+import math
+import time
+import heapq
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+import config
+
+# AIDEV-NOTE: Persistent priority queue of candidates waiting for LLM analysis
+# Ordered by a signal score (detector score, velocity, engagement) so the best posts
+# are analyzed first; whatever the run's budget doesn't cover rolls forward to the next run.
+
+def signal_score(post: Dict) -> float:
+    """Combine detector score, score velocity and engagement into one priority"""
+    weights = config.SIGNAL_WEIGHTS
+    engagement = post.get('score', 0) + 2 * post.get('descendants', 0)
+    return (
+        weights['detector'] * post.get('startup_score', 0.0) +
+        weights['velocity'] * math.log1p(max(post.get('velocity', 0.0), 0.0)) +
+        weights['engagement'] * math.log1p(max(engagement, 0))
+    )
+
+
+class AnalysisQueue:
+    def __init__(self, path: Optional[str] = None, persist: bool = True):
+        """
+        Args:
+            path: Queue file (default: config.QUEUE_PATH)
+            persist: Set False for an in-memory queue that never touches disk
+        """
+        self.path = path or config.QUEUE_PATH
+        self.persist = persist
+        # post_id -> {'priority', 'queued_at', 'post'}
+        self.entries: Dict[int, Dict] = {}
+        # Entries handed out by drain(), so requeue() can restore them as they were
+        self._drained: Dict[int, Dict] = {}
+        if persist:
+            self._load()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, post_id: int):
+        return post_id in self.entries
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = {int(k): v for k, v in json.load(f).items()}
+        except ValueError as e:
+            print(f"Error loading analysis queue, starting fresh: {e}")
+            self.entries = {}
+        self._expire()
+
+    def _expire(self):
+        cutoff = time.time() - config.QUEUE_MAX_AGE_DAYS * 24 * 60 * 60
+        self.entries = {k: v for k, v in self.entries.items() if v['queued_at'] >= cutoff}
+
+    def save(self):
+        """Persist pending candidates atomically"""
+        if not self.persist:
+            return
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({str(k): v for k, v in self.entries.items()}, f,
+                      ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+    def push(self, posts: Iterable[Dict]):
+        """Add candidates, refreshing post data and priority for ones already queued"""
+        now = int(time.time())
+        for post in posts:
+            existing = self.entries.get(post['id'])
+            self.entries[post['id']] = {
+                'priority': signal_score(post),
+                'queued_at': existing['queued_at'] if existing else now,
+                'post': post
+            }
+
+    def remove(self, post_ids: Iterable[int]) -> List[Dict]:
+        """Take specific posts out of the queue, returning the ones that were queued"""
+        removed = []
+        for post_id in post_ids:
+            entry = self.entries.pop(post_id, None)
+            if entry:
+                removed.append(entry['post'])
+        return removed
+
+    def drain(self, has_budget: Callable[[], bool]) -> Iterator[Dict]:
+        """
+        Yield posts in priority order while budget remains
+
+        Args:
+            has_budget: Called before each post; draining stops once it returns False
+        """
+        heap = [(-entry['priority'], post_id) for post_id, entry in self.entries.items()]
+        heapq.heapify(heap)
+
+        while heap and has_budget():
+            _, post_id = heapq.heappop(heap)
+            entry = self.entries.pop(post_id, None)
+            if entry:
+                self._drained[post_id] = entry
+                yield entry['post']
+
+    def requeue(self, post: Dict):
+        """Put a drained post whose analysis failed back, keeping its original queue time"""
+        entry = self._drained.pop(post['id'], None)
+        if entry:
+            self.entries[post['id']] = entry
+        else:
+            self.push([post])
@@ -0,0 +1,251 @@
+import os
+import glob
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+import config
+from analytics_store import TABLES
+
+# AIDEV-NOTE: Trend queries over the Parquet analytics store (see analytics_store.py)
+# DuckDB reads the files in place with Hive partition pruning - the OLTP database is
+# never touched. Views drop rows duplicated by re-fetches or an interrupted compaction.
+# duckdb is an optional dependency; without it these queries are unavailable.
+
+# Latest copy of each row, by the table's natural key
+_DEDUPE_KEYS = {'posts': 'id', 'discoveries': 'post_id'}
+
+# Trailing-window filter; the plain `year` bound lets DuckDB skip whole year directories
+_IN_WINDOW = 'year >= ? AND year * 100 + month >= ?'
+
+# Rows posted at or after a unix time; the year/month bounds prune partitions as above
+_SINCE = 'year >= ? AND year * 100 + month >= ? AND created_time >= ?'
+
+# ISO week of a post, e.g. '2026-W42' (UTC, like the partitions)
+_WEEK = "strftime(epoch_ms(created_time * 1000), '%G-W%V')"
+
+def _since(created_time: int) -> tuple:
+    """Parameters for _SINCE"""
+    start = datetime.fromtimestamp(created_time, tz=timezone.utc)
+    return start.year, start.year * 100 + start.month, created_time
+
+def _window(months: int) -> tuple:
+    """Parameters for _IN_WINDOW covering the current month and the N - 1 before it"""
+    now = datetime.now(timezone.utc)
+    index = now.year * 12 + now.month - 1 - (months - 1)
+    year, month = index // 12, index % 12 + 1
+    return year, year * 100 + month
+
+
+class AnalyticsQueries:
+    def __init__(self, root: Optional[str] = None):
+        """
+        Open an in-memory DuckDB session over the store
+
+        Args:
+            root: Store directory (default: config.ANALYTICS_DIR)
+        """
+        import duckdb
+
+        self.root = root or config.ANALYTICS_DIR
+        self.con = duckdb.connect()
+        self.tables = set()
+        self.patterns = {}
+
+        for table in TABLES:
+            pattern = os.path.join(self.root, table, '*', '*', '*.parquet')
+            if not glob.glob(pattern):
+                continue
+            self.patterns[table] = pattern
+            self.con.execute(f"""
+                CREATE VIEW {table} AS
+                SELECT * FROM read_parquet('{pattern}', hive_partitioning = true)
+                -- Copies of a row share its month, so partitioning by year and month too
+                -- keeps window filters pushed down to the partition directories
+                QUALIFY row_number() OVER (
+                    PARTITION BY year, month, {_DEDUPE_KEYS[table]} ORDER BY run_time DESC
+                ) = 1
+            """)
+            self.tables.add(table)
+
+    def _rows(self, table: str, sql: str, params: tuple = ()) -> List[Dict]:
+        if table not in self.tables:
+            return []
+        cursor = self.con.execute(sql, params)
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def category_growth(self, months: int = 12, top: int = 10) -> List[Dict]:
+        """
+        Discoveries per month for the most common categories
+
+        Multi-category values ("AI/ML, Developer Tools") count toward each category.
+        """
+        return self._rows('discoveries', f"""
+            WITH monthly AS (
+                SELECT year, month, trim(t.category) AS category, count(*) AS discoveries
+                FROM discoveries, unnest(string_split(coalesce(category, 'Uncategorized'), ',')) AS t(category)
+                WHERE {_IN_WINDOW}
+                GROUP BY ALL
+            ),
+            leaders AS (
+                SELECT category FROM monthly GROUP BY category ORDER BY sum(discoveries) DESC LIMIT ?
+            )
+            SELECT year, month, category, discoveries
+            FROM monthly JOIN leaders USING (category)
+            ORDER BY year, month, discoveries DESC
+        """, (*_window(months), top))
+
+    def type_mix(self, months: int = 12) -> List[Dict]:
+        """Startups vs innovations per month, with the startup share"""
+        return self._rows('discoveries', f"""
+            SELECT year, month,
+                   count(*) FILTER (WHERE type = 'startup') AS startups,
+                   count(*) FILTER (WHERE type = 'innovation') AS innovations,
+                   round(count(*) FILTER (WHERE type = 'startup') / count(*), 3) AS startup_share
+            FROM discoveries
+            WHERE {_IN_WINDOW}
+            GROUP BY year, month
+            ORDER BY year, month
+        """, _window(months))
+
+    def score_trend(self, months: int = 12) -> List[Dict]:
+        """Average and top innovation score of discoveries per month"""
+        return self._rows('discoveries', f"""
+            SELECT year, month, count(*) AS discoveries,
+                   round(avg(innovation_score), 2) AS avg_score,
+                   max(innovation_score) AS max_score,
+                   round(avg(confidence), 2) AS avg_confidence
+            FROM discoveries
+            WHERE {_IN_WINDOW}
+            GROUP BY year, month
+            ORDER BY year, month
+        """, _window(months))
+
+    def post_volume(self, months: int = 12) -> List[Dict]:
+        """Posts fetched per month, their engagement and how many became discoveries"""
+        return self._rows('posts', f"""
+            SELECT year, month, count(*) AS posts,
+                   round(avg(score), 1) AS avg_score,
+                   round(avg(num_comments), 1) AS avg_comments,
+                   count(*) FILTER (WHERE item_type IS NOT NULL) AS analyzed,
+                   count(*) FILTER (WHERE item_type IN ('startup', 'innovation')) AS discoveries
+            FROM posts
+            WHERE {_IN_WINDOW}
+            GROUP BY year, month
+            ORDER BY year, month
+        """, _window(months))
+
+    def stage_mix(self, months: int = 12) -> List[Dict]:
+        """Discoveries per development stage over the window"""
+        return self._rows('discoveries', f"""
+            SELECT coalesce(stage, 'Unknown') AS stage, count(*) AS discoveries,
+                   round(avg(innovation_score), 2) AS avg_score
+            FROM discoveries
+            WHERE {_IN_WINDOW}
+            GROUP BY ALL
+            ORDER BY discoveries DESC
+        """, _window(months))
+
+    def written_since(self, run_time: int) -> Optional[Dict]:
+        """
+        Oldest post time and newest run time among discoveries written after `run_time`
+
+        Reads the raw files (no dedupe needed for a min/max), so it touches two columns only.
+        Returns None when nothing was written since.
+        """
+        if 'discoveries' not in self.tables:
+            return None
+        oldest, newest = self.con.execute(f"""
+            SELECT min(created_time), max(run_time)
+            FROM read_parquet('{self.patterns['discoveries']}', hive_partitioning = true)
+            WHERE run_time > ?
+        """, (run_time,)).fetchone()
+        return None if newest is None else {'oldest_created_time': oldest, 'run_time': newest}
+
+    def weekly_mix(self, since: int) -> List[Dict]:
+        """Startups, innovations and score totals per ISO week, for posts since a unix time"""
+        return self._rows('discoveries', f"""
+            SELECT {_WEEK} AS week,
+                   count(*) FILTER (WHERE type = 'startup') AS startups,
+                   count(*) FILTER (WHERE type = 'innovation') AS innovations,
+                   sum(innovation_score) AS score_sum
+            FROM discoveries
+            WHERE {_SINCE}
+            GROUP BY week
+        """, _since(since))
+
+    def weekly_score_bins(self, since: int) -> List[Dict]:
+        """Discoveries per ISO week and whole-point score bin (0-9; a 10 counts as 9)"""
+        return self._rows('discoveries', f"""
+            SELECT {_WEEK} AS week,
+                   least(greatest(floor(coalesce(innovation_score, 0)), 0), 9)::INTEGER AS bin,
+                   count(*) AS discoveries
+            FROM discoveries
+            WHERE {_SINCE}
+            GROUP BY ALL
+        """, _since(since))
+
+    def weekly_categories(self, since: int) -> List[Dict]:
+        """Discoveries per ISO week and category (multi-category values count toward each)"""
+        return self._rows('discoveries', f"""
+            SELECT {_WEEK} AS week, trim(t.category) AS category, count(*) AS discoveries
+            FROM discoveries, unnest(string_split(coalesce(category, 'Uncategorized'), ',')) AS t(category)
+            WHERE {_SINCE}
+            GROUP BY ALL
+        """, _since(since))
+
+    def weekly_domains(self, since: int) -> List[Dict]:
+        """Discoveries per ISO week and linked site (www. stripped; text posts are skipped)"""
+        if 'posts' not in self.tables:
+            return []
+        return self._rows('discoveries', f"""
+            SELECT {_WEEK} AS week,
+                   lower(regexp_extract(p.url, '^[a-zA-Z]+://(www\\.)?([^/:?#]+)', 2)) AS domain,
+                   count(*) AS discoveries
+            FROM discoveries d
+            JOIN (SELECT id, url FROM posts WHERE {_SINCE}) p ON p.id = d.post_id
+            WHERE {_SINCE}
+              AND p.url IS NOT NULL
+            GROUP BY ALL
+            HAVING domain <> ''
+        """, _since(since) + _since(since))
+
+
+QUERIES = {
+    'category-growth': 'category_growth',
+    'type-mix': 'type_mix',
+    'score-trend': 'score_trend',
+    'post-volume': 'post_volume',
+    'stage-mix': 'stage_mix',
+}
+
+if __name__ == '__main__':
+    import argparse
+    import time
+    from rich.console import Console
+    from rich.table import Table
+
+    parser = argparse.ArgumentParser(description='Trend queries over the analytics store')
+    parser.add_argument('query', choices=sorted(QUERIES), help='Aggregation to run')
+    parser.add_argument('--months', type=int, default=12, help='Trailing months to include (default: 12)')
+    args = parser.parse_args()
+
+    try:
+        queries = AnalyticsQueries()
+    except ImportError:
+        print("Error: analytics queries need duckdb (pip install duckdb)")
+        raise SystemExit(1)
+
+    start = time.perf_counter()
+    rows = getattr(queries, QUERIES[args.query])(months=args.months)
+    elapsed = time.perf_counter() - start
+
+    if not rows:
+        print(f"No analytics data in {queries.root} yet")
+        raise SystemExit(0)
+
+    table = Table(title=f"{args.query} (last {args.months} months, {elapsed * 1000:.0f} ms)")
+    for column in rows[0]:
+        table.add_column(column)
+    for row in rows:
+        table.add_row(*(str(value) for value in row.values()))
+    Console().print(table)
@@ -0,0 +1,245 @@
+import os
+import glob
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+import config
+
+# AIDEV-NOTE: Columnar analytics store, next to the OLTP backends (database.py/database_supabase.py)
+# Each run appends its posts and discoveries to Hive-partitioned Parquet
+# (analytics/<table>/year=YYYY/month=MM/*.parquet), partitioned by post month, so trend
+# queries (analytics_queries.py) read compressed columns of just the months they need.
+# pyarrow is an optional dependency - without it the pipeline simply skips this store.
+
+TABLES = ('posts', 'discoveries')
+
+def is_available() -> bool:
+    """True when pyarrow is installed"""
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def schemas() -> Dict:
+    """Arrow schema per table - fixed so every file in a table has the same types"""
+    import pyarrow as pa
+    return {
+        'posts': pa.schema([
+            ('id', pa.int64()),
+            ('title', pa.string()),
+            ('url', pa.string()),
+            ('author', pa.string()),
+            ('score', pa.int64()),
+            ('num_comments', pa.int64()),
+            ('created_time', pa.int64()),
+            # NULL until analyzed, then 'other', 'startup' or 'innovation'
+            ('item_type', pa.string()),
+            ('run_time', pa.int64()),
+        ]),
+        'discoveries': pa.schema([
+            ('post_id', pa.int64()),
+            ('created_time', pa.int64()),
+            ('type', pa.string()),
+            ('name', pa.string()),
+            ('title', pa.string()),
+            ('category', pa.string()),
+            ('stage', pa.string()),
+            ('innovation_score', pa.float64()),
+            ('ai_score', pa.float64()),
+            ('confidence', pa.float64()),
+            ('funding_stage', pa.string()),
+            ('score', pa.int64()),
+            ('num_comments', pa.int64()),
+            ('run_time', pa.int64()),
+        ]),
+    }
+
+def _float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def post_row(post: Dict, run_time: int) -> Dict:
+    """Analytics row for an HN post as fetched (and possibly classified) in this run"""
+    item_type = post.get('item_type') or ('other' if 'is_startup' in post else None)
+    return {
+        'id': post['id'],
+        'title': post.get('title'),
+        'url': post.get('url'),
+        'author': post.get('by'),
+        'score': post.get('score', 0),
+        'num_comments': post.get('descendants', 0),
+        'created_time': post['time'],
+        'item_type': item_type,
+        'run_time': run_time,
+    }
+
+def discovery_row(discovery: Dict, run_time: int) -> Dict:
+    """Analytics row for a {'post', 'analysis'} discovery from process_posts()"""
+    post, analysis = discovery['post'], discovery['analysis']
+    return {
+        'post_id': post['id'],
+        'created_time': post['time'],
+        'type': analysis.get('type'),
+        'name': analysis.get('name'),
+        'title': post.get('title'),
+        'category': analysis.get('category'),
+        'stage': analysis.get('stage'),
+        'innovation_score': _float(analysis.get('innovation_score')),
+        'ai_score': _float(analysis.get('ai_score')),
+        'confidence': _float(analysis.get('confidence')),
+        'funding_stage': analysis.get('funding_stage'),
+        'score': post.get('score', 0),
+        'num_comments': post.get('descendants', 0),
+        'run_time': run_time,
+    }
+
+
+class AnalyticsStore:
+    def __init__(self, root: Optional[str] = None):
+        """
+        Args:
+            root: Store directory (default: config.ANALYTICS_DIR)
+        """
+        self.root = root or config.ANALYTICS_DIR
+
+    def partition_dir(self, table: str, created_time: int) -> str:
+        month = datetime.fromtimestamp(created_time, tz=timezone.utc)
+        return os.path.join(self.root, table, f"year={month.year}", f"month={month.month}")
+
+    def append_run(self, posts: List[Dict], discoveries: List[Dict], run_time: Optional[int] = None) -> int:
+        """
+        Append one run's fetched posts and discoveries
+
+        Args:
+            posts: HN posts fetched by the run
+            discoveries: {'post', 'analysis'} dicts returned by process_posts()
+            run_time: Unix time of the run (default: now)
+
+        Returns:
+            Number of rows written
+        """
+        run_time = run_time or int(time.time())
+        return (self.append('posts', [post_row(p, run_time) for p in posts]) +
+                self.append('discoveries', [discovery_row(d, run_time) for d in discoveries]))
+
+    def append(self, table: str, rows: List[Dict]) -> int:
+        """Write rows as one new Parquet file per month partition"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        by_partition = defaultdict(list)
+        for row in rows:
+            by_partition[self.partition_dir(table, row['created_time'])].append(row)
+
+        schema = schemas()[table]
+        for directory, partition_rows in by_partition.items():
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"run-{int(time.time())}-{uuid.uuid4().hex[:8]}.parquet")
+            # Readers only glob *.parquet, so a half-written file is never picked up
+            pq.write_table(pa.Table.from_pylist(partition_rows, schema=schema), path + '.tmp',
+                           compression='zstd')
+            os.replace(path + '.tmp', path)
+
+        return len(rows)
+
+    def compact(self, min_files: Optional[int] = None) -> int:
+        """
+        Merge partitions that have accumulated many small per-run files into one file
+
+        Args:
+            min_files: Only compact partitions with at least this many files
+                (default: config.ANALYTICS_COMPACT_MIN_FILES)
+
+        Returns:
+            Number of partitions compacted
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        min_files = min_files or config.ANALYTICS_COMPACT_MIN_FILES
+        compacted = 0
+        for table in TABLES:
+            for directory in sorted(glob.glob(os.path.join(self.root, table, 'year=*', 'month=*'))):
+                files = sorted(glob.glob(os.path.join(directory, '*.parquet')))
+                if len(files) < min_files:
+                    continue
+
+                merged = pa.concat_tables(pq.read_table(f, schema=schemas()[table]) for f in files)
+                path = os.path.join(directory, f"compacted-{int(time.time())}-{uuid.uuid4().hex[:8]}.parquet")
+                pq.write_table(merged, path + '.tmp', compression='zstd')
+                os.replace(path + '.tmp', path)
+                # A crash before these deletes only leaves duplicates, which the query views drop
+                for f in files:
+                    os.remove(f)
+                compacted += 1
+
+        return compacted
+
+    def backfill(self, db, page_size: int = 500) -> int:
+        """
+        Seed the discoveries table from the OLTP database (run once on an empty store)
+
+        Args:
+            db: Database backend module (see storage.get_backend)
+
+        Returns:
+            Number of discoveries written
+        """
+        import json
+
+        run_time = int(time.time())
+        written = 0
+        rows, cursor = db.list_startups(limit=page_size)
+        while rows:
+            discoveries = []
+            for row in rows:
+                analysis = row.get('analysis') or {}
+                if isinstance(analysis, str):
+                    analysis = json.loads(analysis)
+                discoveries.append({
+                    'post': {'id': row['id'], 'time': row['created_time'], 'title': row['title'],
+                             'score': row.get('score', 0), 'descendants': row.get('num_comments', 0)},
+                    'analysis': {
+                        'type': row.get('analysis_type') or row.get('item_type'),
+                        'name': row.get('name') or analysis.get('name'),
+                        'category': row.get('category'),
+                        'stage': row.get('stage'),
+                        'innovation_score': row.get('innovation_score'),
+                        'ai_score': row.get('ai_score'),
+                        'confidence': row.get('confidence'),
+                        'funding_stage': row.get('funding_stage'),
+                    }
+                })
+            written += self.append('discoveries', [discovery_row(d, run_time) for d in discoveries])
+            if cursor is None:
+                break
+            rows, cursor = db.list_startups(cursor, page_size)
+
+        return written
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='HN Discoveries analytics store')
+    parser.add_argument('command', choices=['backfill', 'compact'],
+                        help='backfill: copy stored discoveries into the store; compact: merge small files')
+    args = parser.parse_args()
+
+    if not is_available():
+        print("Error: the analytics store needs pyarrow (pip install pyarrow duckdb)")
+        raise SystemExit(1)
+
+    store = AnalyticsStore()
+    if args.command == 'backfill':
+        from storage import get_backend
+        backend = get_backend()
+        backend.init_database()
+        print(f"Backfilled {store.backfill(backend)} discoveries into {store.root}")
+    else:
+        print(f"Compacted {store.compact()} partitions")
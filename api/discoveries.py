@@ -1,10 +1,48 @@
 from http.server import BaseHTTPRequestHandler
-import json
 import os
+import sys
+import uuid
 from datetime import datetime
+from urllib.parse import urlparse, parse_qs
+
+# models.py lives at the project root, next to this function's directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import models
+from models import Discovery
+
+PAGE_SIZE = 100
+
+# Only what the response uses - the full analysis JSONB is left on the server
+COLUMNS = (
+    'id,discovery_id,item_type,title,url,innovation_score,summary,why_interesting,category,'
+    'key_features,created_time,score,num_comments,name:analysis->>name,stage:analysis->>stage'
+)
+
+def parse_cursor(before: str) -> tuple:
+    """
+    Validate a ?before=<created_time>,<discovery_id> cursor
+
+    Returns:
+        (created_time, discovery_id) - safe to interpolate into a PostgREST filter
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    created_time, _, discovery_id = before.partition(',')
+    return int(created_time), str(uuid.UUID(discovery_id))
 
 class handler(BaseHTTPRequestHandler):
     def do_GET(self):
+        # Keyset pagination: ?before=<created_time>,<discovery_id> from the previous page's next_cursor
+        before = parse_qs(urlparse(self.path).query).get('before', [''])[0]
+        cursor = None
+        if before:
+            try:
+                cursor = parse_cursor(before)
+            except ValueError:
+                self.send_error_json(400, 'Invalid before cursor')
+                return
+        
         # Set CORS headers
         self.send_response(200)
         self.send_header('Content-type', 'application/json')
@@ -14,6 +52,8 @@ class handler(BaseHTTPRequestHandler):
         self.end_headers()
         
         discoveries = []
+        totals = None
+        next_cursor = None
         
         # Check for Supabase credentials
         supabase_url = os.environ.get('SUPABASE_URL')
@@ -31,32 +71,38 @@ class handler(BaseHTTPRequestHandler):
                 }
                 
                 # Use the discovery_details view for easy querying
+                params = {
+                    'select': COLUMNS,
+                    'order': 'created_time.desc,discovery_id.desc',
+                    'limit': PAGE_SIZE
+                }
+                if cursor:
+                    created_time, discovery_id = cursor
+                    params['or'] = (f'(created_time.lt.{created_time},'
+                                    f'and(created_time.eq.{created_time},discovery_id.lt.{discovery_id}))')
                 response = requests.get(
-                    f'{supabase_url}/rest/v1/discovery_details?order=created_time.desc&limit=100',
+                    f'{supabase_url}/rest/v1/discovery_details',
+                    params=params,
                     headers=headers
                 )
                 
+                # Totals come from the trigger-maintained daily_stats table, not the page above
+                stats_response = requests.post(
+                    f'{supabase_url}/rest/v1/rpc/discovery_stats',
+                    headers=headers,
+                    json={}
+                )
+                if stats_response.status_code == 200:
+                    totals = {}
+                    for row in stats_response.json():
+                        totals[row['item_type']] = totals.get(row['item_type'], 0) + row['discoveries']
+                
                 if response.status_code == 200:
                     results = response.json()
+                    if len(results) == PAGE_SIZE:
+                        next_cursor = f"{results[-1]['created_time']},{results[-1]['discovery_id']}"
                     
-                    for row in results:
-                        discovery = {
-                            "id": row['id'],
-                            "type": row['item_type'],
-                            "name": row.get('analysis', {}).get('startup_name', row['title']),
-                            "title": row['title'],
-                            "url": row.get('url', ''),
-                            "hn_url": f"https://news.ycombinator.com/item?id={row['id']}",
-                            "innovation_score": float(row.get('innovation_score', 0)),
-                            "summary": row.get('summary', ''),
-                            "why_interesting": row.get('why_interesting', ''),
-                            "category": row.get('category', ''),
-                            "key_features": row.get('key_features', []),
-                            "timestamp": datetime.fromtimestamp(row['created_time']).isoformat() + 'Z',
-                            "score": row.get('score', 0),
-                            "num_comments": row.get('num_comments', 0)
-                        }
-                        discoveries.append(discovery)
+                    discoveries = [Discovery.from_row(row).to_dict() for row in results]
                 else:
                     print(f"Supabase error: {response.status_code} - {response.text}")
                     discoveries = self.get_mock_discoveries()
@@ -72,18 +118,28 @@ class handler(BaseHTTPRequestHandler):
         response_data = {
             "metadata": {
                 "timestamp": datetime.now().isoformat() + 'Z',
-                "total_discoveries": len(discoveries),
-                "total_startups": len([d for d in discoveries if d['type'] == 'startup']),
-                "total_innovations": len([d for d in discoveries if d['type'] == 'innovation']),
+                "total_discoveries": sum(totals.values()) if totals else len(discoveries),
+                "total_startups": totals.get('startup', 0) if totals else len([d for d in discoveries if d['type'] == 'startup']),
+                "total_innovations": totals.get('innovation', 0) if totals else len([d for d in discoveries if d['type'] == 'innovation']),
+                "next_cursor": next_cursor,
                 "data_source": "supabase" if (supabase_url and discoveries and discoveries != self.get_mock_discoveries()) else "mock"
             },
             "discoveries": discoveries
         }
         
         # Send response
-        self.wfile.write(json.dumps(response_data).encode('utf-8'))
+        self.wfile.write(models.encode(response_data))
         return
     
+    def send_error_json(self, status: int, message: str):
+        body = models.encode({'error': message})
+        self.send_response(status)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(body)
+    
     def do_OPTIONS(self):
         # Handle preflight requests
         self.send_response(200)
@@ -108,9 +164,9 @@ class handler(BaseHTTPRequestHandler):
                 "why_interesting": "Uses advanced LLMs to understand code context and provide meaningful reviews, reducing review time by 70%",
                 "category": "Developer Tools, AI/ML",
                 "key_features": ["Automatic bug detection", "Style consistency", "Security scanning", "Team collaboration"],
-                "timestamp": "2024-07-15T10:30:00Z",
-                "score": 245,
-                "num_comments": 89
+                "posted_at": "2024-07-15T10:30:00",
+                "hn_score": 245,
+                "hn_comments": 89
             },
             {
                 "id": 44657728,
@@ -124,9 +180,9 @@ class handler(BaseHTTPRequestHandler):
                 "why_interesting": "Achieves 10x performance improvement over existing simulators through novel optimization techniques",
                 "category": "Quantum Computing, Open Source",
                 "key_features": ["GPU acceleration", "Novel optimization algorithms", "Educational visualizations"],
-                "timestamp": "2024-07-14T15:45:00Z",
-                "score": 412,
-                "num_comments": 156
+                "posted_at": "2024-07-14T15:45:00",
+                "hn_score": 412,
+                "hn_comments": 156
             },
             {
                 "id": 44657729,
@@ -140,8 +196,8 @@ class handler(BaseHTTPRequestHandler):
                 "why_interesting": "Solves the data versioning problem in ML with a Git-like interface for datasets",
                 "category": "Data Infrastructure, Machine Learning",
                 "key_features": ["Git-like versioning", "Real-time processing", "ML framework integration", "Data lineage"],
-                "timestamp": "2024-07-13T09:20:00Z",
-                "score": 178,
-                "num_comments": 67
+                "posted_at": "2024-07-13T09:20:00",
+                "hn_score": 178,
+                "hn_comments": 67
             }
         ]
\ No newline at end of file
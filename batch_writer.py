@@ -0,0 +1,263 @@
+import os
+import glob
+import json
+import time
+import queue
+import threading
+from typing import Callable, Dict, List, Optional
+import config
+from profiling import profiler
+
+# AIDEV-NOTE: Unit-of-work writer that buffers post/startup rows and writes them in bulk
+# Works with either backend - it only needs the save_posts/save_startups batch functions.
+# Rows are handed to a writer thread so the analysis loop never waits on storage; batches
+# the store rejects are spilled to a JSONL journal and replayed later.
+
+class WriteBehindWriter:
+    def __init__(self, save_posts: Callable[[List[Dict]], object],
+                 save_startups: Callable[[List[Dict]], object],
+                 batch_size: int = None, flush_interval: float = None,
+                 spill_path: Optional[str] = None, retries: int = None, backoff: float = None):
+        """
+        Queue rows for a background writer thread
+
+        Posts are coalesced by ID while buffered (the latest version wins). A batch the
+        backend rejects is retried with exponential backoff, then spilled to a local
+        JSONL journal that is replayed after the next successful write and on startup.
+
+        Args:
+            save_posts: Function that persists a list of posts in one transaction
+            save_startups: Function that persists a list of startup records
+            batch_size: Write once this many rows are buffered (default: config.DB_BATCH_SIZE)
+            flush_interval: Write when the oldest buffered row is this many seconds old
+                (default: config.DB_FLUSH_INTERVAL)
+            spill_path: Journal for rejected batches (default: config.DB_SPILL_PATH)
+            retries: Attempts per batch before spilling it (default: config.DB_WRITE_RETRIES)
+            backoff: Seconds before the first retry, doubled each time
+                (default: config.DB_RETRY_BACKOFF)
+        """
+        self.save_posts = save_posts
+        self.save_startups = save_startups
+        self.batch_size = batch_size or config.DB_BATCH_SIZE
+        self.flush_interval = flush_interval if flush_interval is not None else config.DB_FLUSH_INTERVAL
+        self.spill_path = spill_path or config.DB_SPILL_PATH
+        self.retries = retries or config.DB_WRITE_RETRIES
+        self.backoff = backoff if backoff is not None else config.DB_RETRY_BACKOFF
+
+        self._queue = queue.Queue()
+        self._thread = None
+
+        # Writer-thread state
+        self._posts: Dict[int, Dict] = {}
+        self._startups: List[Dict] = []
+        self._oldest = None
+
+        # Lag from add_*() to committed, in seconds, and rows that had to be spilled
+        self._stats_lock = threading.Lock()
+        self.lag_count = 0
+        self.lag_total = 0.0
+        self.lag_max = 0.0
+        self.spilled = 0
+        self.retried = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Drain everything queued so a crash mid-run keeps completed work
+        self.close()
+        return False
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self) -> int:
+        """Rows handed over but not yet processed by the writer thread"""
+        return self._queue.qsize()
+
+    def add_post(self, post: Dict):
+        """Queue a processed post"""
+        self._queue.put(('post', post, time.monotonic()))
+
+    def add_startup(self, startup: Dict):
+        """Queue a startup record (its post must be added first)"""
+        self._queue.put(('startup', startup, time.monotonic()))
+
+    def flush(self):
+        """Block until everything queued so far has been written or spilled"""
+        done = threading.Event()
+        self._queue.put(('flush', done, None))
+        done.wait()
+
+    def close(self):
+        """Write everything still queued and stop the writer thread"""
+        if self._thread is None:
+            return
+        self._queue.put(('stop', None, None))
+        self._thread.join()
+        self._thread = None
+
+        if self.spilled:
+            print(f"Warning: {self.spilled} rows could not be written and were spilled to "
+                  f"{self.spill_path}; they will be retried on the next run")
+
+    def stats(self) -> Dict:
+        """Write lag and failure counts so far, for run telemetry"""
+        with self._stats_lock:
+            return {
+                'write_lag_avg_seconds': round(self.lag_total / self.lag_count, 3) if self.lag_count else 0.0,
+                'write_lag_max_seconds': round(self.lag_max, 3),
+                'writes_retried': self.retried,
+                'writes_spilled': self.spilled,
+            }
+
+    def _run(self):
+        self._guarded(self._replay_spills)
+        while True:
+            timeout = None
+            if self._oldest is not None:
+                timeout = max(self._oldest + self.flush_interval - time.monotonic(), 0)
+            try:
+                kind, item, queued_at = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._guarded(self._write)
+                continue
+
+            if kind == 'stop':
+                self._guarded(self._write)
+                return
+            if kind == 'flush':
+                try:
+                    self._guarded(self._write)
+                finally:
+                    item.set()
+                continue
+
+            if kind == 'post':
+                self._posts[item['id']] = item
+            else:
+                self._startups.append(item)
+            if self._oldest is None:
+                self._oldest = queued_at
+
+            if (len(self._posts) + len(self._startups) >= self.batch_size or
+                    time.monotonic() - self._oldest >= self.flush_interval):
+                self._guarded(self._write)
+
+    def _guarded(self, step: Callable[[], None]):
+        """Run a write step on the writer thread without letting an error kill the thread"""
+        try:
+            step()
+        except Exception as e:
+            # e.g. the spill journal itself can't be written (disk full, permissions) -
+            # the batch is lost, but later rows and flush() callers must not hang
+            profiler.incr('db.errors')
+            print(f"Write-behind error, batch dropped: {e}")
+
+    def _write(self):
+        """Write the buffered batch - posts first so startup rows never reference a missing post"""
+        posts, startups, oldest = list(self._posts.values()), self._startups, self._oldest
+        self._posts, self._startups, self._oldest = {}, [], None
+        if not posts and not startups:
+            return
+
+        if posts and not self._save('posts', self.save_posts, posts):
+            self._spill(posts, startups)
+            return
+        if startups and not self._save('startups', self.save_startups, startups):
+            self._spill([], startups)
+            return
+
+        lag = time.monotonic() - oldest
+        profiler.observe('db.write_lag', lag)
+        with self._stats_lock:
+            self.lag_count += 1
+            self.lag_total += lag
+            self.lag_max = max(self.lag_max, lag)
+
+        # The store is reachable again - retry what it rejected earlier
+        if os.path.exists(self.spill_path):
+            self._replay_spills()
+
+    def _save(self, table: str, save: Callable[[List[Dict]], object], rows: List[Dict],
+              attempts: int = None) -> bool:
+        """Call a batch save function, retrying with exponential backoff"""
+        attempts = attempts or self.retries
+        for attempt in range(attempts):
+            try:
+                with profiler.span(f'db.save_{table}'):
+                    saved = save(rows)
+            except Exception as e:
+                print(f"Error writing {len(rows)} {table}: {e}")
+                saved = False
+
+            if saved is not False:
+                profiler.incr(f'db.{table}_written', len(rows))
+                return True
+
+            profiler.incr('db.errors')
+            if attempt + 1 < attempts:
+                profiler.incr('db.retries')
+                with self._stats_lock:
+                    self.retried += 1
+                time.sleep(self.backoff * 2 ** attempt)
+        return False
+
+    def _spill(self, posts: List[Dict], startups: List[Dict]):
+        """Append a rejected batch to the spill journal, durably"""
+        with open(self.spill_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'posts': posts, 'startups': startups}, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        profiler.incr('db.spilled', len(posts) + len(startups))
+        with self._stats_lock:
+            self.spilled += len(posts) + len(startups)
+
+    def _spill_paths(self) -> List[str]:
+        # Shard workers spill to <spill_path>.shard<N>, which the main writer also picks up
+        paths = [self.spill_path]
+        if self.spill_path == config.DB_SPILL_PATH:
+            paths += sorted(glob.glob(f"{glob.escape(self.spill_path)}.shard*"))
+        return [path for path in paths if os.path.exists(path)]
+
+    @staticmethod
+    def _read_spill(path: str) -> tuple:
+        """Posts (by ID) and startups in a spill journal"""
+        posts, startups = {}, []
+        with open(path, 'rb') as f:
+            for line in f:
+                try:
+                    batch = json.loads(line)
+                except ValueError:
+                    # Torn last line from a crash mid-spill
+                    break
+                posts.update((post['id'], post) for post in batch['posts'])
+                startups.extend(batch['startups'])
+        return posts, startups
+
+    def spilled_ids(self) -> set:
+        """IDs of posts waiting in spill journals - already processed, just not stored yet"""
+        ids = set()
+        for path in self._spill_paths():
+            posts, startups = self._read_spill(path)
+            ids.update(posts)
+            ids.update(startup['post_id'] for startup in startups)
+        return ids
+
+    def _replay_spills(self):
+        """Write back spilled batches; a journal is removed once all its rows are stored"""
+        for path in self._spill_paths():
+            posts, startups = self._read_spill(path)
+
+            # One attempt each - this runs on the writer thread, so don't hold up new rows.
+            # Both saves are idempotent (posts upsert, startups skip posts that already
+            # have one), so a crash before the journal is removed only repeats no-op writes.
+            if posts and not self._save('posts', self.save_posts, list(posts.values()), attempts=1):
+                return
+            if startups and not self._save('startups', self.save_startups, startups, attempts=1):
+                return
+            os.remove(path)
+            print(f"Replayed {len(posts) + len(startups)} spilled rows from {path}")
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Query benchmark for the database backends
+
+Seeds a synthetic history of posts and discoveries, then times every read path
+of the backend's function interface (database.py / database_supabase.py). For
+SQLite it also captures the EXPLAIN QUERY PLAN of each statement a function runs
+and flags full scans and temporary sorts.
+
+Results can be saved and compared against a baseline, exiting non-zero when a
+query got slower than the tolerance allows.
+
+Usage:
+    python benchmarks/db_benchmark.py [--sizes 10k,1m] [--runs 10] [--explain]
+    python benchmarks/db_benchmark.py --save baseline.json
+    python benchmarks/db_benchmark.py --baseline baseline.json [--tolerance 1.5]
+
+    # Against the Supabase project in SUPABASE_URL - use a scratch project, it writes rows
+    python benchmarks/db_benchmark.py --backend supabase --sizes 10k
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import config  # noqa: E402
+
+SIZES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000, '10m': 10_000_000}
+
+# Share of posts that become discoveries, and HN-like posts per day
+DISCOVERY_RATE = 0.05
+POSTS_PER_DAY = 2_000
+
+SEED_BATCH = 5_000
+
+WORDS = ('rust database llm agent payments compiler kernel browser search vector gpu '
+         'privacy robotics climate biotech open source api cli editor sqlite postgres '
+         'wasm crypto chip battery satellite compiler framework protocol').split()
+CATEGORIES = ['AI/ML', 'Developer Tools', 'Fintech', 'Infrastructure', 'Security',
+              'Hardware', 'Healthcare', 'AI/ML, Developer Tools']
+STAGES = ['Idea', 'MVP', 'Beta', 'Launched', 'Growth']
+
+
+def synthetic_history(size, seed=42):
+    """
+    Yield batches of (posts, startups) shaped like the pipeline's writes
+
+    Posts are spread back from now at POSTS_PER_DAY, so recent-window queries
+    see a realistic day of data at every size.
+    """
+    rng = random.Random(seed)
+    now = int(time.time())
+    span = max(size // POSTS_PER_DAY, 1) * 24 * 60 * 60
+    base_id = 40_000_000
+
+    for start in range(0, size, SEED_BATCH):
+        posts, startups = [], []
+        for post_id in range(base_id + start, base_id + min(start + SEED_BATCH, size)):
+            words = rng.sample(WORDS, 4)
+            post = {
+                'id': post_id,
+                'title': f"Show HN: {' '.join(words).title()}",
+                'url': f"https://example.com/{post_id}",
+                'by': f"user{rng.randrange(50_000)}",
+                'score': int(rng.paretovariate(1.2) * 5),
+                'descendants': rng.randrange(200),
+                'time': now - rng.randrange(span),
+            }
+            if rng.random() < DISCOVERY_RATE:
+                item_type = rng.choice(['startup', 'innovation'])
+                score = round(rng.uniform(5, 10), 1)
+                post.update(is_startup=item_type == 'startup', is_innovation=item_type == 'innovation',
+                            item_type=item_type)
+                startups.append({
+                    'post_id': post_id,
+                    'ai_score': score,
+                    'category': rng.choice(CATEGORIES),
+                    'summary': ' '.join(rng.choices(WORDS, k=12)),
+                    'funding_stage': '',
+                    'analysis': json.dumps({
+                        'type': item_type,
+                        'name': words[0].title() + words[1].title(),
+                        'stage': rng.choice(STAGES),
+                        'innovation_score': score,
+                        'ai_score': score,
+                        'confidence': round(rng.uniform(0.3, 1.0), 2),
+                        'why_interesting': ' '.join(rng.choices(WORDS, k=10)),
+                        'key_features': rng.sample(WORDS, 3),
+                    }),
+                })
+            posts.append(post)
+        yield posts, startups
+
+
+def seed(db, size):
+    """Write the synthetic history through the backend's own save functions"""
+    start = time.perf_counter()
+    for posts, startups in synthetic_history(size):
+        db.save_posts(posts)
+        db.save_startups(startups)
+    return time.perf_counter() - start
+
+
+def probes(db, size):
+    """Inputs for the benchmark cases, taken from the seeded data"""
+    rng = random.Random(7)
+    ids = [40_000_000 + rng.randrange(size) for _ in range(500)]
+    # Half the lookups miss, as for freshly fetched posts
+    ids += [90_000_000 + i for i in range(500)]
+
+    # A cursor about 2,000 discoveries deep, for a page far from the newest
+    _, deep_cursor = db.list_startups(limit=min(2_000, max(int(size * DISCOVERY_RATE) // 2, 1)))
+    return {'ids': ids, 'deep_cursor': deep_cursor,
+            'archive_cutoff': int(time.time()) - config.POST_RETENTION_DAYS * 24 * 60 * 60}
+
+
+# (name, call) - every call goes through the backend's public function interface
+CASES = [
+    ('get_top_startups', lambda db, p: db.get_top_startups(limit=50, days=7)),
+    ('get_top_startups (limit 500, 30 days)', lambda db, p: db.get_top_startups(limit=500, days=30)),
+    ('get_discovery_stats', lambda db, p: db.get_discovery_stats()),
+    ('get_discovery_stats (7 days)', lambda db, p: db.get_discovery_stats(days=7)),
+    ('find_startups (type, min score)', lambda db, p: db.find_startups(analysis_type='startup', min_score=8)),
+    ('find_startups (stage by confidence)', lambda db, p: db.find_startups(stage='MVP', order_by='confidence')),
+    ('find_startups (newest)', lambda db, p: db.find_startups(order_by='created_time')),
+    ('list_startups (first page)', lambda db, p: db.list_startups(limit=50)),
+    ('list_startups (deep page)', lambda db, p: db.list_startups(before=p['deep_cursor'], limit=50)),
+    ('search_startups', lambda db, p: db.search_startups('rust database')),
+    ('search_startups (prefix)', lambda db, p: db.search_startups('pay comp', prefix=True)),
+    ('get_processed_ids (1000 ids)', lambda db, p: db.get_processed_ids(p['ids'])),
+    ('is_post_processed', lambda db, p: db.is_post_processed(p['ids'][0])),
+    ('get_last_processed_time', lambda db, p: db.get_last_processed_time()),
+    ('get_archivable_posts', lambda db, p: db.get_archivable_posts(p['archive_cutoff'], 5000)),
+]
+
+
+def time_case(call, db, params, runs):
+    """Median, p95 and max latency in ms, after one warm-up call"""
+    call(db, params)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        call(db, params)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        'median_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(timings[min(int(len(timings) * 0.95), len(timings) - 1)], 3),
+        'max_ms': round(timings[-1], 3),
+    }
+
+
+def sqlite_plans(db, call, params):
+    """
+    EXPLAIN QUERY PLAN for each statement a call runs, captured by tracing its connections
+
+    Returns:
+        List of (sql, [plan lines]) in execution order
+    """
+    connections = [db._connections.get(), db._connections.get(readonly=True)]
+    statements = []
+    for conn in connections:
+        conn.set_trace_callback(statements.append)
+    try:
+        call(db, params)
+    finally:
+        for conn in connections:
+            conn.set_trace_callback(None)
+
+    plans, seen = [], set()
+    for sql in statements:
+        sql = sql.strip()
+        # Trigger bodies are traced as comments; transaction control has no plan
+        if sql.startswith('--') or sql.split(None, 1)[0].upper() in ('BEGIN', 'COMMIT', 'PRAGMA') or sql in seen:
+            continue
+        seen.add(sql)
+        rows = connections[1].execute(f'EXPLAIN QUERY PLAN {sql}').fetchall()
+        depth = {0: -1}
+        lines = []
+        for node_id, parent, _, detail in rows:
+            depth[node_id] = depth.get(parent, -1) + 1
+            lines.append('  ' * depth[node_id] + detail)
+        plans.append((' '.join(sql.split()), lines))
+    return plans
+
+
+def plan_warnings(lines):
+    """Plan steps that read a whole table or sort the whole result"""
+    warnings = []
+    for line in lines:
+        step = line.strip()
+        # SCAN of an FTS/virtual table or an index is expected; a bare table scan is not
+        if step.startswith('SCAN ') and ' USING ' not in step and 'VIRTUAL TABLE' not in step:
+            warnings.append(step)
+        elif step.startswith('USE TEMP B-TREE') and 'RIGHT PART' not in step:
+            # A sort of the whole result; "RIGHT PART" only sorts ties of an ordered scan
+            warnings.append(step)
+    return warnings
+
+
+def open_sqlite(size, data_dir):
+    """Point database.py at a seeded file for this size, building it on first use"""
+    import database as db
+
+    path = os.path.join(data_dir, f"db_benchmark_{size}.db")
+    db.close_connections()
+    config.DB_PATH = path
+    fresh = not os.path.exists(path)
+    db.init_database()
+    if fresh:
+        print(f"Seeding {size:,} posts into {path}...")
+        print(f"  seeded in {seed(db, size):.1f} s")
+        # Planner statistics, as the maintenance job keeps them
+        db.compact_database(free_ratio=1)
+    return db
+
+
+def open_supabase(size):
+    import database_supabase as db
+
+    db.init_database()
+    if db.get_last_processed_time() is None:
+        print(f"Seeding {size:,} posts into Supabase...")
+        print(f"  seeded in {seed(db, size):.1f} s")
+    return db
+
+
+def compare(results, baseline, tolerance, floor_ms):
+    """Cases whose median exceeds the baseline by more than tolerance (and floor_ms)"""
+    regressions = []
+    for size, cases in results.items():
+        for name, result in cases.items():
+            before = baseline.get(size, {}).get(name)
+            if not before:
+                continue
+            old, new = before['median_ms'], result['median_ms']
+            if new > old * tolerance and new - old > floor_ms:
+                regressions.append((size, name, old, new))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark database read paths on synthetic data')
+    parser.add_argument('--backend', choices=['sqlite', 'supabase'], default='sqlite')
+    parser.add_argument('--sizes', default='10k',
+                        help=f"Comma-separated history sizes: {', '.join(SIZES)} (default: 10k)")
+    parser.add_argument('--runs', type=int, default=10, help='Timed runs per case (default: 10)')
+    parser.add_argument('--data-dir', default=tempfile.gettempdir(),
+                        help='Where seeded SQLite files are kept and reused (default: temp dir)')
+    parser.add_argument('--explain', action='store_true', help='Print query plans (SQLite)')
+    parser.add_argument('--save', help='Write results (and plans) to this JSON file')
+    parser.add_argument('--baseline', help='Compare against results saved with --save')
+    parser.add_argument('--tolerance', type=float, default=1.5,
+                        help='Allowed slowdown factor before a case counts as a regression (default: 1.5)')
+    parser.add_argument('--floor-ms', type=float, default=1.0,
+                        help='Ignore slowdowns smaller than this many ms (default: 1.0)')
+    args = parser.parse_args()
+
+    sizes = [s.strip().lower() for s in args.sizes.split(',')]
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        parser.error(f"unknown size(s) {', '.join(unknown)}; choose from {', '.join(SIZES)}")
+    if args.backend == 'supabase' and len(sizes) > 1:
+        parser.error('--backend supabase seeds one project, so give a single size')
+
+    results, plans = {}, {}
+    for label in sizes:
+        size = SIZES[label]
+        db = open_sqlite(size, args.data_dir) if args.backend == 'sqlite' else open_supabase(size)
+        params = probes(db, size)
+
+        print(f"\n{args.backend} - {label} posts")
+        print(f"{'Case':<42}{'Median ms':>11}{'p95 ms':>10}{'Max ms':>10}")
+        results[label], plans[label] = {}, {}
+        for name, call in CASES:
+            result = results[label][name] = time_case(call, db, params, args.runs)
+            print(f"{name:<42}{result['median_ms']:>11.2f}{result['p95_ms']:>10.2f}{result['max_ms']:>10.2f}")
+
+            if args.backend != 'sqlite':
+                continue
+            case_plans = plans[label][name] = sqlite_plans(db, call, params)
+            for sql, lines in case_plans:
+                for warning in plan_warnings(lines):
+                    print(f"{'':<4}! {warning}")
+                if args.explain:
+                    print(f"{'':<4}{sql[:110]}{'...' if len(sql) > 110 else ''}")
+                    for line in lines:
+                        print(f"{'':<6}{line}")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'backend': args.backend, 'results': results, 'plans': plans}, f, indent=2)
+        print(f"\nSaved results to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.tolerance, args.floor_ms)
+        if regressions:
+            print(f"\nRegressions (> {args.tolerance}x baseline):")
+            for size, name, old, new in regressions:
+                print(f"  {size:<6}{name:<42}{old:>9.2f} -> {new:.2f} ms")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline}")
+
+
+if __name__ == '__main__':
+    main()
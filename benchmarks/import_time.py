@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the CLI entry points
+
+Measures how long `python main.py` takes to import and dispatch cheap commands,
+and lists the slowest modules from `python -X importtime`.
+
+Usage:
+    python benchmarks/import_time.py [--runs 5] [--top 15]
+"""
+
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COMMANDS = {
+    'import main': [sys.executable, '-c', 'import main'],
+    'main.py --help': [sys.executable, 'main.py', '--help'],
+    'import web_server': [sys.executable, '-c', 'import web_server'],
+}
+
+
+def time_command(cmd, runs):
+    """Median and max wall time of a command over several runs"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), max(timings)
+
+
+def slowest_imports(module, top):
+    """Parse -X importtime output into (cumulative_us, module) pairs"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=ROOT, capture_output=True, text=True)
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        # "import time: <self us> | <cumulative us> | <module>"
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        entries.append((int(cumulative_us), name.strip()))
+    return sorted(entries, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark CLI startup time')
+    parser.add_argument('--runs', type=int, default=5, help='Runs per command (default: 5)')
+    parser.add_argument('--top', type=int, default=15, help='Slowest imports to list (default: 15)')
+    args = parser.parse_args()
+
+    baseline, _ = time_command([sys.executable, '-c', 'pass'], args.runs)
+    print(f"Interpreter startup: {baseline * 1000:.0f} ms\n")
+
+    print(f"{'Command':<22}{'Median ms':>12}{'Max ms':>10}")
+    for name, cmd in COMMANDS.items():
+        median, longest = time_command(cmd, args.runs)
+        print(f"{name:<22}{median * 1000:>12.0f}{longest * 1000:>10.0f}")
+
+    print("\nSlowest imports for main (cumulative):")
+    for cumulative_us, name in slowest_imports('main', args.top):
+        print(f"  {cumulative_us / 1000:>8.1f} ms  {name}")
+
+
+if __name__ == '__main__':
+    main()
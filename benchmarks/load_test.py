@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Load test for the dashboard server
+
+Opens --clients concurrent keep-alive connections (one thread each) and requests the
+given paths round-robin for --duration seconds, then reports requests/sec and latency
+percentiles per path. With --spawn it starts web_server.py in-process on a free port
+first, so server modes can be compared without a separate terminal.
+
+Usage:
+    python benchmarks/load_test.py --url http://localhost:8080 [--clients 50] [--duration 10]
+    python benchmarks/load_test.py --spawn --workers 32 --clients 100
+    python benchmarks/load_test.py --spawn --workers 0 --no-keepalive --paths /reports/latest.json
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+import statistics
+import http.client
+from urllib.parse import urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_PATHS = ['/', '/dashboard/style.css', '/dashboard/script.js', '/reports/latest.json']
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of sorted values"""
+    if not values:
+        return 0.0
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def client(host, port, paths, deadline, keepalive, results, errors):
+    """Request paths round-robin until the deadline, recording (path, seconds) per response"""
+    conn = None
+    i = 0
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        if conn is None:
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+        start = time.perf_counter()
+        try:
+            conn.request('GET', path, headers={} if keepalive else {'Connection': 'close'})
+            response = conn.getresponse()
+            response.read()
+            elapsed = time.perf_counter() - start
+            if response.status >= 400:
+                errors.append(f"{path}: HTTP {response.status}")
+            else:
+                results.append((path, elapsed))
+            if not keepalive or response.will_close:
+                conn.close()
+                conn = None
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(f"{path}: {type(e).__name__}")
+            conn.close()
+            conn = None
+    if conn is not None:
+        conn.close()
+
+
+def spawn_server(workers):
+    """Start the dashboard server from the repo root on a free port"""
+    from web_server import DashboardServer, DashboardHandler
+
+    os.chdir(ROOT)
+    server = DashboardServer(('127.0.0.1', 0), DashboardHandler, workers)
+    # Request logging to stderr would dominate the measurement
+    DashboardHandler.log_message = lambda self, *args: None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the dashboard server')
+    parser.add_argument('--url', default='http://localhost:8080', help='Server to test (default: http://localhost:8080)')
+    parser.add_argument('--spawn', action='store_true', help='Start web_server.py in-process instead of using --url')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='With --spawn: request threads (default: config.DASHBOARD_WORKERS; 0 = one per connection)')
+    parser.add_argument('--clients', type=int, default=50, help='Concurrent connections (default: 50)')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds to run (default: 10)')
+    parser.add_argument('--paths', default=','.join(DEFAULT_PATHS),
+                        help='Comma-separated paths, requested round-robin')
+    parser.add_argument('--no-keepalive', action='store_true', help='Open a new connection per request')
+    args = parser.parse_args()
+
+    server = None
+    if args.spawn:
+        server = spawn_server(args.workers)
+        host, port = server.server_address[:2]
+    else:
+        url = urlparse(args.url)
+        host, port = url.hostname, url.port or 80
+
+    paths = [path.strip() for path in args.paths.split(',') if path.strip()]
+    results, errors = [], []
+    deadline = time.perf_counter() + args.duration
+    threads = [threading.Thread(target=client, args=(host, port, paths[i % len(paths):] + paths[:i % len(paths)],
+                                                     deadline, not args.no_keepalive, results, errors))
+               for i in range(args.clients)]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+
+    mode = 'keep-alive' if not args.no_keepalive else 'connection per request'
+    print(f"\n{args.clients} clients, {elapsed:.1f}s, {mode}")
+    print(f"Requests: {len(results)} ok, {len(errors)} failed - {len(results) / elapsed:.0f} req/s\n")
+
+    print(f"{'path':<32} {'requests':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for path in paths + ['(all)']:
+        times = sorted(t for p, t in results if path in ('(all)', p))
+        if not times:
+            continue
+        print(f"{path:<32} {len(times):>9} {statistics.median(times) * 1000:>8.1f} "
+              f"{percentile(times, 0.95) * 1000:>8.1f} {percentile(times, 0.99) * 1000:>8.1f} "
+              f"{times[-1] * 1000:>8.1f}")
+
+    if errors:
+        print(f"\nFirst errors: {', '.join(errors[:5])}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
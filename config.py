@@ -39,6 +39,67 @@ LOOKBACK_DAYS = 60  # Initial historical data fetch
 
 # Database
 DB_PATH = "hn_startups.db"
+DB_BUSY_TIMEOUT_MS = 5000  # Wait this long for a lock before failing
+DB_CACHE_SIZE_KB = 20000  # Page cache per connection
+DB_MMAP_SIZE = 256 * 1024 * 1024  # Memory-mapped I/O for reads
+
+# Sharded historical scans - the lease table may live on a path shared between hosts.
+# DB_PATH runs in WAL mode, which doesn't work over network filesystems, so point
+# SHARD_DB_PATH at a separate file when workers run on several hosts.
+SHARD_DB_PATH = os.getenv("SHARD_DB_PATH", DB_PATH)
+SHARD_SIZE = 25  # Item IDs per shard
+SHARD_LEASE_SECONDS = 600  # Leases are renewed while a worker is busy
+SHARD_MAX_ATTEMPTS = 3  # Claims before a shard that keeps failing is marked failed
+SHARD_RETRY_SECONDS = 60  # Backoff before a failed shard is retried, doubled per attempt
+
+# Retention - old non-discovery posts move to gzipped archive partitions (their IDs stay
+# in the database for dedupe) and old reports are rolled into monthly tar.gz bundles
+ARCHIVE_DIR = "archive"
+POST_RETENTION_DAYS = 90
+REPORT_RETENTION_DAYS = 30
+ARCHIVE_BATCH_SIZE = 5000  # Posts archived per transaction
+VACUUM_FREE_RATIO = 0.2  # VACUUM once this share of database pages is free
+AUTO_MAINTENANCE = os.getenv("AUTO_MAINTENANCE", "false").lower() == "true"  # Opt-in: run after each daily update
+
+# Columnar analytics store (optional: pip install pyarrow duckdb)
+ANALYTICS_DIR = "analytics"
+ANALYTICS_ENABLED = os.getenv("ANALYTICS_ENABLED", "true").lower() == "true"  # Used only if pyarrow is installed
+ANALYTICS_COMPACT_MIN_FILES = 8  # Merge a month partition once it has this many run files
+TRENDS_WINDOW_WEEKS = 12  # Trailing ISO weeks in reports/trends.json (needs duckdb)
+TRENDS_TOP_N = 10  # Categories and domains listed there
+
+# Batched writes - flush buffered rows on size or age
+DB_BATCH_SIZE = 100
+DB_FLUSH_INTERVAL = 30  # seconds
+DB_WRITE_RETRIES = 3  # Attempts per batch before it is spilled to DB_SPILL_PATH
+DB_RETRY_BACKOFF = 1.0  # seconds before the first retry, doubled each attempt
+DB_SPILL_PATH = "pending_writes.jsonl"  # Batches the store rejected, replayed once it recovers
+
+# Checkpoint journal for resuming interrupted scans
+JOURNAL_PATH = "run_journal.jsonl"
+
+# Score velocity tracking - promote fast-rising young posts before they hit MIN_SCORE
+VELOCITY_PATH = "score_series.json"
+VELOCITY_WINDOW_HOURS = 2  # Trailing window for points/hour
+VELOCITY_MAX_AGE_HOURS = 12  # Only young posts are eligible for promotion
+VELOCITY_MIN_POINTS_PER_HOUR = 10
+VELOCITY_MIN_AGE_MINUTES = 20  # Single-sample posts younger than this aren't promoted
+VELOCITY_TRACK_HOURS = 72  # Drop series for stories older than this
+
+# LLM budget per run (0 = unlimited) - candidates beyond it stay queued for the next run
+LLM_REQUEST_BUDGET = int(os.getenv("LLM_REQUEST_BUDGET", "0"))
+LLM_TOKEN_BUDGET = int(os.getenv("LLM_TOKEN_BUDGET", "0"))
+LLM_TOKENS_PER_REQUEST = 1500  # Estimate used until real usage has been observed
+LLM_MAX_CONSECUTIVE_ERRORS = 3  # Stop analyzing for the run after this many failed calls in a row
+
+# Analysis priority queue
+QUEUE_PATH = "analysis_queue.json"
+QUEUE_MAX_AGE_DAYS = 7  # Drop candidates that have waited longer than this
+SIGNAL_WEIGHTS = {
+    'detector': 5.0,  # StartupDetector score (0-1)
+    'velocity': 1.0,  # log(1 + points/hour)
+    'engagement': 1.0  # log(1 + score + 2 * comments)
+}
 
 # Startup Detection Keywords
 STARTUP_KEYWORDS = [
@@ -64,6 +125,13 @@ MIN_SCORE = 10  # Minimum HN score to consider
 MIN_COMMENTS = 5  # Minimum comments for engagement
 MAX_AGE_DAYS = 7  # For daily updates, ignore posts older than this
 
+# Dashboard server (web_server.py)
+DASHBOARD_WORKERS = int(os.getenv("DASHBOARD_WORKERS", "32"))  # Request threads; 0 = one thread per connection
+DASHBOARD_KEEPALIVE_TIMEOUT = 5  # seconds an idle keep-alive connection may hold a worker
+
 # Output settings
 REPORT_DIR = "reports"
-REPORT_FORMAT = "markdown"  # or "json", "html"
\ No newline at end of file
+REPORT_FORMAT = "markdown"  # or "json", "html"
+DELTA_RETENTION = 100  # Per-run latest.json deltas kept for clients catching up (reports/deltas/)
+REPORT_SHARD_PERIOD = "week"  # "week" or "day" - time span of each reports/shards/ file
+REPORT_HTML_PAGE_SIZE = 48  # Discoveries per pre-rendered page in reports/site/
\ No newline at end of file
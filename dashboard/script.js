@@ -1,6 +1,15 @@
 let currentFilter = 'all';
 let allDiscoveries = [];
 
+// latest.json is cached here and brought up to date from /api/changes, so repeat
+// loads only transfer the discoveries that changed since the cached version
+const SNAPSHOT_KEY = 'hn-discoveries-snapshot';
+
+// Without a cached snapshot, the newest weekly shard is rendered first and older
+// shards are fetched as the user scrolls to the end of the list
+const SHARD_BASE = '/reports/shards/';
+let shardObserver = null;
+
 // Initialize dashboard
 document.addEventListener('DOMContentLoaded', () => {
     loadDiscoveries();
@@ -36,12 +45,15 @@ async function loadDiscoveries() {
     error.style.display = 'none';
     discoveriesContainer.innerHTML = '';
     
+    if (shardObserver) {
+        shardObserver.disconnect();
+        shardObserver = null;
+    }
+    
     try {
-        // Load from the reports directory
-        const response = await fetch('/reports/latest.json');
-        if (!response.ok) throw new Error('Failed to load discoveries');
+        if (!loadCachedSnapshot() && await loadFromShards()) return;
         
-        const data = await response.json();
+        const data = await fetchSnapshot();
         allDiscoveries = data.discoveries;
         
         updateStats(data.metadata);
@@ -55,6 +67,118 @@ async function loadDiscoveries() {
     }
 }
 
+async function loadFromShards() {
+    let manifest;
+    try {
+        const response = await fetch(`${SHARD_BASE}manifest.json`);
+        if (!response.ok) return false;
+        manifest = await response.json();
+    } catch (err) {
+        return false;
+    }
+    if (!manifest.shards.length) return false;
+    
+    const pending = [...manifest.shards];
+    const fetchShard = async () => {
+        const response = await fetch(SHARD_BASE + pending[0].file);
+        if (!response.ok) throw new Error('Failed to load discoveries');
+        const shard = await response.json();
+        pending.shift();
+        return shard.discoveries.sort((a, b) => b.innovation_score - a.innovation_score);
+    };
+    
+    allDiscoveries = await fetchShard();
+    updateStats(manifest.metadata);
+    renderDiscoveries();
+    
+    const finish = () => saveSnapshot({
+        metadata: manifest.metadata,
+        discoveries: [...allDiscoveries].sort((a, b) => b.innovation_score - a.innovation_score)
+    });
+    if (!pending.length) {
+        finish();
+        return true;
+    }
+    
+    const sentinel = document.createElement('div');
+    sentinel.className = 'shard-sentinel';
+    document.getElementById('discoveries').after(sentinel);
+    
+    let loadingShard = false;
+    shardObserver = new IntersectionObserver(async entries => {
+        if (loadingShard || !entries.some(entry => entry.isIntersecting)) return;
+        loadingShard = true;
+        try {
+            const older = await fetchShard();
+            allDiscoveries = allDiscoveries.concat(older);
+            appendDiscoveries(older);
+        } catch (err) {
+            // Leave the remaining shards for the next scroll
+        } finally {
+            loadingShard = false;
+        }
+        if (!pending.length) {
+            shardObserver.disconnect();
+            shardObserver = null;
+            sentinel.remove();
+            finish();
+        }
+    }, { rootMargin: '600px' });
+    shardObserver.observe(sentinel);
+    return true;
+}
+
+async function fetchSnapshot() {
+    const cached = loadCachedSnapshot();
+    if (cached && cached.metadata && cached.metadata.version) {
+        try {
+            const response = await fetch(`/api/changes?since=${cached.metadata.version}`);
+            if (response.ok) {
+                const changes = await response.json();
+                if (!changes.full) {
+                    return changes.version === cached.metadata.version
+                        ? cached
+                        : saveSnapshot(applyChanges(cached, changes));
+                }
+            }
+        } catch (err) {
+            // No changes endpoint (e.g. static hosting) - fall back to the full report
+        }
+    }
+    
+    // Load from the reports directory
+    const response = await fetch('/reports/latest.json');
+    if (!response.ok) throw new Error('Failed to load discoveries');
+    return saveSnapshot(await response.json());
+}
+
+function applyChanges(snapshot, changes) {
+    const byId = new Map(snapshot.discoveries.map(d => [d.id, d]));
+    changes.removed.forEach(id => byId.delete(id));
+    changes.added.concat(changes.updated).forEach(d => byId.set(d.id, d));
+    return {
+        metadata: changes.metadata,
+        discoveries: [...byId.values()].sort((a, b) => b.innovation_score - a.innovation_score)
+    };
+}
+
+function loadCachedSnapshot() {
+    try {
+        return JSON.parse(localStorage.getItem(SNAPSHOT_KEY));
+    } catch (err) {
+        return null;
+    }
+}
+
+function saveSnapshot(snapshot) {
+    try {
+        localStorage.setItem(SNAPSHOT_KEY, JSON.stringify(snapshot));
+    } catch (err) {
+        // Storage full or disabled - the next load just fetches the full report
+    }
+    return snapshot;
+}
+
 function updateStats(metadata) {
     document.getElementById('totalCount').textContent = metadata.total_discoveries;
     document.getElementById('startupCount').textContent = metadata.total_startups;
@@ -82,6 +206,13 @@ function renderDiscoveries() {
     });
 }
 
+function appendDiscoveries(discoveries) {
+    const container = document.getElementById('discoveries');
+    discoveries
+        .filter(d => currentFilter === 'all' || d.type === currentFilter)
+        .forEach(discovery => container.appendChild(createDiscoveryCard(discovery)));
+}
+
 function createDiscoveryCard(discovery) {
     const card = document.createElement('div');
     card.className = 'discovery-card';
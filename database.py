@@ -1,4 +1,10 @@
+import os
+import ast
+import json
+import atexit
 import sqlite3
+import threading
+from pathlib import Path
 from datetime import datetime
 from contextlib import contextmanager
 import config
@@ -6,15 +12,88 @@ import config
 # AIDEV-NOTE: Database module for tracking processed posts and discovered startups
 # Uses SQLite for simplicity and portability
 
+# AIDEV-NOTE: Connections are long-lived and per thread (and per process, so forked
+# shard workers never reuse a parent's handle). The database runs in WAL mode, so the
+# pipeline's writes and the dashboard's read-only connections don't block each other.
+
+class ConnectionManager:
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all = []
+
+    def get(self, readonly=False):
+        """Return this thread's connection for config.DB_PATH, opening it on first use"""
+        conns = getattr(self._local, 'conns', None)
+        if conns is None:
+            conns = self._local.conns = {}
+        
+        key = (config.DB_PATH, readonly, os.getpid())
+        conn = conns.get(key)
+        if conn is None:
+            conn = conns[key] = self._connect(readonly)
+            with self._lock:
+                self._all.append((os.getpid(), conn))
+        return conn
+
+    def _connect(self, readonly):
+        if readonly:
+            # Autocommit, so every query sees the latest committed writes
+            uri = Path(config.DB_PATH).resolve().as_uri() + '?mode=ro'
+            conn = sqlite3.connect(uri, uri=True, isolation_level=None, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(config.DB_PATH, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            # Safe in WAL mode: commits survive crashes, only power loss can drop the last ones
+            conn.execute('PRAGMA synchronous=NORMAL')
+        
+        conn.row_factory = sqlite3.Row
+        conn.execute(f'PRAGMA busy_timeout={config.DB_BUSY_TIMEOUT_MS}')
+        conn.execute(f'PRAGMA cache_size=-{config.DB_CACHE_SIZE_KB}')
+        conn.execute(f'PRAGMA mmap_size={config.DB_MMAP_SIZE}')
+        return conn
+
+    def close_all(self):
+        """Close every connection this process opened"""
+        with self._lock:
+            pid = os.getpid()
+            for owner, conn in self._all:
+                if owner == pid:
+                    conn.close()
+            self._all = [(owner, conn) for owner, conn in self._all if owner != pid]
+        self._local = threading.local()
+
+_connections = ConnectionManager()
+atexit.register(_connections.close_all)
+
 @contextmanager
 def get_db():
-    """Context manager for database connections"""
-    conn = sqlite3.connect(config.DB_PATH)
-    conn.row_factory = sqlite3.Row
+    """Context manager for this thread's read/write connection"""
+    conn = _connections.get()
     try:
         yield conn
-    finally:
-        conn.close()
+    except Exception:
+        # Don't leave a half-finished transaction on the long-lived connection
+        conn.rollback()
+        raise
+
+@contextmanager
+def get_read_db():
+    """
+    Context manager for a read-only connection, for serving threads and lookups
+
+    Falls back to the read/write connection until the database file exists.
+    """
+    if not os.path.exists(config.DB_PATH):
+        with get_db() as conn:
+            yield conn
+        return
+    
+    yield _connections.get(readonly=True)
+
+def close_connections():
+    """Close all pooled connections (e.g. before deleting or replacing the DB file)"""
+    _connections.close_all()
 
 def init_database():
     """Initialize database with required tables"""
@@ -69,62 +148,386 @@ def init_database():
         
         # Create indices for performance
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_posts_created_time ON posts(created_time)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_posts_is_startup ON posts(is_startup)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_startups_ai_score ON startups(ai_score)')
         
         conn.commit()
+        
+        _migrate(conn)
+
+# AIDEV-NOTE: Schema migrations, applied in order and tracked with PRAGMA user_version
+# Append new migrations to the end of MIGRATIONS - never reorder or edit applied ones
+
+TELEMETRY_COLUMNS = [
+    ('duration_seconds', 'REAL'),
+    ('hn_requests', 'INTEGER'),
+    ('hn_errors', 'INTEGER'),
+    ('llm_requests', 'INTEGER'),
+    ('llm_tokens', 'INTEGER'),
+    ('llm_errors', 'INTEGER'),
+    ('cache_hits', 'INTEGER'),
+    ('cache_misses', 'INTEGER'),
+    ('queue_depth', 'INTEGER'),
+    ('errors', 'INTEGER'),
+]
+
+def _migration_run_telemetry(conn):
+    """Add run telemetry columns to run_history"""
+    for column, column_type in TELEMETRY_COLUMNS:
+        conn.execute(f'ALTER TABLE run_history ADD COLUMN {column} {column_type}')
+    # Full telemetry including per-stage durations, as JSON
+    conn.execute('ALTER TABLE run_history ADD COLUMN telemetry TEXT')
+
+# Analysis fields exposed as indexed generated columns: (column, type, JSON path)
+ANALYSIS_COLUMNS = [
+    ('analysis_type', 'TEXT', '$.type'),
+    ('stage', 'TEXT', '$.stage'),
+    ('innovation_score', 'REAL', '$.innovation_score'),
+    ('confidence', 'REAL', '$.confidence'),
+]
+
+def _to_json(analysis):
+    """Canonical JSON for a stored analysis, accepting dicts, JSON or legacy Python reprs"""
+    if analysis is None:
+        return None
+    if isinstance(analysis, str):
+        try:
+            json.loads(analysis)
+            return analysis
+        except ValueError:
+            pass
+        try:
+            # Rows written before analyses were stored as JSON hold str(dict)
+            analysis = ast.literal_eval(analysis)
+        except (ValueError, SyntaxError):
+            # Keep unparseable text rather than dropping it
+            analysis = {'raw': analysis}
+    return json.dumps(analysis, ensure_ascii=False)
+
+def _migration_analysis_json(conn):
+    """Convert stored analyses to JSON and index their key fields"""
+    rows = conn.execute('SELECT id, analysis FROM startups WHERE analysis IS NOT NULL').fetchall()
+    conn.executemany(
+        'UPDATE startups SET analysis = ? WHERE id = ?',
+        [(_to_json(row['analysis']), row['id']) for row in rows]
+    )
+    
+    for column, column_type, path in ANALYSIS_COLUMNS:
+        conn.execute(f'''
+            ALTER TABLE startups ADD COLUMN {column} {column_type}
+            GENERATED ALWAYS AS (json_extract(analysis, '{path}')) VIRTUAL
+        ''')
+        conn.execute(f'CREATE INDEX IF NOT EXISTS idx_startups_{column} ON startups({column})')
+
+# Text indexed for search, in startups_fts column order: (column, SQL expression over NEW)
+SEARCH_COLUMNS = [
+    ('title', '(SELECT title FROM posts WHERE id = NEW.post_id)'),
+    ('name', "json_extract(NEW.analysis, '$.name')"),
+    ('summary', 'NEW.summary'),
+    ('why_interesting', "json_extract(NEW.analysis, '$.why_interesting')"),
+    ('features', "json_extract(NEW.analysis, '$.key_features')"),
+    ('category', 'NEW.category'),
+]
+
+def _migration_search_index(conn):
+    """Full-text index over startups, kept in sync by triggers (rowid = startups.id)"""
+    columns = ', '.join(column for column, _ in SEARCH_COLUMNS)
+    values = ', '.join(expression for _, expression in SEARCH_COLUMNS)
+    
+    conn.execute(f'''
+        CREATE VIRTUAL TABLE startups_fts USING fts5(
+            {columns},
+            -- No stemming, so prefix queries match what was typed; prefix indexes keep them fast
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER startups_fts_insert AFTER INSERT ON startups BEGIN
+            INSERT INTO startups_fts (rowid, {columns}) VALUES (NEW.id, {values});
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER startups_fts_update AFTER UPDATE ON startups BEGIN
+            DELETE FROM startups_fts WHERE rowid = OLD.id;
+            INSERT INTO startups_fts (rowid, {columns}) VALUES (NEW.id, {values});
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER startups_fts_delete AFTER DELETE ON startups BEGIN
+            DELETE FROM startups_fts WHERE rowid = OLD.id;
+        END
+    ''')
+    
+    # Backfill existing rows; NEW.* in the expressions maps onto the startups row alias
+    backfill = values.replace('NEW.', 's.')
+    conn.execute(f'''
+        INSERT INTO startups_fts (rowid, {columns})
+        SELECT s.id, {backfill} FROM startups s
+    ''')
+
+def _migration_archived_ids(conn):
+    """ID set of posts moved to archive partitions, so dedupe still skips them"""
+    conn.execute('''
+        CREATE TABLE archived_post_ids (
+            id INTEGER PRIMARY KEY
+        ) WITHOUT ROWID
+    ''')
+    # Finding non-discovery posts needs a fast startups lookup by post
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_startups_post_id ON startups(post_id)')
+
+# Startups kept per day in daily_leaderboard. Baked into the triggers, so changing it
+# needs a new migration; get_top_startups() falls back to a full query above it.
+LEADERBOARD_SIZE = 100
+
+# UTC day of a startup's post, as used by both aggregate tables
+_POST_DAY = "(SELECT date(created_time, 'unixepoch') FROM posts WHERE id = {row}.post_id)"
+_STAT_KEY = "coalesce({row}.analysis_type, 'other'), coalesce({row}.category, 'Uncategorized')"
+_STAT_SCORE = "coalesce({row}.innovation_score, {row}.ai_score, 0)"
+
+def _leaderboard_rebuild_day(day):
+    """SQL that recomputes one day of the leaderboard from the base tables"""
+    return f'''
+        DELETE FROM daily_leaderboard WHERE day = {day};
+        INSERT INTO daily_leaderboard (day, startup_id, created_time, ai_score)
+        SELECT {day}, s.id, p.created_time, s.ai_score
+        FROM posts p JOIN startups s ON s.post_id = p.id
+        WHERE p.created_time >= CAST(strftime('%s', {day}) AS INTEGER)
+          AND p.created_time < CAST(strftime('%s', {day}, '+1 day') AS INTEGER)
+        ORDER BY s.ai_score DESC, s.id
+        LIMIT {LEADERBOARD_SIZE};
+    '''
+
+def _stats_change(row, sign):
+    """SQL that adds (sign=1) or removes (sign=-1) one startup from daily_stats"""
+    return f'''
+        INSERT INTO daily_stats (day, item_type, category, discoveries, score_sum)
+        SELECT day, {_STAT_KEY.format(row=row)}, {sign}, {sign} * {_STAT_SCORE.format(row=row)}
+        FROM (SELECT {_POST_DAY.format(row=row)} AS day) WHERE day IS NOT NULL
+        ON CONFLICT (day, item_type, category) DO UPDATE SET
+            discoveries = discoveries + excluded.discoveries,
+            score_sum = score_sum + excluded.score_sum;
+        DELETE FROM daily_stats
+        WHERE day = {_POST_DAY.format(row=row)}
+          AND (item_type, category) = ({_STAT_KEY.format(row=row)})
+          AND discoveries <= 0;
+    '''
+
+def _migration_aggregates(conn):
+    """Trigger-maintained daily leaderboard and discovery counts, so reads skip the history"""
+    conn.execute('''
+        CREATE TABLE daily_leaderboard (
+            day TEXT NOT NULL,
+            startup_id INTEGER NOT NULL,
+            created_time INTEGER NOT NULL,
+            ai_score REAL,
+            PRIMARY KEY (day, startup_id)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('''
+        CREATE TABLE daily_stats (
+            day TEXT NOT NULL,
+            item_type TEXT NOT NULL,
+            category TEXT NOT NULL,
+            discoveries INTEGER NOT NULL,
+            score_sum REAL NOT NULL,
+            PRIMARY KEY (day, item_type, category)
+        ) WITHOUT ROWID
+    ''')
+    
+    new_day = _POST_DAY.format(row='NEW')
+    conn.execute(f'''
+        CREATE TRIGGER aggregates_insert AFTER INSERT ON startups BEGIN
+            INSERT INTO daily_leaderboard (day, startup_id, created_time, ai_score)
+            SELECT date(created_time, 'unixepoch'), NEW.id, created_time, NEW.ai_score
+            FROM posts WHERE id = NEW.post_id;
+            -- Trim the day back to the top LEADERBOARD_SIZE
+            DELETE FROM daily_leaderboard WHERE day = {new_day} AND startup_id NOT IN (
+                SELECT startup_id FROM daily_leaderboard WHERE day = {new_day}
+                ORDER BY ai_score DESC, startup_id LIMIT {LEADERBOARD_SIZE}
+            );
+            {_stats_change('NEW', 1)}
+        END
+    ''')
+    # Removing or rescoring a startup may let a trimmed one back in, so rebuild its day
+    conn.execute(f'''
+        CREATE TRIGGER aggregates_update AFTER UPDATE ON startups BEGIN
+            {_stats_change('OLD', -1)}
+            {_stats_change('NEW', 1)}
+            {_leaderboard_rebuild_day(_POST_DAY.format(row='OLD'))}
+            {_leaderboard_rebuild_day(new_day)}
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER aggregates_delete AFTER DELETE ON startups BEGIN
+            {_stats_change('OLD', -1)}
+            {_leaderboard_rebuild_day(_POST_DAY.format(row='OLD'))}
+        END
+    ''')
+    
+    # Backfill from existing rows
+    conn.execute(f'''
+        INSERT INTO daily_leaderboard (day, startup_id, created_time, ai_score)
+        SELECT day, id, created_time, ai_score FROM (
+            SELECT date(p.created_time, 'unixepoch') AS day, s.id, p.created_time, s.ai_score,
+                   ROW_NUMBER() OVER (PARTITION BY date(p.created_time, 'unixepoch')
+                                      ORDER BY s.ai_score DESC, s.id) AS position
+            FROM startups s JOIN posts p ON p.id = s.post_id
+        ) WHERE position <= {LEADERBOARD_SIZE}
+    ''')
+    conn.execute(f'''
+        INSERT INTO daily_stats (day, item_type, category, discoveries, score_sum)
+        SELECT date(p.created_time, 'unixepoch'), {_STAT_KEY.format(row='s')},
+               COUNT(*), SUM({_STAT_SCORE.format(row='s')})
+        FROM startups s JOIN posts p ON p.id = s.post_id
+        GROUP BY 1, 2, 3
+    ''')
+
+def _migration_query_indexes(conn):
+    """Composite and covering indexes picked from benchmarks/db_benchmark.py query plans"""
+    # Covers post -> (id, ai_score) lookups for the leaderboard's partial day and rebuilds,
+    # and makes the single-column post_id index redundant
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_startups_post_score ON startups(post_id, ai_score)')
+    conn.execute('DROP INDEX IF EXISTS idx_startups_post_id')
+    
+    # find_startups() filters on type or stage and sorts by innovation_score by default,
+    # so read both in index order instead of sorting every match
+    for column in ('analysis_type', 'stage'):
+        conn.execute(f'CREATE INDEX IF NOT EXISTS idx_startups_{column}_score ON startups({column}, innovation_score)')
+        conn.execute(f'DROP INDEX IF EXISTS idx_startups_{column}')
+    
+    # Never queried, but maintained on every post write
+    conn.execute('DROP INDEX IF EXISTS idx_posts_is_startup')
+    
+    # Statistics for the new indexes, so the planner uses them before the next maintenance run
+    conn.execute('ANALYZE')
+
+MIGRATIONS = [
+    _migration_run_telemetry,
+    _migration_analysis_json,
+    _migration_search_index,
+    _migration_archived_ids,
+    _migration_aggregates,
+    _migration_query_indexes,
+]
+
+def _migrate(conn):
+    """Apply any migrations newer than the database's user_version"""
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    
+    for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        # Explicit BEGIN so DDL is part of the transaction and a failed migration rolls back
+        conn.execute('BEGIN')
+        try:
+            migration(conn)
+            conn.execute(f'PRAGMA user_version = {number}')
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
 
 def is_post_processed(post_id):
     """Check if a post has already been processed"""
-    with get_db() as conn:
+    with get_read_db() as conn:
         cursor = conn.cursor()
-        result = cursor.execute('SELECT 1 FROM posts WHERE id = ?', (post_id,)).fetchone()
+        result = cursor.execute(
+            'SELECT 1 FROM posts WHERE id = ? UNION ALL SELECT 1 FROM archived_post_ids WHERE id = ?',
+            (post_id, post_id)
+        ).fetchone()
         return result is not None
 
+def get_processed_ids(post_ids):
+    """
+    Return the subset of post_ids that have already been processed
+
+    Args:
+        post_ids: Iterable of HN post IDs to check
+    """
+    post_ids = list(set(post_ids))
+    processed = set()
+    
+    with get_read_db() as conn:
+        cursor = conn.cursor()
+        # Chunk to stay under SQLite's bound-parameter limit (each chunk is bound twice)
+        for i in range(0, len(post_ids), 400):
+            chunk = post_ids[i:i + 400]
+            placeholders = ','.join('?' * len(chunk))
+            rows = cursor.execute(f'''
+                SELECT id FROM posts WHERE id IN ({placeholders})
+                UNION ALL
+                SELECT id FROM archived_post_ids WHERE id IN ({placeholders})
+            ''', chunk + chunk).fetchall()
+            processed.update(row['id'] for row in rows)
+    
+    return processed
+
+def _post_row(post_data):
+    return (
+        post_data['id'],
+        post_data['title'],
+        post_data.get('url'),
+        post_data.get('by'),
+        post_data.get('score', 0),
+        post_data.get('descendants', 0),
+        post_data['time'],
+        post_data.get('is_startup', False),
+        post_data.get('is_innovation', False),
+        post_data.get('item_type', 'other')
+    )
+
+def _startup_row(startup_data):
+    return (
+        startup_data['post_id'],
+        startup_data.get('ai_score', 0.0),
+        startup_data.get('category'),
+        startup_data.get('summary'),
+        startup_data.get('founder_info'),
+        startup_data.get('funding_stage'),
+        _to_json(startup_data.get('analysis'))
+    )
+
 def save_post(post_data):
     """Save a processed post to database"""
+    save_posts([post_data])
+
+def save_posts(posts):
+    """Save a batch of processed posts in a single transaction"""
+    if not posts:
+        return
+    
     with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT OR REPLACE INTO posts 
-            (id, title, url, author, score, num_comments, created_time, is_startup, is_innovation, item_type)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            post_data['id'],
-            post_data['title'],
-            post_data.get('url'),
-            post_data.get('by'),
-            post_data.get('score', 0),
-            post_data.get('descendants', 0),
-            post_data['time'],
-            post_data.get('is_startup', False),
-            post_data.get('is_innovation', False),
-            post_data.get('item_type', 'other')
-        ))
-        conn.commit()
+        with conn:
+            conn.executemany('''
+                INSERT OR REPLACE INTO posts 
+                (id, title, url, author, score, num_comments, created_time, is_startup, is_innovation, item_type)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [_post_row(p) for p in posts])
 
 def save_startup(startup_data):
     """Save identified startup information"""
+    save_startups([startup_data])
+
+def save_startups(startups):
+    """
+    Save a batch of startup records in a single transaction
+    
+    Posts that already have a startup row are skipped, so replaying a batch (e.g. a
+    spill journal after a crash) never duplicates them.
+    """
+    if not startups:
+        return
+    
     with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO startups 
-            (post_id, ai_score, category, summary, founder_info, funding_stage, analysis)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            startup_data['post_id'],
-            startup_data.get('ai_score', 0.0),
-            startup_data.get('category'),
-            startup_data.get('summary'),
-            startup_data.get('founder_info'),
-            startup_data.get('funding_stage'),
-            startup_data.get('analysis')
-        ))
-        conn.commit()
+        with conn:
+            conn.executemany('''
+                INSERT INTO startups 
+                (post_id, ai_score, category, summary, founder_info, funding_stage, analysis)
+                SELECT ?, ?, ?, ?, ?, ?, ?
+                WHERE NOT EXISTS (SELECT 1 FROM startups WHERE post_id = ?1)
+            ''', [_startup_row(s) for s in startups])
 
 def get_last_processed_time():
     """Get the timestamp of the most recently processed post"""
-    with get_db() as conn:
+    with get_read_db() as conn:
         cursor = conn.cursor()
         result = cursor.execute(
             'SELECT MAX(created_time) as last_time FROM posts'
@@ -132,37 +535,324 @@ def get_last_processed_time():
         return result['last_time'] if result['last_time'] else None
 
 def get_top_startups(limit=50, days=7):
-    """Get top startups by AI score from recent days"""
-    with get_db() as conn:
-        cursor = conn.cursor()
-        cutoff_time = int((datetime.now().timestamp() - (days * 24 * 60 * 60)))
+    """
+    Get top startups by AI score from recent days
+    
+    Reads whole days from daily_leaderboard and only the partial day at the cutoff
+    from the base tables, so the cost follows the result size, not the history.
+    """
+    cutoff_time = int((datetime.now().timestamp() - (days * 24 * 60 * 60)))
+    columns = '''
+        p.*, s.ai_score, s.category, s.summary, s.funding_stage, s.analysis,
+        s.analysis_type, s.stage, s.innovation_score, s.confidence
+    '''
+    
+    with get_read_db() as conn:
+        if limit > LEADERBOARD_SIZE:
+            results = conn.execute(f'''
+                SELECT {columns}
+                FROM posts p
+                JOIN startups s ON p.id = s.post_id
+                WHERE p.created_time > ?
+                ORDER BY s.ai_score DESC
+                LIMIT ?
+            ''', (cutoff_time, limit)).fetchall()
+        else:
+            results = conn.execute(f'''
+                WITH top AS (
+                    SELECT startup_id, ai_score FROM (
+                        SELECT startup_id, ai_score FROM daily_leaderboard
+                        WHERE day > date(:cutoff, 'unixepoch')
+                        UNION ALL
+                        SELECT s.id, s.ai_score FROM posts p
+                        JOIN startups s ON s.post_id = p.id
+                        WHERE p.created_time > :cutoff
+                          AND p.created_time < CAST(strftime('%s', date(:cutoff, 'unixepoch'), '+1 day') AS INTEGER)
+                    )
+                    ORDER BY ai_score DESC, startup_id
+                    LIMIT :limit
+                )
+                SELECT {columns}
+                FROM top
+                JOIN startups s ON s.id = top.startup_id
+                JOIN posts p ON p.id = s.post_id
+                ORDER BY top.ai_score DESC, top.startup_id
+            ''', {'cutoff': cutoff_time, 'limit': limit}).fetchall()
         
-        results = cursor.execute('''
-            SELECT 
-                p.*, 
-                s.ai_score, 
-                s.category, 
-                s.summary,
-                s.funding_stage,
-                s.analysis
+        return [dict(row) for row in results]
+
+def get_discovery_stats(days=None):
+    """
+    Discovery counts per type and category from daily_stats
+    
+    Args:
+        days: Only count the last N days, whole UTC days (default: all history)
+    
+    Returns:
+        Dict with total, by_type counts, categories (name, count) pairs by count,
+        and average_score
+    """
+    where, params = '', ()
+    if days is not None:
+        where = "WHERE day >= date('now', ?)"
+        params = (f'-{int(days)} days',)
+    
+    with get_read_db() as conn:
+        rows = conn.execute(f'''
+            SELECT item_type, category, SUM(discoveries) AS discoveries, SUM(score_sum) AS score_sum
+            FROM daily_stats {where}
+            GROUP BY item_type, category
+        ''', params).fetchall()
+    
+    return _summarize_stats([dict(row) for row in rows])
+
+def _summarize_stats(rows):
+    by_type, categories = {}, {}
+    for row in rows:
+        by_type[row['item_type']] = by_type.get(row['item_type'], 0) + row['discoveries']
+        categories[row['category']] = categories.get(row['category'], 0) + row['discoveries']
+    
+    total = sum(by_type.values())
+    return {
+        'total': total,
+        'by_type': by_type,
+        'categories': sorted(categories.items(), key=lambda x: x[1], reverse=True),
+        'average_score': round(sum(row['score_sum'] for row in rows) / total, 2) if total else 0.0
+    }
+
+def find_startups(analysis_type=None, stage=None, min_score=None, min_confidence=None,
+                  order_by='innovation_score', limit=50):
+    """
+    Filter and sort startups on analysis fields using their indexed columns
+    
+    Args:
+        analysis_type: "startup" or "innovation"
+        stage: Exact stage, e.g. "MVP"
+        min_score: Minimum innovation score
+        min_confidence: Minimum analysis confidence
+        order_by: "innovation_score", "confidence" or "created_time" (all descending)
+        limit: Maximum rows to return
+    """
+    order_columns = {
+        'innovation_score': 's.innovation_score',
+        'confidence': 's.confidence',
+        'created_time': 'p.created_time'
+    }
+    if order_by not in order_columns:
+        raise ValueError(f"Cannot order by {order_by!r}; expected one of {sorted(order_columns)}")
+    
+    conditions, params = [], []
+    for clause, value in [
+        ('s.analysis_type = ?', analysis_type),
+        ('s.stage = ?', stage),
+        ('s.innovation_score >= ?', min_score),
+        ('s.confidence >= ?', min_confidence),
+    ]:
+        if value is not None:
+            conditions.append(clause)
+            params.append(value)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+    # Unfiltered newest-first reads walk posts by time and stop at the limit (CROSS JOIN
+    # pins that join order); with filters, starting from the filtered startups is cheaper
+    join = 'posts p CROSS JOIN startups s' if order_by == 'created_time' and not conditions else 'startups s JOIN posts p'
+    
+    with get_read_db() as conn:
+        results = conn.execute(f'''
+            SELECT p.*, s.ai_score, s.category, s.summary, s.funding_stage, s.analysis,
+                   s.analysis_type, s.stage, s.innovation_score, s.confidence
+            FROM {join} ON p.id = s.post_id
+            {where}
+            ORDER BY {order_columns[order_by]} DESC
+            LIMIT ?
+        ''', (*params, limit)).fetchall()
+        
+        return [dict(row) for row in results]
+
+def list_startups(before=None, limit=50, include_analysis=False):
+    """
+    Page through all startups, newest first, with keyset pagination
+    
+    The key is (created_time, startup id) rather than the post id, since a re-analyzed
+    post can have several startup rows that would otherwise tie. Pages are read by
+    walking posts newest first, so the cost follows the page size, not the history.
+    
+    Args:
+        before: Cursor from the previous page - (created_time, startup_id) of its last row
+        limit: Page size
+        include_analysis: Also return the full analysis JSON (for rebuilding published records)
+    
+    Returns:
+        Tuple of (rows, cursor for the next page or None when this was the last)
+    """
+    analysis = ', s.analysis' if include_analysis else ''
+    where, params = '', ()
+    if before:
+        where = 'WHERE (p.created_time, s.id) < (?, ?)'
+        params = tuple(before)
+    
+    with get_read_db() as conn:
+        rows = [dict(row) for row in conn.execute(f'''
+            SELECT p.*, s.id AS startup_id, s.ai_score, s.category, s.summary, s.funding_stage,
+                   s.analysis_type, s.stage, s.innovation_score, s.confidence,
+                   json_extract(s.analysis, '$.name') AS name,
+                   json_extract(s.analysis, '$.why_interesting') AS why_interesting{analysis}
             FROM posts p
-            JOIN startups s ON p.id = s.post_id
-            WHERE p.created_time > ?
-            ORDER BY s.ai_score DESC
+            CROSS JOIN startups s ON s.post_id = p.id
+            {where}
+            ORDER BY p.created_time DESC, s.id DESC
             LIMIT ?
-        ''', (cutoff_time, limit)).fetchall()
+        ''', (*params, limit)).fetchall()]
+    
+    cursor = (rows[-1]['created_time'], rows[-1]['startup_id']) if len(rows) == limit else None
+    return rows, cursor
+
+# Column weights for bm25(), in SEARCH_COLUMNS order - names and titles matter most
+SEARCH_WEIGHTS = (10.0, 10.0, 4.0, 2.0, 2.0, 3.0)
+
+def _fts_literal_query(query, prefix=False):
+    """Quote every term so user input can't be parsed as FTS5 syntax"""
+    suffix = '*' if prefix else ''
+    return ' '.join('"' + term.replace('"', '""') + '"' + suffix for term in query.split())
+
+def search_startups(query, limit=20, prefix=False):
+    """
+    Ranked full-text search over every stored startup
+    
+    Args:
+        query: FTS5 query (e.g. 'rust AND database', 'llm*'); plain text works too
+        limit: Maximum results, best match first
+        prefix: Treat the query as plain words that each match as a prefix
+            (for search-as-you-type)
+    
+    Returns:
+        Rows like get_top_startups() plus `rank` (lower is better) and `snippet`
+    """
+    if not query or not query.strip():
+        return []
+    if prefix:
+        query = _fts_literal_query(query, prefix=True)
+    
+    sql = '''
+        SELECT p.*, s.ai_score, s.category, s.summary, s.funding_stage, s.analysis,
+               s.analysis_type, s.stage, s.innovation_score, s.confidence,
+               bm25(startups_fts, ?, ?, ?, ?, ?, ?) AS rank,
+               snippet(startups_fts, -1, '[', ']', '...', 12) AS snippet
+        FROM startups_fts
+        JOIN startups s ON s.id = startups_fts.rowid
+        JOIN posts p ON p.id = s.post_id
+        WHERE startups_fts MATCH ?
+        ORDER BY rank
+        LIMIT ?
+    '''
+    with get_read_db() as conn:
+        try:
+            results = conn.execute(sql, (*SEARCH_WEIGHTS, query, limit)).fetchall()
+        except sqlite3.OperationalError:
+            # Not valid FTS5 syntax (stray quotes, operators) - search the words literally
+            results = conn.execute(sql, (*SEARCH_WEIGHTS, _fts_literal_query(query), limit)).fetchall()
         
         return [dict(row) for row in results]
 
-def save_run_history(posts_processed, new_startups, total_fetched, status='completed', error=None):
-    """Save run history for monitoring"""
+def save_run_history(posts_processed, new_startups, total_fetched, status='completed', error=None,
+                     telemetry=None):
+    """
+    Save run history for monitoring
+    
+    Args:
+        telemetry: Optional dict from Profiler.telemetry() - stage durations, request
+            counts, cache hits, token usage, errors and queue depth
+    """
+    telemetry = telemetry or {}
+    columns = [column for column, _ in TELEMETRY_COLUMNS]
+    
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute('''
+        cursor.execute(f'''
             INSERT INTO run_history 
-            (posts_processed, new_startups_found, total_posts_fetched, status, error_message)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (posts_processed, new_startups, total_fetched, status, error))
+            (posts_processed, new_startups_found, total_posts_fetched, status, error_message,
+             {', '.join(columns)}, telemetry)
+            VALUES (?, ?, ?, ?, ?, {', '.join('?' * len(columns))}, ?)
+        ''', (posts_processed, new_startups, total_fetched, status, error,
+              *[telemetry.get(column) for column in columns],
+              json.dumps(telemetry) if telemetry else None))
         conn.commit()
 
-# AIDEV-TODO: Add functions for data cleanup and maintenance (e.g., remove old posts)
\ No newline at end of file
+def get_recent_runs(limit=50):
+    """Get the most recent runs, newest first, with telemetry decoded"""
+    with get_read_db() as conn:
+        cursor = conn.cursor()
+        results = cursor.execute(
+            'SELECT * FROM run_history ORDER BY id DESC LIMIT ?', (limit,)
+        ).fetchall()
+    
+    runs = []
+    for row in results:
+        run = dict(row)
+        run['telemetry'] = json.loads(run['telemetry']) if run['telemetry'] else {}
+        runs.append(run)
+    return runs
+
+# AIDEV-NOTE: Retention primitives - retention.py decides what to archive and writes the files
+
+def get_archivable_posts(cutoff_time, limit=5000):
+    """
+    Oldest posts created before cutoff_time that never became discoveries
+    
+    Args:
+        cutoff_time: Unix timestamp; only posts created before it are returned
+        limit: Maximum rows to return
+    """
+    with get_read_db() as conn:
+        results = conn.execute('''
+            SELECT p.* FROM posts p
+            WHERE p.created_time < ?
+              AND NOT EXISTS (SELECT 1 FROM startups s WHERE s.post_id = p.id)
+            ORDER BY p.created_time
+            LIMIT ?
+        ''', (cutoff_time, limit)).fetchall()
+        
+        return [dict(row) for row in results]
+
+def archive_posts(post_ids):
+    """Delete archived posts, keeping their IDs for dedupe, in one transaction"""
+    if not post_ids:
+        return
+    
+    with get_db() as conn:
+        with conn:
+            conn.executemany('INSERT OR IGNORE INTO archived_post_ids (id) VALUES (?)',
+                             [(post_id,) for post_id in post_ids])
+            conn.executemany('DELETE FROM posts WHERE id = ?', [(post_id,) for post_id in post_ids])
+
+def compact_database(free_ratio=None):
+    """
+    Refresh planner statistics and reclaim free pages
+    
+    Args:
+        free_ratio: VACUUM only once this share of pages is free
+            (default: config.VACUUM_FREE_RATIO); 0 always vacuums
+    
+    Returns:
+        Dict with the database size before and after, and whether it was vacuumed
+    """
+    free_ratio = config.VACUUM_FREE_RATIO if free_ratio is None else free_ratio
+    
+    with get_db() as conn:
+        conn.commit()  # VACUUM can't run inside a transaction
+        page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+        page_count = conn.execute('PRAGMA page_count').fetchone()[0]
+        free_pages = conn.execute('PRAGMA freelist_count').fetchone()[0]
+        
+        conn.execute('ANALYZE')
+        vacuumed = page_count > 0 and free_pages / page_count >= free_ratio
+        if vacuumed:
+            conn.execute('VACUUM')
+        # Fold the WAL back into the main file so its size is accounted for
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        
+        return {
+            'bytes_before': page_size * page_count,
+            'bytes_after': page_size * conn.execute('PRAGMA page_count').fetchone()[0],
+            'free_pages': free_pages,
+            'vacuumed': vacuumed
+        }
\ No newline at end of file
@@ -2,10 +2,12 @@
 Supabase database module for HN Discoveries
 """
 import os
-from datetime import datetime
-from typing import Dict, List, Optional
+import re
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
 import json
 from supabase import create_client, Client
+from postgrest import ReturnMethod
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -14,6 +16,27 @@ load_dotenv()
 # AIDEV-NOTE: Supabase database module for cloud persistence
 # Replaces local SQLite with Supabase PostgreSQL
 
+# Flat telemetry values stored as their own run_history columns (see supabase_schema.sql)
+TELEMETRY_COLUMNS = [
+    'duration_seconds', 'hn_requests', 'hn_errors', 'llm_requests', 'llm_tokens',
+    'llm_errors', 'cache_hits', 'cache_misses', 'queue_depth', 'errors'
+]
+
+# AIDEV-NOTE: Keep round trips and payloads small - project only the columns a caller
+# uses, send IDs in RPC bodies (no URL length limit) and skip echoing written rows back
+
+# Discovery listings: everything the dashboard cards need, without the analysis blob
+LIST_COLUMNS = (
+    'id,title,url,score,num_comments,created_time,item_type,innovation_score,category,'
+    'summary,why_interesting,key_features,analysis_type,stage,confidence,discovery_id,name:analysis->>name'
+)
+
+# Report rows additionally carry the full analysis document
+REPORT_COLUMNS = 'id,title,url,score,num_comments,created_time,item_type,innovation_score,category,summary,analysis'
+
+# IDs per processed_ids/archive_posts RPC call
+RPC_ID_BATCH = 5000
+
 class SupabaseDB:
     def __init__(self):
         """Initialize Supabase client"""
@@ -27,64 +50,99 @@ class SupabaseDB:
     
     def is_post_processed(self, post_id: int) -> bool:
         """Check if a post has already been processed"""
-        try:
-            response = self.client.table('posts').select('id').eq('id', post_id).execute()
-            return len(response.data) > 0
-        except Exception as e:
-            print(f"Error checking post {post_id}: {e}")
-            return False
+        return post_id in self.get_processed_ids([post_id])
+    
+    def get_processed_ids(self, post_ids: List[int]) -> Set[int]:
+        """Return the subset of post_ids that have already been processed (live or archived)"""
+        post_ids = list(set(post_ids))
+        processed = set()
+        
+        for i in range(0, len(post_ids), RPC_ID_BATCH):
+            chunk = post_ids[i:i + RPC_ID_BATCH]
+            try:
+                response = self.client.rpc('processed_ids', {'ids': chunk}).execute()
+                processed.update(row['id'] for row in response.data)
+            except Exception as e:
+                print(f"Error checking processed posts: {e}")
+        
+        return processed
+    
+    @staticmethod
+    def _post_record(post_data: Dict) -> Dict:
+        return {
+            'id': post_data['id'],
+            'title': post_data['title'],
+            'url': post_data.get('url'),
+            'author': post_data.get('by'),
+            'score': post_data.get('score', 0),
+            'num_comments': post_data.get('descendants', 0),
+            'created_time': post_data['time'],
+            'is_startup': post_data.get('is_startup', False),
+            'is_innovation': post_data.get('is_innovation', False),
+            'item_type': post_data.get('item_type', 'other')
+        }
+    
+    @staticmethod
+    def _discovery_record(discovery_data: Dict) -> Dict:
+        # Parse analysis if it's a string
+        analysis = discovery_data.get('analysis', {})
+        if isinstance(analysis, str):
+            try:
+                analysis = json.loads(analysis)
+            except:
+                analysis = {}
+        
+        return {
+            'post_id': discovery_data['post_id'],
+            'innovation_score': float(discovery_data.get('ai_score', 0.0)),
+            'category': discovery_data.get('category', ''),
+            'summary': discovery_data.get('summary', ''),
+            'why_interesting': analysis.get('why_interesting', ''),
+            'key_features': analysis.get('key_features', []),
+            'analysis': analysis
+        }
     
     def save_post(self, post_data: Dict) -> bool:
         """Save a processed post to database"""
+        return self.save_posts([post_data])
+    
+    def save_posts(self, posts: List[Dict]) -> bool:
+        """Upsert a batch of processed posts in one request"""
+        if not posts:
+            return True
         try:
-            # Prepare post data
-            post_record = {
-                'id': post_data['id'],
-                'title': post_data['title'],
-                'url': post_data.get('url'),
-                'author': post_data.get('by'),
-                'score': post_data.get('score', 0),
-                'num_comments': post_data.get('descendants', 0),
-                'created_time': post_data['time'],
-                'is_startup': post_data.get('is_startup', False),
-                'is_innovation': post_data.get('is_innovation', False),
-                'item_type': post_data.get('item_type', 'other')
-            }
-            
-            # Upsert post
-            self.client.table('posts').upsert(post_record).execute()
+            self.client.table('posts').upsert(
+                [self._post_record(p) for p in posts], returning=ReturnMethod.minimal
+            ).execute()
             return True
         except Exception as e:
-            print(f"Error saving post {post_data.get('id')}: {e}")
+            print(f"Error saving {len(posts)} posts: {e}")
             return False
     
     def save_discovery(self, discovery_data: Dict) -> bool:
         """Save discovery (startup/innovation) information"""
+        return self.save_discoveries([discovery_data])
+    
+    def save_discoveries(self, discoveries: List[Dict]) -> bool:
+        """
+        Insert a batch of discoveries in one request
+        
+        Posts that already have a discovery are skipped (ON CONFLICT (post_id) DO
+        NOTHING), so replaying a batch (e.g. a spill journal after a crash) never
+        duplicates them.
+        """
+        if not discoveries:
+            return True
         try:
-            # Parse analysis if it's a string
-            analysis = discovery_data.get('analysis', {})
-            if isinstance(analysis, str):
-                try:
-                    analysis = json.loads(analysis)
-                except:
-                    analysis = {}
-            
-            # Prepare discovery record
-            discovery_record = {
-                'post_id': discovery_data['post_id'],
-                'innovation_score': float(discovery_data.get('ai_score', 0.0)),
-                'category': discovery_data.get('category', ''),
-                'summary': discovery_data.get('summary', ''),
-                'why_interesting': analysis.get('why_interesting', ''),
-                'key_features': analysis.get('key_features', []),
-                'analysis': analysis
-            }
-            
-            # Insert discovery
-            self.client.table('discoveries').insert(discovery_record).execute()
+            # One row per post, keeping the first like the SQLite backend
+            records = {d['post_id']: self._discovery_record(d) for d in reversed(discoveries)}
+            self.client.table('discoveries').upsert(
+                list(records.values()), on_conflict='post_id', ignore_duplicates=True,
+                returning=ReturnMethod.minimal
+            ).execute()
             return True
         except Exception as e:
-            print(f"Error saving discovery for post {discovery_data.get('post_id')}: {e}")
+            print(f"Error saving {len(discoveries)} discoveries: {e}")
             return False
     
     def get_last_processed_time(self) -> Optional[int]:
@@ -109,10 +167,18 @@ class SupabaseDB:
             # Calculate cutoff timestamp
             cutoff_time = int((datetime.now().timestamp() - (days * 24 * 60 * 60)))
             
+            if limit <= LEADERBOARD_SIZE:
+                # Reads the trigger-maintained leaderboard instead of sorting the history
+                response = self.client.rpc('top_discoveries', {
+                    'cutoff_time': cutoff_time,
+                    'max_rows': limit
+                }).execute()
+                return response.data
+            
             # Query using the view
             response = self.client.table('discovery_details')\
-                .select('*')\
-                .gte('created_time', cutoff_time)\
+                .select(REPORT_COLUMNS)\
+                .gt('created_time', cutoff_time)\
                 .order('innovation_score', desc=True)\
                 .limit(limit)\
                 .execute()
@@ -122,26 +188,172 @@ class SupabaseDB:
             print(f"Error getting top discoveries: {e}")
             return []
     
+    def find_discoveries(self, analysis_type: Optional[str] = None, stage: Optional[str] = None,
+                         min_score: Optional[float] = None, min_confidence: Optional[float] = None,
+                         order_by: str = 'innovation_score', limit: int = 50) -> List[Dict]:
+        """Filter and sort discoveries on their indexed analysis columns"""
+        if order_by not in ('innovation_score', 'confidence', 'created_time'):
+            raise ValueError(f"Cannot order by {order_by!r}")
+        try:
+            query = self.client.table('discovery_details').select(LIST_COLUMNS)
+            if analysis_type is not None:
+                query = query.eq('analysis_type', analysis_type)
+            if stage is not None:
+                query = query.eq('stage', stage)
+            if min_score is not None:
+                query = query.gte('innovation_score', min_score)
+            if min_confidence is not None:
+                query = query.gte('confidence', min_confidence)
+            
+            response = query.order(order_by, desc=True).limit(limit).execute()
+            return response.data
+        except Exception as e:
+            print(f"Error finding discoveries: {e}")
+            return []
+    
+    def list_discoveries(self, before: Optional[Tuple[int, str]] = None, limit: int = 50,
+                         include_analysis: bool = False) -> Tuple[List[Dict], Optional[Tuple[int, str]]]:
+        """
+        Page through all discoveries, newest first, with keyset pagination on
+        (created_time, discovery_id) - unique even when a post was analyzed twice
+        
+        Args:
+            before: Cursor from the previous page - (created_time, discovery_id) of its last row
+            limit: Page size
+            include_analysis: Also return the full analysis document
+        
+        Returns:
+            Tuple of (rows, cursor for the next page or None when this was the last)
+        """
+        try:
+            columns = f'{LIST_COLUMNS},analysis' if include_analysis else LIST_COLUMNS
+            query = self.client.table('discovery_details').select(columns)
+            if before:
+                created_time, discovery_id = before
+                query = query.or_(
+                    f'created_time.lt.{created_time},'
+                    f'and(created_time.eq.{created_time},discovery_id.lt.{discovery_id})'
+                )
+            rows = query.order('created_time', desc=True).order('discovery_id', desc=True)\
+                .limit(limit).execute().data
+        except Exception as e:
+            print(f"Error listing discoveries: {e}")
+            return [], None
+        
+        cursor = (rows[-1]['created_time'], rows[-1]['discovery_id']) if len(rows) == limit else None
+        return rows, cursor
+    
+    def search_discoveries(self, query: str, limit: int = 20, prefix: bool = False) -> List[Dict]:
+        """
+        Ranked full-text search over all discoveries (best match first)
+        
+        Args:
+            query: Web-search style query ("quoted phrase", or, -exclude)
+            prefix: Treat the query as plain words that each match as a prefix
+        """
+        if prefix:
+            # to_tsquery syntax: word:* & word:*
+            query = ' & '.join(f"{word}:*" for word in re.findall(r'\w+', query))
+        if not query or not query.strip():
+            return []
+        try:
+            response = self.client.rpc('search_discoveries', {
+                'search_query': query,
+                'match_limit': limit,
+                'prefix_match': prefix
+            }).execute()
+            return response.data
+        except Exception as e:
+            print(f"Error searching discoveries: {e}")
+            return []
+    
+    def get_discovery_stats(self, days: Optional[int] = None) -> Dict:
+        """Discovery counts per type and category from daily_stats (whole UTC days)"""
+        since = (datetime.utcnow().date() - timedelta(days=days)).isoformat() if days is not None else None
+        try:
+            rows = self.client.rpc('discovery_stats', {'since': since}).execute().data
+        except Exception as e:
+            print(f"Error getting discovery stats: {e}")
+            rows = []
+        
+        by_type, categories = {}, {}
+        for row in rows:
+            by_type[row['item_type']] = by_type.get(row['item_type'], 0) + row['discoveries']
+            categories[row['category']] = categories.get(row['category'], 0) + row['discoveries']
+        
+        total = sum(by_type.values())
+        return {
+            'total': total,
+            'by_type': by_type,
+            'categories': sorted(categories.items(), key=lambda x: x[1], reverse=True),
+            'average_score': round(sum(float(row['score_sum']) for row in rows) / total, 2) if total else 0.0
+        }
+    
     def save_run_history(self, posts_processed: int, new_discoveries: int, 
-                        total_fetched: int, status: str = 'completed', error: Optional[str] = None):
-        """Save run history for monitoring"""
+                        total_fetched: int, status: str = 'completed', error: Optional[str] = None,
+                        telemetry: Optional[Dict] = None):
+        """Save run history and telemetry for monitoring"""
+        telemetry = telemetry or {}
         try:
-            # Create run_history table if it doesn't exist
-            # Note: In production, this should be in your Supabase schema
             run_record = {
                 'posts_processed': posts_processed,
                 'new_discoveries_found': new_discoveries,
                 'total_posts_fetched': total_fetched,
                 'status': status,
-                'error_message': error
+                'error_message': error,
+                'telemetry': telemetry
             }
+            for column in TELEMETRY_COLUMNS:
+                run_record[column] = telemetry.get(column)
             
-            # For now, we'll just log this
-            print(f"Run completed: {run_record}")
+            self.client.table('run_history').insert(run_record).execute()
             return True
         except Exception as e:
             print(f"Error saving run history: {e}")
             return False
+    
+    def get_archivable_posts(self, cutoff_time: int, limit: int = 5000) -> List[Dict]:
+        """Oldest posts created before cutoff_time that never became discoveries"""
+        try:
+            response = self.client.rpc('archivable_posts', {
+                'cutoff_time': cutoff_time,
+                'max_rows': limit
+            }).execute()
+            return response.data
+        except Exception as e:
+            print(f"Error getting archivable posts: {e}")
+            return []
+    
+    def archive_posts(self, post_ids: List[int]) -> bool:
+        """Delete archived posts, keeping their IDs for dedupe"""
+        try:
+            for i in range(0, len(post_ids), RPC_ID_BATCH):
+                # Records the IDs and deletes the posts in one transaction
+                self.client.rpc('archive_posts', {'ids': post_ids[i:i + RPC_ID_BATCH]}).execute()
+            return True
+        except Exception as e:
+            print(f"Error archiving posts: {e}")
+            return False
+    
+    def compact_database(self, free_ratio: Optional[float] = None) -> Dict:
+        """Postgres autovacuum and auto-analyze handle compaction on Supabase"""
+        return {'vacuumed': False}
+    
+    def get_recent_runs(self, limit: int = 50) -> List[Dict]:
+        """Get the most recent runs, newest first"""
+        try:
+            response = self.client.table('run_history')\
+                .select('*')\
+                .order('id', desc=True)\
+                .limit(limit)\
+                .execute()
+            return response.data
+        except Exception as e:
+            print(f"Error getting run history: {e}")
+            return []
+
+# Per-day depth of the daily_leaderboard table (see supabase_schema.sql)
+LEADERBOARD_SIZE = 100
 
 # Create a singleton instance
 _db_instance = None
@@ -162,18 +374,55 @@ def init_database():
 def is_post_processed(post_id: int) -> bool:
     return get_db().is_post_processed(post_id)
 
+def get_processed_ids(post_ids: List[int]) -> Set[int]:
+    return get_db().get_processed_ids(post_ids)
+
 def save_post(post_data: Dict):
     return get_db().save_post(post_data)
 
+def save_posts(posts: List[Dict]):
+    return get_db().save_posts(posts)
+
 def save_startup(startup_data: Dict):
     return get_db().save_discovery(startup_data)
 
+def save_startups(startups: List[Dict]):
+    return get_db().save_discoveries(startups)
+
 def get_last_processed_time() -> Optional[int]:
     return get_db().get_last_processed_time()
 
 def get_top_startups(limit: int = 50, days: int = 7) -> List[Dict]:
     return get_db().get_top_discoveries(limit, days)
 
+def get_discovery_stats(days: Optional[int] = None) -> Dict:
+    return get_db().get_discovery_stats(days)
+
+def find_startups(analysis_type: Optional[str] = None, stage: Optional[str] = None,
+                  min_score: Optional[float] = None, min_confidence: Optional[float] = None,
+                  order_by: str = 'innovation_score', limit: int = 50) -> List[Dict]:
+    return get_db().find_discoveries(analysis_type, stage, min_score, min_confidence, order_by, limit)
+
+def list_startups(before: Optional[Tuple[int, str]] = None, limit: int = 50,
+                  include_analysis: bool = False) -> Tuple[List[Dict], Optional[Tuple[int, str]]]:
+    return get_db().list_discoveries(before, limit, include_analysis)
+
+def search_startups(query: str, limit: int = 20, prefix: bool = False) -> List[Dict]:
+    return get_db().search_discoveries(query, limit, prefix)
+
 def save_run_history(posts_processed: int, new_startups: int, total_fetched: int, 
-                    status: str = 'completed', error: Optional[str] = None):
-    return get_db().save_run_history(posts_processed, new_startups, total_fetched, status, error)
\ No newline at end of file
+                    status: str = 'completed', error: Optional[str] = None,
+                    telemetry: Optional[Dict] = None):
+    return get_db().save_run_history(posts_processed, new_startups, total_fetched, status, error, telemetry)
+
+def get_recent_runs(limit: int = 50) -> List[Dict]:
+    return get_db().get_recent_runs(limit)
+
+def get_archivable_posts(cutoff_time: int, limit: int = 5000) -> List[Dict]:
+    return get_db().get_archivable_posts(cutoff_time, limit)
+
+def archive_posts(post_ids: List[int]):
+    return get_db().archive_posts(post_ids)
+
+def compact_database(free_ratio: Optional[float] = None) -> Dict:
+    return get_db().compact_database(free_ratio)
@@ -3,6 +3,7 @@ import time
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import config
+from profiling import profiler
 
 # AIDEV-NOTE: Hacker News API client with support for historical data fetching
 # Uses Firebase API for efficient data retrieval
@@ -14,11 +15,14 @@ class HNClient:
         
     def _get(self, endpoint: str) -> Optional[Dict]:
         """Make a GET request to HN API"""
+        profiler.incr('hn.requests')
         try:
-            response = self.session.get(f"{self.base_url}/{endpoint}.json")
-            response.raise_for_status()
-            return response.json()
+            with profiler.span('hn.get'):
+                response = self.session.get(f"{self.base_url}/{endpoint}.json")
+                response.raise_for_status()
+                return response.json()
         except requests.RequestException as e:
+            profiler.incr('hn.errors')
             print(f"Error fetching {endpoint}: {e}")
             return None
     
@@ -51,79 +55,134 @@ class HNClient:
         story_ids = self._get("askstories") or []
         return story_ids[:limit]
     
-    def fetch_stories_by_time(self, start_time: int, end_time: Optional[int] = None) -> List[Dict]:
+    def collect_story_ids(self) -> List[int]:
+        """Collect the candidate story IDs a time-range scan checks"""
+        # For initial testing, just fetch from Show HN and top stories
+        print("Fetching Show HN stories...")
+        show_ids = self.get_show_stories(limit=200)
+        
+        print("Fetching top stories...")
+        top_ids = self.get_top_stories(limit=200)
+        
+        return sorted(set(show_ids + top_ids))
+    
+    def fetch_stories(self, story_ids: List[int], start_time: int, end_time: int) -> List[Dict]:
+        """
+        Fetch specific stories, keeping those posted within a time range
+        
+        Args:
+            story_ids: HN item IDs to fetch
+            start_time: Unix timestamp for start
+            end_time: Unix timestamp for end
+        """
+        stories = []
+        for story_id in story_ids:
+            story = self.get_item(story_id)
+            if story and story.get('type') == 'story' and start_time <= story.get('time', 0) <= end_time:
+                story['fetched_at'] = int(time.time())
+                stories.append(story)
+        
+        return sorted(stories, key=lambda x: x.get('time', 0), reverse=True)
+    
+    def fetch_stories_by_time(self, start_time: int, end_time: Optional[int] = None,
+                              journal=None) -> List[Dict]:
         """
         Fetch stories within a time range
         
         Args:
             start_time: Unix timestamp for start
             end_time: Unix timestamp for end (default: now)
+            journal: Optional RunJournal to checkpoint progress into and resume from
         """
         if end_time is None:
             end_time = int(datetime.now().timestamp())
         
+        if journal and journal.fetch_complete:
+            print(f"Using {len(journal.stories)} stories from checkpoint")
+            return sorted(journal.stories, key=lambda x: x.get('time', 0), reverse=True)
+        
         # AIDEV-NOTE: HN API doesn't support time-based queries directly
         # We need to fetch stories and filter by timestamp
         stories = []
+        seen = set()
+        start_index = 0
         
-        # For initial testing, just fetch from Show HN and top stories
-        print("Fetching Show HN stories...")
-        show_ids = self.get_show_stories(limit=200)
-        
-        print("Fetching top stories...")
-        top_ids = self.get_top_stories(limit=200)
+        if journal and journal.story_ids:
+            # Resume from the last checkpointed cursor
+            all_story_ids = journal.story_ids
+            stories = list(journal.stories)
+            # Stories found after the last cursor are already in the journal; their
+            # items are fetched again below but not added twice
+            seen = {story['id'] for story in stories}
+            start_index = journal.cursor
+            print(f"Resuming fetch at {start_index}/{len(all_story_ids)} stories...")
+        else:
+            all_story_ids = self.collect_story_ids()
+            if journal:
+                journal.record_story_ids(all_story_ids)
         
-        all_story_ids = list(set(show_ids + top_ids))
         print(f"Checking {len(all_story_ids)} stories for time range...")
         
         # Process in batches to avoid overwhelming the API
         batch_size = 10
-        processed = 0
-        found = 0
+        processed = start_index
+        found = len(stories)
         
-        for story_id in all_story_ids:
+        for story_id in all_story_ids[start_index:]:
+            # Stop early if we have enough stories for testing
+            if found >= 50:
+                print(f"Found {found} stories, stopping early for testing...")
+                break
+            
             story = self.get_item(story_id)
             
             if story and story.get('type') == 'story':
                 story_time = story.get('time', 0)
+                story['fetched_at'] = int(time.time())
                 
-                if start_time <= story_time <= end_time:
+                if start_time <= story_time <= end_time and story['id'] not in seen:
+                    seen.add(story['id'])
                     stories.append(story)
                     found += 1
-                    
-                    # Stop early if we have enough stories for testing
-                    if found >= 50:
-                        print(f"Found {found} stories, stopping early for testing...")
-                        break
+                    if journal:
+                        journal.record_story(story)
             
             processed += 1
             if processed % batch_size == 0:
+                if journal:
+                    journal.record_cursor(processed)
                 print(f"Processed {processed}/{len(all_story_ids)} stories, found {found} in time range...")
                 time.sleep(0.5)  # Lighter rate limiting
         
+        if journal:
+            journal.record_cursor(processed)
+            journal.record_fetch_complete()
+        
         return sorted(stories, key=lambda x: x.get('time', 0), reverse=True)
     
-    def fetch_historical_stories(self, days: int = 60) -> List[Dict]:
+    def fetch_historical_stories(self, days: int = 60, journal=None) -> List[Dict]:
         """
         Fetch historical stories going back specified days
         
         Args:
             days: Number of days to look back
+            journal: Optional RunJournal for checkpoint/resume
         """
         end_time = int(datetime.now().timestamp())
         start_time = int((datetime.now() - timedelta(days=days)).timestamp())
         
         print(f"Fetching stories from last {days} days...")
-        return self.fetch_stories_by_time(start_time, end_time)
+        return self.fetch_stories_by_time(start_time, end_time, journal=journal)
     
-    def fetch_recent_stories(self, since_timestamp: int) -> List[Dict]:
+    def fetch_recent_stories(self, since_timestamp: int, journal=None) -> List[Dict]:
         """
         Fetch stories created after a specific timestamp
         
         Args:
             since_timestamp: Unix timestamp
+            journal: Optional RunJournal for checkpoint/resume
         """
-        return self.fetch_stories_by_time(since_timestamp)
+        return self.fetch_stories_by_time(since_timestamp, journal=journal)
     
     def get_story_with_comments(self, story_id: int, max_depth: int = 2) -> Optional[Dict]:
         """
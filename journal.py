@@ -0,0 +1,141 @@
+import os
+import json
+from typing import Dict, List, Optional
+import config
+
+# AIDEV-NOTE: Append-only progress journal so long scans can resume after a crash
+# Each line is one JSON event; replaying the file rebuilds fetch cursor, fetched
+# stories, candidate IDs and completed analyses. A torn last line is ignored.
+
+class RunJournal:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or config.JOURNAL_PATH
+        self._reset_state()
+        self._load()
+
+    def _reset_state(self):
+        self.mode: Optional[str] = None
+        self.params: Dict = {}
+        self.story_ids: List[int] = []
+        self.stories: List[Dict] = []
+        self._story_index: Dict[int, int] = {}
+        self.cursor = 0
+        self.fetch_complete = False
+        self.candidate_ids: List[int] = []
+        self.analyses: Dict[int, Optional[Dict]] = {}
+
+    def _load(self):
+        """Replay an existing journal file, if any"""
+        if not os.path.exists(self.path):
+            return
+
+        valid_bytes = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    # Partially written line from a crash - everything before it is valid
+                    break
+                self._apply(event)
+                valid_bytes += len(line)
+        
+        # Drop the torn tail so new events start on a clean line
+        if valid_bytes < os.path.getsize(self.path):
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid_bytes)
+
+    def _apply(self, event: Dict):
+        kind = event['e']
+        if kind == 'start':
+            self.mode = event['mode']
+            self.params = event['params']
+        elif kind == 'ids':
+            self.story_ids = event['ids']
+        elif kind == 'story':
+            self._add_story(event['story'])
+        elif kind == 'cursor':
+            self.cursor = event['index']
+        elif kind == 'fetched':
+            self.fetch_complete = True
+        elif kind == 'candidates':
+            self.candidate_ids = event['ids']
+        elif kind == 'analysis':
+            self.analyses[event['post_id']] = event['analysis']
+
+    def _add_story(self, story: Dict):
+        # Stories recorded after the last cursor are fetched again on resume - keep one copy
+        index = self._story_index.get(story['id'])
+        if index is None:
+            self._story_index[story['id']] = len(self.stories)
+            self.stories.append(story)
+        else:
+            self.stories[index] = story
+
+    def _append(self, event: Dict, sync: bool = True):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(event, ensure_ascii=False) + '\n')
+            f.flush()
+            if sync:
+                os.fsync(f.fileno())
+
+    @property
+    def active(self) -> bool:
+        return self.mode is not None
+
+    def start(self, mode: str, params: Dict) -> Dict:
+        """
+        Begin a run, resuming the journaled one if it was for the same mode
+
+        Args:
+            mode: Run type, e.g. "historical" or "daily"
+            params: Parameters for a fresh run (e.g. time range)
+
+        Returns:
+            The effective params - the journaled ones when resuming
+        """
+        if self.mode == mode:
+            print(f"[Journal] Resuming interrupted {mode} run: "
+                  f"{self.cursor}/{len(self.story_ids)} stories checked, "
+                  f"{len(self.analyses)} analyses completed")
+            return self.params
+
+        if self.active:
+            print(f"[Journal] Discarding checkpoint from interrupted {self.mode} run")
+
+        self.clear()
+        self.mode = mode
+        self.params = params
+        self._append({'e': 'start', 'mode': mode, 'params': params})
+        return params
+
+    def record_story_ids(self, story_ids: List[int]):
+        self.story_ids = story_ids
+        self._append({'e': 'ids', 'ids': story_ids})
+
+    def record_story(self, story: Dict):
+        # Cursor records are synced, so stories only need to reach the OS buffer
+        self._add_story(story)
+        self._append({'e': 'story', 'story': story}, sync=False)
+
+    def record_cursor(self, index: int):
+        self.cursor = index
+        self._append({'e': 'cursor', 'index': index})
+
+    def record_fetch_complete(self):
+        self.fetch_complete = True
+        self._append({'e': 'fetched'})
+
+    def record_candidates(self, post_ids: List[int]):
+        self.candidate_ids = post_ids
+        self._append({'e': 'candidates', 'ids': post_ids})
+
+    def record_analysis(self, post_id: int, analysis: Optional[Dict]):
+        self.analyses[post_id] = analysis
+        self._append({'e': 'analysis', 'post_id': post_id, 'analysis': analysis})
+
+    def clear(self):
+        """Drop the journal once a run has completed"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self._reset_state()
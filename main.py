@@ -1,49 +1,155 @@
 #!/usr/bin/env python3
 
 import argparse
+import itertools
+import json
+import multiprocessing
 import os
+import socket
 import sys
+import time
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import List, Dict, Optional
 
-# Try to use Supabase if available, otherwise fall back to SQLite
-try:
-    if os.environ.get('SUPABASE_URL'):
-        from database_supabase import init_database, is_post_processed, save_post, save_startup, get_last_processed_time, save_run_history, get_top_startups
-        print("Using Supabase database")
-    else:
-        from database import init_database, is_post_processed, save_post, save_startup, get_last_processed_time, save_run_history, get_top_startups
-        print("Using local SQLite database")
-except ImportError:
-    from database import init_database, is_post_processed, save_post, save_startup, get_last_processed_time, save_run_history, get_top_startups
-    print("Using local SQLite database (Supabase not available)")
-from hn_client import HNClient
-from startup_detector import StartupDetector
-from ai_analyzer import AIAnalyzer
-from reporter import Reporter
-from scheduler import Scheduler
+from functools import cached_property
+
+# AIDEV-NOTE: Heavy dependencies (LLM SDKs, rich, schedule, supabase, requests) are
+# imported only by the code paths that need them, so --dashboard and --help start fast.
+# Run benchmarks/import_time.py to check startup cost after adding imports here.
+from storage import get_backend
+from batch_writer import WriteBehindWriter
+from models import Discovery, parse_analysis
+from journal import RunJournal
+from velocity import VelocityTracker
+from analysis_queue import AnalysisQueue
+from shards import ShardQueue
+from retention import run_maintenance
+from profiling import profiler, SamplingProfiler, combine_telemetry
 import config
 
 # AIDEV-NOTE: Main entry point for the Hacker News Startup Discovery Agent
 # Orchestrates the entire pipeline from data collection to report generation
 
 class HNStartupAgent:
-    def __init__(self, use_deepseek: bool = False):
-        # Initialize all components
-        self.hn_client = HNClient()
-        self.detector = StartupDetector()
-        self.analyzer = AIAnalyzer(use_deepseek=use_deepseek)
-        self.reporter = Reporter()
+    def __init__(self, use_deepseek: bool = False, shard_worker: bool = False):
+        # Initialize lightweight components; API clients are built on first use
+        self.use_deepseek = use_deepseek
+        self.db = get_backend()
+        self.velocity = VelocityTracker()
+        self.journal = RunJournal()
+        
+        # Shard workers don't share the queue file - unanalyzed posts stay unsaved
+        # and are picked up by a later scan instead
+        self.queue = AnalysisQueue(persist=not shard_worker)
+        
+        # (ShardQueue, scan_id) when this agent is a shard worker drawing on its scan's
+        # shared LLM budget instead of a budget of its own
+        self.shared_budget = None
+        self._reported_tokens = 0
+        
+        # Rows the store rejects are spilled here and replayed once it recovers
+        self.spill_path = config.DB_SPILL_PATH
+        self.write_stats = {}
         
         # Initialize database
-        init_database()
+        self.db.init_database()
         
         print("Hacker News Startup Agent initialized")
     
-    def process_posts(self, posts: List[Dict]) -> tuple:
+    @cached_property
+    def hn_client(self):
+        from hn_client import HNClient
+        return HNClient()
+    
+    @cached_property
+    def detector(self):
+        from startup_detector import StartupDetector
+        return StartupDetector()
+    
+    @cached_property
+    def analyzer(self):
+        from ai_analyzer import AIAnalyzer
+        return AIAnalyzer(use_deepseek=self.use_deepseek)
+    
+    @cached_property
+    def reporter(self):
+        from reporter import Reporter
+        return Reporter()
+    
+    @cached_property
+    def analytics(self):
+        # Optional columnar copy for trend queries - None when disabled or pyarrow is missing
+        import analytics_store
+        if config.ANALYTICS_ENABLED and analytics_store.is_available():
+            return analytics_store.AnalyticsStore()
+        return None
+    
+    def record_analytics(self, posts: List[Dict], startup_data: List[Dict]):
+        """Append this run's posts and discoveries to the analytics store, if enabled"""
+        if self.analytics is None:
+            return
+        try:
+            with profiler.span('stage.analytics'):
+                self.analytics.append_run(posts, startup_data)
+        except Exception as e:
+            # Analytics is a secondary copy; never fail the run over it
+            print(f"Analytics store error: {e}")
+    
+    def update_trends(self) -> Optional[Dict]:
+        """Refresh reports/trends.json from the analytics store - None when it is unavailable"""
+        if self.analytics is None:
+            return None
+        try:
+            import trends
+            with profiler.span('stage.trends'):
+                return trends.update()
+        except Exception as e:
+            # Trends only decorate the report; never fail the run over them
+            print(f"Trends error: {e}")
+            return None
+    
+    def reset_budget(self):
+        """Give this run a fresh LLM budget - in --daemon mode the analyzer outlives each run"""
+        if 'analyzer' in self.__dict__:
+            self.analyzer.reset_usage()
+    
+    def has_budget(self) -> bool:
+        """Whether another LLM analysis fits this run's budget"""
+        if self.shared_budget is None:
+            return self.analyzer.has_budget()
+        if self.analyzer.is_failing():
+            return False
+        shards, scan_id = self.shared_budget
+        tokens = self.analyzer.tokens_used - self._reported_tokens
+        self._reported_tokens = self.analyzer.tokens_used
+        return shards.take_budget(scan_id, tokens)
+    
+    def select_engaged_posts(self, posts: List[Dict]) -> tuple:
+        """
+        Sample score velocity and keep posts with minimum engagement or fast growth
+        
+        Returns:
+            Tuple of (engaged_posts, promoted_ids)
+        """
+        with profiler.span('velocity.sample'):
+            self.velocity.sample(posts)
+        promoted_ids = self.velocity.promoted_ids(posts)
+        if promoted_ids:
+            print(f"Promoting {len(promoted_ids)} fast-rising posts below the static thresholds")
+        
+        engaged_posts = [p for p in posts
+                         if p.get('score', 0) >= config.MIN_SCORE or p['id'] in promoted_ids]
+        return engaged_posts, promoted_ids
+    
+    @profiler.timed('stage.process_posts')
+    def process_posts(self, posts: List[Dict], promoted_ids=None) -> tuple:
         """
         Process a list of posts through the pipeline
         
+        Args:
+            posts: Posts that passed the engagement filter
+            promoted_ids: IDs of fast-rising posts to analyze regardless of engagement
+        
         Returns:
             Tuple of (processed_count, new_startups_count, startup_data_list)
         """
@@ -52,88 +158,157 @@ class HNStartupAgent:
         startup_data_list = []
         
         # First, filter posts that look like startups
-        potential_startups = self.detector.filter_startup_posts(posts)
+        potential_startups = self.detector.filter_startup_posts(posts, promoted_ids=promoted_ids)
         print(f"Found {len(potential_startups)} potential startups out of {len(posts)} posts")
+        self.journal.record_candidates([p['id'] for p in potential_startups])
         
-        # Process each potential startup
-        for post in potential_startups:
-            # Skip if already processed
-            if is_post_processed(post['id']):
-                continue
-            
-            processed_count += 1
-            
-            # Analyze with AI
-            print(f"Analyzing: {post['title'][:80]}...")
-            analysis = self.analyzer.analyze_startup(post)
-            
-            if analysis and analysis['type'] in ['startup', 'innovation'] and analysis['innovation_score'] >= 5.0:
-                # This is a quality startup or innovation
-                new_startups_count += 1
-                
-                # Save to database
-                post['is_startup'] = analysis['type'] == 'startup'
-                post['is_innovation'] = analysis['type'] == 'innovation'
-                post['item_type'] = analysis['type']
-                save_post(post)
+        # Writes go to a background thread in bulk transactions, so storage latency
+        # and outages never stall analysis
+        writer = WriteBehindWriter(self.db.save_posts, self.db.save_startups, spill_path=self.spill_path)
+        
+        # Look up already-processed posts in one query instead of one per post,
+        # including candidates carried over in the queue from earlier runs and
+        # posts whose writes were spilled while the store was down
+        with profiler.span('db.get_processed_ids'):
+            processed_ids = self.db.get_processed_ids([p['id'] for p in potential_startups] + list(self.queue.entries))
+        processed_ids |= writer.spilled_ids()
+        self.queue.remove(processed_ids)
+        self.queue.push(p for p in potential_startups if p['id'] not in processed_ids)
+        print(f"{len(self.queue)} candidates queued for analysis")
+        
+        # Analyses checkpointed before a crash go first - they cost no budget
+        resumed_posts = self.queue.remove(list(self.journal.analyses))
+        
+        with writer:
+            # Process candidates best-first until the LLM budget runs out
+            for post in itertools.chain(resumed_posts, self.queue.drain(self.has_budget)):
+                # Analyze with AI, reusing analyses checkpointed before a crash
+                if self.journal.analyses.get(post['id']) is not None:
+                    profiler.incr('cache.hits')
+                    analysis = self.journal.analyses[post['id']]
+                else:
+                    profiler.incr('cache.misses')
+                    print(f"Analyzing: {post['title'][:80]}...")
+                    analysis = self.analyzer.analyze_startup(post)
+                    if analysis is None:
+                        # Failed call - retry in a later run rather than storing it as a non-startup
+                        self.queue.requeue(post)
+                        continue
+                    self.journal.record_analysis(post['id'], analysis)
                 
-                startup_data = {
-                    'post_id': post['id'],
-                    'ai_score': analysis['ai_score'],
-                    'category': analysis['category'],
-                    'summary': analysis['summary'],
-                    'founder_info': analysis.get('founder_info', ''),
-                    'funding_stage': analysis.get('funding_stage', ''),
-                    'analysis': str(analysis)  # Store full analysis as JSON string
-                }
-                save_startup(startup_data)
+                processed_count += 1
                 
-                startup_data_list.append({
-                    'post': post,
-                    'analysis': analysis
-                })
-            else:
-                # Not a startup or low quality
-                post['is_startup'] = False
-                save_post(post)
+                if analysis and analysis['type'] in ['startup', 'innovation'] and analysis['innovation_score'] >= 5.0:
+                    # This is a quality startup or innovation
+                    new_startups_count += 1
+                    
+                    # Save to database
+                    post['is_startup'] = analysis['type'] == 'startup'
+                    post['is_innovation'] = analysis['type'] == 'innovation'
+                    post['item_type'] = analysis['type']
+                    writer.add_post(post)
+                    
+                    startup_data = {
+                        'post_id': post['id'],
+                        'ai_score': analysis['ai_score'],
+                        'category': analysis['category'],
+                        'summary': analysis['summary'],
+                        'founder_info': analysis.get('founder_info', ''),
+                        'funding_stage': analysis.get('funding_stage', ''),
+                        'analysis': json.dumps(analysis, ensure_ascii=False)
+                    }
+                    writer.add_startup(startup_data)
+                    
+                    startup_data_list.append({
+                        'post': post,
+                        'analysis': analysis
+                    })
+                else:
+                    # Not a startup or low quality
+                    post['is_startup'] = False
+                    writer.add_post(post)
+        
+        self.write_stats = writer.stats()
+        
+        # Leftovers roll forward to the next run. Only saved on success so a crash
+        # keeps the previous queue and the journal covers work done since.
+        self.queue.save()
+        if self.queue:
+            print(f"LLM budget reached - {len(self.queue)} candidates deferred to the next run")
         
         return processed_count, new_startups_count, startup_data_list
     
+    def run_telemetry(self, since: Dict) -> Dict:
+        """Telemetry for the run that started at the given profiler snapshot"""
+        return profiler.telemetry(since, queue_depth=len(self.queue), **self.write_stats)
+    
     def run_historical_scan(self, days: int = 60):
         """Run initial historical scan"""
+        run_start = profiler.snapshot()
+        self.reset_budget()
+        
+        # Resume an interrupted scan with its original time range
+        params = self.journal.start('historical', {
+            'days': days,
+            'start_time': int((datetime.now() - timedelta(days=days)).timestamp()),
+            'end_time': int(datetime.now().timestamp())
+        })
+        days = params['days']
         print(f"\n[Historical] Starting scan for last {days} days...")
         
         # Fetch historical posts
-        posts = self.hn_client.fetch_historical_stories(days=days)
+        with profiler.span('stage.fetch'):
+            posts = self.hn_client.fetch_stories_by_time(
+                params['start_time'], params['end_time'], journal=self.journal
+            )
         print(f"Fetched {len(posts)} posts from the last {days} days")
         
         # Filter by minimum engagement
-        engaged_posts = [p for p in posts if p.get('score', 0) >= config.MIN_SCORE]
-        print(f"Filtered to {len(engaged_posts)} posts with minimum score of {config.MIN_SCORE}")
+        engaged_posts, promoted_ids = self.select_engaged_posts(posts)
+        print(f"Filtered to {len(engaged_posts)} posts with minimum score of {config.MIN_SCORE} or high velocity")
         
         # Process posts
-        processed, new_startups, startup_data = self.process_posts(engaged_posts)
+        processed, new_startups, startup_data = self.process_posts(engaged_posts, promoted_ids)
+        self.record_analytics(posts, startup_data)
         
         # Generate report
         if startup_data:
-            report_path = self.reporter.generate_report(startup_data)
+            report_path = self.reporter.generate_report(
+                [Discovery.from_analysis(s['post'], s['analysis']) for s in startup_data],
+                trends=self.update_trends()
+            )
             print(f"\n[Report] Generated: {report_path}")
         
         # Save run history
-        save_run_history(processed, new_startups, len(posts))
+        self.db.save_run_history(processed, new_startups, len(posts), telemetry=self.run_telemetry(run_start))
+        
+        # Run finished - the checkpoint is no longer needed
+        self.journal.clear()
         
         self.reporter.quick_summary(new_startups, processed)
     
     def run_daily_update(self):
         """Run daily update - only process new posts"""
+        run_start = profiler.snapshot()
+        self.reset_budget()
         print(f"\n[Update] Running daily update at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
-        # Get last processed timestamp
-        last_time = get_last_processed_time()
+        # An interrupted historical scan takes priority over a regular update
+        if self.journal.mode == 'historical':
+            return self.run_historical_scan(days=self.journal.params['days'])
+        
+        # Get last processed timestamp (the checkpointed one when resuming, since
+        # posts flushed before the crash have already advanced it)
+        if self.journal.mode == 'daily':
+            last_time = self.journal.params['since']
+        else:
+            last_time = self.db.get_last_processed_time()
         
         if last_time:
             # Fetch posts since last run
-            posts = self.hn_client.fetch_recent_stories(since_timestamp=last_time)
+            self.journal.start('daily', {'since': last_time})
+            with profiler.span('stage.fetch'):
+                posts = self.hn_client.fetch_recent_stories(since_timestamp=last_time, journal=self.journal)
             print(f"Fetched {len(posts)} new posts since last run")
         else:
             # First run - do historical scan
@@ -141,44 +316,184 @@ class HNStartupAgent:
             return self.run_historical_scan()
         
         # Filter by minimum engagement
-        engaged_posts = [p for p in posts if p.get('score', 0) >= config.MIN_SCORE]
+        engaged_posts, promoted_ids = self.select_engaged_posts(posts)
         
         # Process posts
-        processed, new_startups, startup_data = self.process_posts(engaged_posts)
+        processed, new_startups, startup_data = self.process_posts(engaged_posts, promoted_ids)
+        self.record_analytics(posts, startup_data)
         
-        # Get recent top startups for report (last 7 days)
-        all_recent_startups = get_top_startups(limit=50, days=7)
+        # Report on recent top startups (last 7 days)
+        self.generate_db_report(days=7)
+        
+        # Save run history
+        self.db.save_run_history(processed, new_startups, len(posts), telemetry=self.run_telemetry(run_start))
+        
+        # Run finished - the checkpoint is no longer needed
+        self.journal.clear()
+        
+        self.reporter.quick_summary(new_startups, processed)
+        
+        if config.AUTO_MAINTENANCE:
+            try:
+                run_maintenance(self.db)
+            except Exception as e:
+                # Retention can always catch up next run - never fail the update over it
+                print(f"Error during maintenance: {e}")
+    
+    def generate_db_report(self, limit: int = 50, days: int = 7):
+        """Generate a report from the top stored startups of the last N days"""
+        with profiler.span('db.get_top_startups'):
+            all_recent_startups = self.db.get_top_startups(limit=limit, days=days)
+        with profiler.span('db.get_discovery_stats'):
+            stats = self.db.get_discovery_stats(days=days)
         
-        # Generate report
         if all_recent_startups:
             report_path = self.reporter.generate_report(
-                [{'post': s, 'analysis': {
-                    'startup_name': s.get('title', 'Unknown'),
-                    'category': s.get('category', 'Unknown'),
-                    'stage': 'Unknown',
-                    'summary': s.get('summary', ''),
-                    'key_features': [],
-                    'target_audience': '',
-                    'business_model': '',
-                    'founder_info': s.get('founder_info', ''),
-                    'funding_stage': s.get('funding_stage', ''),
-                    'why_interesting': s.get('analysis', ''),
-                    'ai_score': s.get('ai_score', 0.0),
-                    'is_startup': True,
-                    'confidence': 1.0
-                }} for s in all_recent_startups]
+                [Discovery.from_row(s) for s in all_recent_startups],
+                stats=stats,
+                trends=self.update_trends()
             )
             print(f"\n[Report] Generated: {report_path}")
+    
+    def process_shard(self, shard: Dict) -> tuple:
+        """
+        Fetch and process one leased shard of a sharded historical scan
         
-        # Save run history
-        save_run_history(processed, new_startups, len(posts))
+        Returns:
+            Tuple of (posts_found, processed_count, new_startups_count)
+        """
+        # Journal per shard, so whichever worker re-leases a failed shard reuses its analyses
+        self.journal = RunJournal(f"{config.JOURNAL_PATH}.shard{shard['id']}")
+        self.spill_path = f"{config.DB_SPILL_PATH}.shard{shard['id']}"
+        self.journal.start('shard', {'shard_id': shard['id']})
         
-        self.reporter.quick_summary(new_startups, processed)
+        with profiler.span('stage.fetch'):
+            posts = self.hn_client.fetch_stories(shard['item_ids'], shard['start_time'], shard['end_time'])
+        
+        # Velocity is meaningless for historical posts, so only the static threshold applies
+        engaged_posts = [p for p in posts if p.get('score', 0) >= config.MIN_SCORE]
+        processed, new_startups, startup_data = self.process_posts(engaged_posts)
+        self.record_analytics(posts, startup_data)
+        self.journal.clear()
+        
+        return len(posts), processed, new_startups
     
-    def run_custom_query(self, query: str):
-        """Run a custom search query"""
-        # AIDEV-TODO: Implement custom query functionality
-        print("Custom query functionality not yet implemented")
+    def run_custom_query(self, query: str, limit: int = 20):
+        """Full-text search over every stored discovery and print the ranked matches"""
+        self.db.init_database()
+        with profiler.span('db.search'):
+            results = self.db.search_startups(query, limit=limit)
+        
+        if not results:
+            print(f"No discoveries match '{query}'")
+            return
+        
+        print(f"\n[Search] {len(results)} discoveries matching '{query}':\n")
+        for i, row in enumerate(results, 1):
+            analysis = parse_analysis(row.get('analysis'))
+            name = analysis.get('name') or row['title']
+            posted = datetime.fromtimestamp(row['created_time']).strftime('%Y-%m-%d')
+            score = row.get('innovation_score') or row.get('ai_score') or 0.0
+            print(f"{i:>3}. {name} ({row.get('category') or 'Uncategorized'}) - {score:.1f}/10, posted {posted}")
+            print(f"     {row.get('snippet') or row.get('summary') or ''}")
+            print(f"     https://news.ycombinator.com/item?id={row['id']}")
+
+def run_shard_worker(scan_id: int = None, use_deepseek: bool = False):
+    """Lease and process shards of a scan until none are left"""
+    shards = ShardQueue()
+    scan_id = scan_id or shards.active_scan()
+    if scan_id is None:
+        print("No sharded scan in progress")
+        return
+    
+    worker_name = f"{socket.gethostname()}-{os.getpid()}"
+    agent = HNStartupAgent(use_deepseek=use_deepseek, shard_worker=True)
+    agent.shared_budget = (shards, scan_id)
+    
+    while True:
+        shard = shards.claim(scan_id, worker_name)
+        if shard is None:
+            # Wait out the backoff of shards that failed earlier, then exit once none remain
+            wait = shards.retry_wait(scan_id)
+            if wait is None:
+                break
+            time.sleep(wait)
+            continue
+        
+        print(f"[{worker_name}] Processing shard {shard['id']} ({len(shard['item_ids'])} items)")
+        # Counters live in this process - hand them to the coordinator through the shard row
+        shard_start = profiler.snapshot()
+        agent.write_stats = {}
+        with shards.heartbeat(shard['id'], worker_name):
+            try:
+                found, processed, new_startups = agent.process_shard(shard)
+            except Exception as e:
+                print(f"[{worker_name}] Error processing shard {shard['id']}: {e}")
+                if not shards.release(shard['id'], worker_name, telemetry=agent.run_telemetry(shard_start)):
+                    print(f"[{worker_name}] Shard {shard['id']} failed {config.SHARD_MAX_ATTEMPTS} times - skipping it")
+                continue
+        
+        shards.complete(shard['id'], worker_name, found, processed, new_startups,
+                        telemetry=agent.run_telemetry(shard_start))
+
+def run_sharded_scan(days: int, workers: int, use_deepseek: bool = False):
+    """Run a historical scan split into shards across worker processes"""
+    run_start = profiler.snapshot()
+    shards = ShardQueue()
+    scan_id = shards.active_scan()
+    
+    if scan_id:
+        print(f"[Historical] Resuming sharded scan {scan_id}")
+        scan = shards.get_scan(scan_id)
+        days = round((scan['end_time'] - scan['start_time']) / (24 * 60 * 60))
+    else:
+        end_time = int(datetime.now().timestamp())
+        start_time = int((datetime.now() - timedelta(days=days)).timestamp())
+        from hn_client import HNClient
+        story_ids = HNClient().collect_story_ids()
+        scan_id = shards.create_scan(story_ids, start_time, end_time)
+        print(f"[Historical] Created sharded scan {scan_id} over {len(story_ids)} stories")
+    
+    processes = [
+        multiprocessing.Process(target=run_shard_worker, args=(scan_id, use_deepseek))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    
+    progress = shards.progress(scan_id)
+    if progress['pending'] or progress['leased']:
+        print(f"[Historical] {progress['pending'] + progress['leased']} shards unfinished - "
+              f"rerun to resume")
+        return
+    if progress['failed']:
+        print(f"[Historical] {progress['failed']} shards failed {config.SHARD_MAX_ATTEMPTS} times - "
+              f"their stories were skipped")
+    shards.finish_scan(scan_id)
+    
+    agent = HNStartupAgent(use_deepseek=use_deepseek)
+    agent.generate_db_report(days=days)
+    # The coordinator's own counters plus everything the workers did
+    telemetry = combine_telemetry(agent.run_telemetry(run_start), shards.scan_telemetry(scan_id))
+    agent.db.save_run_history(progress['posts_processed'], progress['new_startups'], progress['posts_found'],
+                              telemetry=telemetry)
+    agent.reporter.quick_summary(progress['new_startups'], progress['posts_processed'])
+
+def write_profile(sampler: SamplingProfiler = None):
+    """Print the per-stage breakdown and save it (plus flamegraph stacks) to the report dir"""
+    profiler.print_report()
+    
+    os.makedirs(config.REPORT_DIR, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    path = profiler.write_report(os.path.join(config.REPORT_DIR, f"profile_{timestamp}.json"))
+    print(f"[Profile] Stage breakdown saved to {path}")
+    
+    if sampler:
+        sampler.stop()
+        path = sampler.write_folded(os.path.join(config.REPORT_DIR, f"profile_{timestamp}.folded"))
+        print(f"[Profile] Flamegraph stacks saved to {path} (render with flamegraph.pl or speedscope)")
 
 def main():
     parser = argparse.ArgumentParser(
@@ -195,8 +510,23 @@ Examples:
   # Run as scheduled daemon (8 AM IST daily)
   python main.py --daemon
   
+  # Historical scan split across 4 worker processes
+  python main.py --historical --days 60 --workers 4
+  
+  # Join a running sharded scan from another host sharing SHARD_DB_PATH
+  python main.py --worker
+  
+  # Print a per-stage timing breakdown and write a flamegraph of the run
+  python main.py --run-once --profile --flamegraph
+  
   # Use DeepSeek instead of GPT for analysis
   python main.py --run-once --use-deepseek
+  
+  # Archive old posts and reports, then compact the database
+  python main.py --maintenance
+  
+  # Search all stored discoveries
+  python main.py --query "developer tools AND rust"
         """
     )
     
@@ -219,6 +549,19 @@ Examples:
         help='Days to look back for historical scan (default: 60)'
     )
     
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Worker processes for a sharded historical scan (default: 1)'
+    )
+    
+    parser.add_argument(
+        '--worker',
+        action='store_true',
+        help='Join the sharded scan in progress as a worker'
+    )
+    
     parser.add_argument(
         '--daemon',
         action='store_true',
@@ -231,14 +574,52 @@ Examples:
         help='Use DeepSeek model instead of GPT'
     )
     
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Print and save a per-stage timing breakdown of the run'
+    )
+    
+    parser.add_argument(
+        '--flamegraph',
+        action='store_true',
+        help='With --profile, also sample the run into a folded-stack flamegraph file'
+    )
+    
     parser.add_argument(
         '--dashboard',
         action='store_true',
         help='Launch web dashboard'
     )
     
+    parser.add_argument(
+        '--maintenance',
+        action='store_true',
+        help='Archive old posts and reports, compact the database and exit'
+    )
+    
+    parser.add_argument(
+        '--query',
+        help='Search stored discoveries (full-text, best match first) and exit'
+    )
+    
     args = parser.parse_args()
     
+    # Check if launching dashboard - it needs no API keys or pipeline clients
+    if args.dashboard:
+        from web_server import run_server
+        run_server()
+        return
+    
+    # Maintenance and search only touch local storage, so no API keys are needed either
+    if args.maintenance:
+        run_maintenance(get_backend())
+        return
+    
+    if args.query:
+        HNStartupAgent(use_deepseek=args.use_deepseek).run_custom_query(args.query)
+        return
+    
     # Check for API keys
     if not config.AZURE_OPENAI_API_KEY and not args.use_deepseek:
         print("Error: AZURE_OPENAI_API_KEY not set in .env file")
@@ -248,19 +629,38 @@ Examples:
         print("Error: AZURE_DEEPSEEK_API_KEY not set in .env file")
         sys.exit(1)
     
-    # Check if launching dashboard
-    if args.dashboard:
-        from web_server import run_server
-        run_server()
+    sampler = None
+    if args.profile and args.flamegraph:
+        sampler = SamplingProfiler()
+        sampler.start()
+    
+    try:
+        run_pipeline(args)
+    finally:
+        if args.profile:
+            write_profile(sampler)
+
+def run_pipeline(args):
+    """Dispatch the requested pipeline mode"""
+    if args.worker:
+        run_shard_worker(use_deepseek=args.use_deepseek)
+        return
+    
+    if args.historical and args.workers > 1:
+        run_sharded_scan(args.days, args.workers, use_deepseek=args.use_deepseek)
         return
     
     # Initialize agent
-    agent = HNStartupAgent(use_deepseek=args.use_deepseek)
+    with profiler.span('stage.init'):
+        agent = HNStartupAgent(use_deepseek=args.use_deepseek)
     
     if args.historical:
         # Run historical scan
         agent.run_historical_scan(days=args.days)
-    elif args.daemon:
+        return
+    
+    from scheduler import Scheduler
+    if args.daemon:
         # Run as daemon
         scheduler = Scheduler(agent.run_daily_update)
         scheduler.start()
@@ -0,0 +1,161 @@
+import json
+from datetime import datetime
+from typing import Dict
+
+# AIDEV-NOTE: The one discovery record shared by Reporter, latest.json, the dashboard
+# server and the Vercel API. Build it with from_analysis() (fresh LLM analysis) or
+# from_row() (stored rows from either backend or the Supabase view) and serialize it
+# with dumps()/encode(), which use orjson when it is installed.
+# Kept free of config and other project imports so api/*.py can use it on Vercel.
+
+try:
+    import orjson
+except ImportError:  # Optional: pip install orjson
+    orjson = None
+
+HN_ITEM_URL = "https://news.ycombinator.com/item?id={}"
+
+# Analysis fields copied through as-is, with their defaults
+_ANALYSIS_FIELDS = (
+    ('summary', ''),
+    ('why_interesting', ''),
+    ('coolness_factor', ''),
+    ('key_features', ()),
+    ('target_audience', ''),
+    ('technical_details', ''),
+    ('business_model', ''),
+    ('founder_info', ''),
+)
+
+
+class Discovery:
+    """A startup or innovation as published in latest.json and served by the APIs"""
+
+    __slots__ = (
+        'id', 'type', 'title', 'name', 'url', 'hn_score', 'hn_comments', 'created_time',
+        'category', 'stage', 'innovation_score', 'summary', 'why_interesting', 'coolness_factor',
+        'key_features', 'target_audience', 'technical_details', 'business_model', 'founder_info',
+    )
+
+    def __init__(self, **fields):
+        unknown = fields.keys() - set(self.__slots__)
+        if unknown:
+            raise TypeError(f"Unknown discovery fields: {', '.join(sorted(unknown))}")
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+        for name, default in _ANALYSIS_FIELDS:
+            if not getattr(self, name):
+                setattr(self, name, default)
+
+    @classmethod
+    def from_analysis(cls, post: Dict, analysis: Dict) -> 'Discovery':
+        """
+        Build from an HN item and its AI analysis
+
+        Args:
+            post: HN item (id, title, url, score, descendants, time)
+            analysis: Result of AIAnalyzer.analyze_startup() (ai_analyzer.py)
+        """
+        return cls(
+            id=post['id'],
+            type=analysis['type'],
+            title=post['title'],
+            name=analysis.get('name') or post['title'],
+            url=post.get('url'),
+            hn_score=post.get('score', 0),
+            hn_comments=post.get('descendants', 0),
+            created_time=post['time'],
+            category=analysis.get('category', ''),
+            stage=analysis.get('stage', ''),
+            innovation_score=float(analysis.get('innovation_score') or 0.0),
+            **{name: analysis.get(name) for name, _ in _ANALYSIS_FIELDS}
+        )
+
+    @classmethod
+    def from_row(cls, row: Dict) -> 'Discovery':
+        """
+        Build from a stored posts + startups row
+
+        Columns win over the stored analysis (JSON text in SQLite, JSONB dict in
+        Supabase), so projected rows without the analysis column work too.
+        """
+        analysis = parse_analysis(row.get('analysis'))
+        return cls(
+            id=row['id'],
+            type=analysis.get('type') or row.get('item_type'),
+            title=row['title'],
+            name=row.get('name') or analysis.get('name') or row['title'],
+            url=row.get('url'),
+            hn_score=row.get('score') or 0,
+            hn_comments=row.get('num_comments') or 0,
+            created_time=row['created_time'],
+            category=row.get('category') or analysis.get('category', ''),
+            stage=row.get('stage') or analysis.get('stage', ''),
+            innovation_score=float(row.get('innovation_score') or analysis.get('innovation_score')
+                                   or row.get('ai_score') or 0.0),
+            **{name: row.get(name) or analysis.get(name) for name, _ in _ANALYSIS_FIELDS}
+        )
+
+    def to_dict(self) -> Dict:
+        """The latest.json shape"""
+        return {
+            'id': self.id,
+            'type': self.type,
+            'title': self.title,
+            'name': self.name,
+            'url': self.url,
+            'hn_url': HN_ITEM_URL.format(self.id),
+            'hn_score': self.hn_score,
+            'hn_comments': self.hn_comments,
+            'posted_at': datetime.fromtimestamp(self.created_time).isoformat(),
+            'category': self.category,
+            'stage': self.stage,
+            'innovation_score': self.innovation_score,
+            'summary': self.summary,
+            'why_interesting': self.why_interesting,
+            'coolness_factor': self.coolness_factor,
+            'key_features': list(self.key_features),
+            'target_audience': self.target_audience,
+            'technical_details': self.technical_details,
+            'business_model': self.business_model,
+            'founder_info': self.founder_info,
+        }
+
+    def __repr__(self):
+        return f"Discovery(id={self.id!r}, type={self.type!r}, name={self.name!r})"
+
+
+def parse_analysis(analysis) -> Dict:
+    """A stored analysis as a dict - {} when missing or malformed"""
+    if isinstance(analysis, str):
+        try:
+            analysis = json.loads(analysis)
+        except ValueError:
+            return {}
+    return analysis if isinstance(analysis, dict) else {}
+
+def _default(value):
+    if isinstance(value, Discovery):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def encode(data, sort_keys: bool = False) -> bytes:
+    """
+    Compact UTF-8 JSON, with Discovery objects serialized as dicts
+
+    Args:
+        data: Value to serialize
+        sort_keys: Sort object keys (for content hashes)
+
+    Returns:
+        The encoded bytes
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(data, default=_default, option=option)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), sort_keys=sort_keys,
+                      default=_default).encode('utf-8')
+
+def dumps(data, sort_keys: bool = False) -> str:
+    """encode() as a str"""
+    return encode(data, sort_keys).decode('utf-8')
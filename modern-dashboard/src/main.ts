@@ -1,6 +1,6 @@
 import './styles/main.css';
-import { Discovery, FilterType, FilterOptions } from './types/discovery';
-import { fetchDiscoveries } from './utils/api';
+import { Discovery, FilterType, FilterOptions, ShardManifest } from './types/discovery';
+import { cacheSnapshot, fetchDiscoveries, fetchShard, fetchShardManifest, hasCachedSnapshot, searchDiscoveries } from './utils/api';
 import { filterDiscoveries } from './utils/filters';
 import { createHeader } from './components/Header';
 import { createFilterBar } from './components/FilterBar';
@@ -9,6 +9,9 @@ import { createDiscoveryCard } from './components/DiscoveryCard';
 class App {
     private discoveries: Discovery[] = [];
     private filteredDiscoveries: Discovery[] = [];
+    // Server-side search hits for the current query; null means filter locally
+    private searchResults: Discovery[] | null = null;
+    private searchRequest = 0;
     private filterOptions: FilterOptions = {
         type: 'all',
         searchQuery: '',
@@ -19,6 +22,7 @@ class App {
     
     private container: HTMLElement;
     private gridContainer: HTMLElement | null = null;
+    private shardObserver: IntersectionObserver | null = null;
     
     constructor() {
         this.container = document.getElementById('app')!;
@@ -29,7 +33,19 @@ class App {
         // Show loading state
         this.showLoading();
         
+        this.shardObserver?.disconnect();
+        this.shardObserver = null;
+        
         try {
+            // First visit: paint the newest shard, then page in older ones on scroll
+            if (!hasCachedSnapshot()) {
+                const manifest = await fetchShardManifest();
+                if (manifest && manifest.shards.length) {
+                    await this.loadShards(manifest);
+                    return;
+                }
+            }
+            
             // Fetch data
             const data = await fetchDiscoveries();
             this.discoveries = data.discoveries;
@@ -46,6 +62,46 @@ class App {
         }
     }
     
+    private async loadShards(manifest: ShardManifest) {
+        const pending = [...manifest.shards];
+        this.discoveries = await fetchShard(pending.shift()!);
+        this.filteredDiscoveries = [...this.discoveries];
+        this.buildUI(manifest.metadata);
+        this.applyFilters();
+        
+        const finish = () => cacheSnapshot({ metadata: manifest.metadata, discoveries: this.discoveries });
+        if (!pending.length) {
+            finish();
+            return;
+        }
+        
+        const sentinel = document.createElement('div');
+        sentinel.className = 'shard-sentinel';
+        this.gridContainer!.after(sentinel);
+        
+        let loading = false;
+        this.shardObserver = new IntersectionObserver(async entries => {
+            if (loading || !entries.some(entry => entry.isIntersecting)) return;
+            loading = true;
+            try {
+                this.discoveries = this.discoveries.concat(await fetchShard(pending[0]));
+                pending.shift();
+                this.applyFilters();
+            } catch (error) {
+                console.error('Error loading older discoveries:', error);
+            } finally {
+                loading = false;
+            }
+            if (!pending.length) {
+                this.shardObserver?.disconnect();
+                this.shardObserver = null;
+                sentinel.remove();
+                finish();
+            }
+        }, { rootMargin: '600px' });
+        this.shardObserver.observe(sentinel);
+    }
+    
     private buildUI(metadata: any) {
         // Clear container
         this.container.innerHTML = '';
@@ -62,7 +118,7 @@ class App {
             },
             onSearchChange: (query: string) => {
                 this.filterOptions.searchQuery = query;
-                this.applyFilters();
+                this.runSearch(query);
             },
             onRefresh: () => {
                 this.handleRefresh();
@@ -82,8 +138,23 @@ class App {
         this.container.appendChild(main);
     }
     
+    private async runSearch(query: string) {
+        const request = ++this.searchRequest;
+        this.searchResults = query.trim() ? await searchDiscoveries(query) : null;
+        
+        // Ignore responses that arrive after a newer keystroke
+        if (request === this.searchRequest) {
+            this.applyFilters();
+        }
+    }
+    
     private applyFilters() {
-        this.filteredDiscoveries = filterDiscoveries(this.discoveries, this.filterOptions);
+        if (this.searchResults) {
+            // The server already matched the query across the full history
+            this.filteredDiscoveries = filterDiscoveries(this.searchResults, { ...this.filterOptions, searchQuery: '' });
+        } else {
+            this.filteredDiscoveries = filterDiscoveries(this.discoveries, this.filterOptions);
+        }
         this.renderDiscoveries();
     }
     
@@ -28,6 +28,8 @@ export interface Metadata {
     total_discoveries: number;
     total_startups: number;
     total_innovations: number;
+    // Snapshot version assigned when latest.json was published
+    version?: number;
 }
 
 export interface DiscoveryData {
@@ -35,6 +37,40 @@ export interface DiscoveryData {
     discoveries: Discovery[];
 }
 
+// Response of /api/changes?since=N - `full` means the client must refetch latest.json
+export interface DiscoveryChanges {
+    full?: boolean;
+    version: number;
+    metadata: Metadata | null;
+    added: Discovery[];
+    updated: Discovery[];
+    removed: number[];
+}
+
+// One entry of reports/shards/manifest.json - a week (or day) of discoveries
+export interface ShardSummary {
+    key: string;
+    file: string;
+    bytes: number;
+    closed: boolean;  // Past periods are never rewritten
+    count: number;
+    startups: number;
+    innovations: number;
+    min_score: number;
+    max_score: number;
+    oldest: string;
+    newest: string;
+    categories: Record<string, number>;
+}
+
+// Shards are listed newest first
+export interface ShardManifest {
+    version: number;
+    period: 'week' | 'day';
+    metadata: Metadata;
+    shards: ShardSummary[];
+}
+
 export type FilterType = 'all' | 'startup' | 'innovation';
 
 export interface FilterOptions {
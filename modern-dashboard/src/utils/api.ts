@@ -1,6 +1,97 @@
-import { DiscoveryData } from '../types/discovery';
+import { Discovery, DiscoveryChanges, DiscoveryData, ShardManifest, ShardSummary } from '../types/discovery';
+
+// latest.json is cached here and brought up to date from /api/changes, so repeat
+// loads only transfer the discoveries that changed since the cached version
+const SNAPSHOT_KEY = 'hn-discoveries-snapshot';
+
+// Time shards of latest.json, for first visits that have no snapshot to catch up
+const SHARD_BASE = '/reports/shards/';
 
 export async function fetchDiscoveries(): Promise<DiscoveryData> {
+    const cached = loadCachedSnapshot();
+    if (cached?.metadata.version) {
+        const changes = await fetchChanges(cached.metadata.version);
+        if (changes && !changes.full) {
+            return changes.version === cached.metadata.version
+                ? cached
+                : saveSnapshot(applyChanges(cached, changes));
+        }
+    }
+    return saveSnapshot(await fetchLatest());
+}
+
+async function fetchChanges(since: number): Promise<DiscoveryChanges | null> {
+    try {
+        const response = await fetch(`/api/changes?since=${since}`);
+        return response.ok ? await response.json() : null;
+    } catch {
+        // No changes endpoint (e.g. static hosting) - fall back to the full report
+        return null;
+    }
+}
+
+function applyChanges(snapshot: DiscoveryData, changes: DiscoveryChanges): DiscoveryData {
+    const byId = new Map(snapshot.discoveries.map(d => [d.id, d]));
+    changes.removed.forEach(id => byId.delete(id));
+    [...changes.added, ...changes.updated].forEach(d => byId.set(d.id, d));
+    return {
+        metadata: changes.metadata ?? snapshot.metadata,
+        discoveries: [...byId.values()].sort((a, b) => b.innovation_score - a.innovation_score)
+    };
+}
+
+export function hasCachedSnapshot(): boolean {
+    return loadCachedSnapshot() !== null;
+}
+
+// The shard manifest, or null when shards aren't published (e.g. static hosting of latest.json only)
+export async function fetchShardManifest(): Promise<ShardManifest | null> {
+    try {
+        const response = await fetch(`${SHARD_BASE}manifest.json`);
+        return response.ok ? await response.json() : null;
+    } catch {
+        return null;
+    }
+}
+
+export async function fetchShard(shard: ShardSummary): Promise<Discovery[]> {
+    const response = await fetch(SHARD_BASE + shard.file);
+    if (!response.ok) {
+        throw new Error(`Failed to fetch shard ${shard.key}`);
+    }
+    const data = await response.json();
+    return data.discoveries;
+}
+
+// Cache a snapshot assembled from every shard, so later loads catch up from /api/changes
+export function cacheSnapshot(data: DiscoveryData): DiscoveryData {
+    return saveSnapshot({
+        metadata: data.metadata,
+        discoveries: [...data.discoveries].sort((a, b) => b.innovation_score - a.innovation_score)
+    });
+}
+
+function loadCachedSnapshot(): DiscoveryData | null {
+    try {
+        return JSON.parse(localStorage.getItem(SNAPSHOT_KEY) ?? 'null');
+    } catch {
+        return null;
+    }
+}
+
+function saveSnapshot(data: DiscoveryData): DiscoveryData {
+    // Only versioned snapshots can be caught up later; mock data is never cached
+    if (data.metadata.version) {
+        try {
+            localStorage.setItem(SNAPSHOT_KEY, JSON.stringify(data));
+        } catch {
+            // Storage full or disabled - the next load just fetches the full report
+        }
+    }
+    return data;
+}
+
+async function fetchLatest(): Promise<DiscoveryData> {
     try {
         // Try to fetch from the server
         const response = await fetch('/reports/latest.json');
@@ -24,6 +115,21 @@ export async function fetchDiscoveries(): Promise<DiscoveryData> {
     }
 }
 
+// Ranked full-text search over the whole history, or null when no search endpoint is available
+export async function searchDiscoveries(query: string, limit = 100): Promise<Discovery[] | null> {
+    try {
+        const params = new URLSearchParams({ q: query, limit: String(limit) });
+        const response = await fetch(`/api/search?${params}`);
+        if (!response.ok) {
+            return null;
+        }
+        const data = await response.json();
+        return data.discoveries;
+    } catch {
+        return null;
+    }
+}
+
 function getMockData(): DiscoveryData {
     return {
         metadata: {
@@ -0,0 +1,223 @@
+import os
+import sys
+import json
+import time
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, Optional
+
+# AIDEV-NOTE: Lightweight run instrumentation - timing spans and counters
+# Spans are cheap enough (two perf_counter calls) to stay on in every run;
+# --profile just prints and saves what was collected. SamplingProfiler is the
+# optional flamegraph artifact (folded stacks for flamegraph.pl / speedscope).
+
+class Profiler:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.perf_counter()
+            # name -> [calls, total_seconds, max_seconds]
+            self.spans: Dict[str, list] = defaultdict(lambda: [0, 0.0, 0.0])
+            self.counters: Dict[str, int] = defaultdict(int)
+            # name -> [count, total, max] of sampled values such as queue lag
+            self.observations: Dict[str, list] = defaultdict(lambda: [0, 0.0, 0.0])
+
+    @contextmanager
+    def span(self, name: str):
+        """Time a block under the given stage name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                stats = self.spans[name]
+                stats[0] += 1
+                stats[1] += elapsed
+                stats[2] = max(stats[2], elapsed)
+
+    def timed(self, name: str):
+        """Decorator form of span()"""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def incr(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def observe(self, name: str, value: float):
+        """Record a sampled value (e.g. write lag in seconds) for count/avg/max reporting"""
+        with self._lock:
+            stats = self.observations[name]
+            stats[0] += 1
+            stats[1] += value
+            stats[2] = max(stats[2], value)
+
+    def snapshot(self) -> Dict:
+        """Capture current totals so a later telemetry() call can report just the delta"""
+        with self._lock:
+            return {
+                'time': time.perf_counter(),
+                'spans': {name: list(stats) for name, stats in self.spans.items()},
+                'counters': dict(self.counters)
+            }
+
+    def telemetry(self, since: Optional[Dict] = None, **extra) -> Dict:
+        """
+        Flat run telemetry for run_history and /metrics
+
+        Args:
+            since: snapshot() taken at the start of the run (default: process start)
+            extra: Additional values to include, e.g. queue_depth
+        """
+        since = since or {'time': self.started, 'spans': {}, 'counters': {}}
+        with self._lock:
+            counters = {name: value - since['counters'].get(name, 0)
+                        for name, value in self.counters.items()}
+            stage_seconds = {
+                name: round(stats[1] - since['spans'].get(name, [0, 0.0])[1], 4)
+                for name, stats in self.spans.items()
+            }
+            duration = time.perf_counter() - since['time']
+
+        telemetry = {
+            'duration_seconds': round(duration, 3),
+            'hn_requests': counters.get('hn.requests', 0),
+            'hn_errors': counters.get('hn.errors', 0),
+            'llm_requests': counters.get('llm.requests', 0),
+            'llm_tokens': counters.get('llm.tokens', 0),
+            'llm_errors': counters.get('llm.errors', 0),
+            'cache_hits': counters.get('cache.hits', 0),
+            'cache_misses': counters.get('cache.misses', 0),
+            'errors': sum(counters.get(name, 0) for name in ('hn.errors', 'llm.errors', 'db.errors')),
+            'stage_seconds': {name: value for name, value in stage_seconds.items() if value > 0}
+        }
+        telemetry.update(extra)
+        return telemetry
+
+    def report(self) -> Dict:
+        """Per-stage breakdown of the run so far"""
+        with self._lock:
+            wall = time.perf_counter() - self.started
+            stages = {
+                name: {
+                    'calls': calls,
+                    'total_seconds': round(total, 4),
+                    'avg_ms': round(total / calls * 1000, 2) if calls else 0.0,
+                    'max_ms': round(longest * 1000, 2),
+                    'percent_of_wall': round(total / wall * 100, 1) if wall else 0.0
+                }
+                for name, (calls, total, longest) in self.spans.items()
+            }
+            observations = {
+                name: {'count': count, 'avg': round(total / count, 4) if count else 0.0, 'max': round(largest, 4)}
+                for name, (count, total, largest) in self.observations.items()
+            }
+            return {
+                'wall_seconds': round(wall, 3),
+                'stages': dict(sorted(stages.items(), key=lambda x: x[1]['total_seconds'], reverse=True)),
+                'counters': dict(self.counters),
+                'observations': observations
+            }
+
+    def print_report(self):
+        report = self.report()
+        print(f"\n[Profile] Wall time: {report['wall_seconds']:.2f}s")
+        print(f"{'Stage':<28}{'Calls':>8}{'Total s':>10}{'Avg ms':>10}{'Max ms':>10}{'% wall':>8}")
+        for name, stats in report['stages'].items():
+            print(f"{name:<28}{stats['calls']:>8}{stats['total_seconds']:>10.2f}"
+                  f"{stats['avg_ms']:>10.1f}{stats['max_ms']:>10.1f}{stats['percent_of_wall']:>8.1f}")
+        for name, value in sorted(report['counters'].items()):
+            print(f"  {name}: {value}")
+        for name, stats in sorted(report['observations'].items()):
+            print(f"  {name}: avg {stats['avg']}, max {stats['max']} ({stats['count']} samples)")
+
+    def write_report(self, path: str) -> str:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+        return path
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float = 0.005, thread_id: Optional[int] = None):
+        """
+        Sample one thread's stack on a timer
+
+        Args:
+            interval: Seconds between samples
+            thread_id: Thread to sample (default: the thread calling start())
+        """
+        self.interval = interval
+        self.thread_id = thread_id
+        self.stacks: Dict[str, int] = defaultdict(int)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self.thread_id = self.thread_id or threading.get_ident()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+
+    def write_folded(self, path: str) -> str:
+        """Write collapsed stacks, one 'frame;frame;frame count' line each"""
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+        return path
+
+
+# Telemetry fields that add up across processes (see combine_telemetry)
+ADDITIVE_TELEMETRY = (
+    'hn_requests', 'hn_errors', 'llm_requests', 'llm_tokens', 'llm_errors',
+    'cache_hits', 'cache_misses', 'errors', 'writes_retried', 'writes_spilled',
+)
+
+def combine_telemetry(base: Dict, parts) -> Dict:
+    """
+    Add other processes' telemetry (e.g. shard workers) into a run's telemetry
+
+    Counters and per-stage seconds are summed; everything else, such as the wall-clock
+    duration, keeps the base value.
+    """
+    combined = dict(base)
+    stage_seconds = dict(base.get('stage_seconds', {}))
+    for part in parts:
+        for name in ADDITIVE_TELEMETRY:
+            if name in part:
+                combined[name] = combined.get(name, 0) + part[name]
+        for name, seconds in part.get('stage_seconds', {}).items():
+            stage_seconds[name] = round(stage_seconds.get(name, 0.0) + seconds, 4)
+    combined['stage_seconds'] = stage_seconds
+    return combined
+
+
+# Shared instance used by all pipeline modules
+profiler = Profiler()
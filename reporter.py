@@ -1,11 +1,14 @@
 import os
-import json
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
 from rich.console import Console
 from rich.table import Table
 from rich.markdown import Markdown
 import config
+import snapshots
+import static_site
+from models import Discovery
+from profiling import profiler
 
 # AIDEV-NOTE: Reporter module for generating startup discovery reports
 # Supports multiple output formats: console, markdown, JSON
@@ -18,36 +21,49 @@ class Reporter:
         # Create report directory if it doesn't exist
         os.makedirs(self.report_dir, exist_ok=True)
     
-    def generate_report(self, startups: List[Dict], format: str = "all") -> str:
+    @profiler.timed('report.generate')
+    def generate_report(self, startups: List[Discovery], format: str = "all", stats: Optional[Dict] = None,
+                        trends: Optional[Dict] = None) -> str:
         """
         Generate a report of discovered startups
         
         Args:
-            startups: List of startup data with analysis
-            format: Output format - "console", "markdown", "json", or "all"
+            startups: Discoveries to report (see models.Discovery)
+            format: Output format - "console", "markdown", "json", "html", or "all"
+            stats: Summary counts from the database's get_discovery_stats(); computed
+                from `startups` when not given
+            trends: trends.update() result, added to the markdown report when given
         """
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         report_date = datetime.now().strftime("%B %d, %Y at %I:%M %p IST")
         
-        # Sort by AI score
-        startups.sort(key=lambda x: x['analysis']['ai_score'], reverse=True)
+        # Sort by AI score - every format below relies on this order
+        startups.sort(key=lambda d: d.innovation_score, reverse=True)
         
         if format in ["console", "all"]:
             self._console_report(startups, report_date)
         
         if format in ["markdown", "all"]:
-            md_path = self._markdown_report(startups, timestamp, report_date)
+            md_path = self._markdown_report(startups, timestamp, report_date, stats or self.summarize(startups), trends)
             if format == "markdown":
                 return md_path
         
+        if format in ["json", "all"] or format == "html":
+            report_data = self._report_data(startups, timestamp)
+        
         if format in ["json", "all"]:
-            json_path = self._json_report(startups, timestamp)
+            json_path = self._json_report(report_data, timestamp)
             if format == "json":
                 return json_path
         
+        if format in ["html", "all"]:
+            html_path = self._html_report(report_data)
+            if format == "html":
+                return html_path
+        
         return os.path.join(self.report_dir, f"report_{timestamp}")
     
-    def _console_report(self, startups: List[Dict], report_date: str):
+    def _console_report(self, startups: List[Discovery], report_date: str):
         """Display report in console using rich"""
         self.console.print(f"\n[bold blue]Hacker News Startup & Innovation Discovery Report[/bold blue]")
         self.console.print(f"[dim]{report_date}[/dim]\n")
@@ -57,8 +73,8 @@ class Reporter:
             return
         
         # Separate startups and innovations
-        startups_list = [s for s in startups if s['analysis']['type'] == 'startup']
-        innovations_list = [s for s in startups if s['analysis']['type'] == 'innovation']
+        startups_list = [d for d in startups if d.type == 'startup']
+        innovations_list = [d for d in startups if d.type == 'innovation']
         
         # Summary table
         table = Table(title=f"Top {len(startups)} Discoveries ({len(startups_list)} Startups, {len(innovations_list)} Innovations)")
@@ -69,17 +85,14 @@ class Reporter:
         table.add_column("Score", style="magenta", width=8)
         table.add_column("HN Score", style="blue", width=10)
         
-        for i, startup_data in enumerate(startups[:10]):  # Top 10 for console
-            post = startup_data['post']
-            analysis = startup_data['analysis']
-            
+        for i, discovery in enumerate(startups[:10]):  # Top 10 for console
             table.add_row(
                 str(i + 1),
-                analysis['name'][:25],
-                analysis['type'].capitalize(),
-                analysis['category'][:20],
-                f"{analysis['innovation_score']:.1f}/10",
-                str(post.get('score', 0))
+                discovery.name[:25],
+                discovery.type.capitalize(),
+                discovery.category[:20],
+                f"{discovery.innovation_score:.1f}/10",
+                str(discovery.hn_score)
             )
         
         self.console.print(table)
@@ -87,20 +100,34 @@ class Reporter:
         # Detailed view of top 3
         self.console.print("\n[bold]Top 3 Discoveries - Detailed View:[/bold]\n")
         
-        for i, startup_data in enumerate(startups[:3]):
-            post = startup_data['post']
-            analysis = startup_data['analysis']
-            
-            self.console.print(f"[bold cyan]#{i+1} {analysis['name']} ({analysis['type']})[/bold cyan]")
-            self.console.print(f"[link={config.HN_WEB_BASE}/item?id={post['id']}]View on HN[/link]")
-            self.console.print(f"[bold]Category:[/bold] {analysis['category']}")
-            self.console.print(f"[bold]Stage:[/bold] {analysis['stage']}")
-            self.console.print(f"[bold]AI Score:[/bold] {analysis['ai_score']}/10")
-            self.console.print(f"[bold]Summary:[/bold] {analysis['summary']}")
-            self.console.print(f"[bold]Why Interesting:[/bold] {analysis['why_interesting']}")
+        for i, discovery in enumerate(startups[:3]):
+            self.console.print(f"[bold cyan]#{i+1} {discovery.name} ({discovery.type})[/bold cyan]")
+            self.console.print(f"[link={config.HN_WEB_BASE}/item?id={discovery.id}]View on HN[/link]")
+            self.console.print(f"[bold]Category:[/bold] {discovery.category}")
+            self.console.print(f"[bold]Stage:[/bold] {discovery.stage}")
+            self.console.print(f"[bold]AI Score:[/bold] {discovery.innovation_score}/10")
+            self.console.print(f"[bold]Summary:[/bold] {discovery.summary}")
+            self.console.print(f"[bold]Why Interesting:[/bold] {discovery.why_interesting}")
             self.console.print("-" * 60 + "\n")
     
-    def _markdown_report(self, startups: List[Dict], timestamp: str, report_date: str) -> str:
+    @staticmethod
+    def summarize(startups: List[Discovery]) -> Dict:
+        """Summary counts for a list of startups, shaped like get_discovery_stats()"""
+        by_type, categories = {}, {}
+        for d in startups:
+            by_type[d.type] = by_type.get(d.type, 0) + 1
+            categories[d.category] = categories.get(d.category, 0) + 1
+        
+        return {
+            'total': len(startups),
+            'by_type': by_type,
+            'categories': sorted(categories.items(), key=lambda x: x[1], reverse=True),
+            'average_score': (sum(d.innovation_score for d in startups) / len(startups)
+                              if startups else 0.0)
+        }
+    
+    def _markdown_report(self, startups: List[Discovery], timestamp: str, report_date: str, stats: Dict,
+                         trends: Optional[Dict] = None) -> str:
         """Generate markdown report"""
         filename = f"startup_report_{timestamp}.md"
         filepath = os.path.join(self.report_dir, filename)
@@ -113,70 +140,84 @@ class Reporter:
                 f.write("No new startups found in this run.\n")
                 return filepath
             
-            # Separate types
-            startups_list = [s for s in startups if s['analysis']['type'] == 'startup']
-            innovations_list = [s for s in startups if s['analysis']['type'] == 'innovation']
-            
             f.write(f"## Summary\n\n")
-            f.write(f"- **Total Discoveries:** {len(startups)}\n")
-            f.write(f"- **Startups:** {len(startups_list)}\n")
-            f.write(f"- **Technical Innovations:** {len(innovations_list)}\n")
-            f.write(f"- **Average Score:** {sum(s['analysis']['innovation_score'] for s in startups) / len(startups):.1f}/10\n")
-            
-            # Category distribution
-            categories = {}
-            for s in startups:
-                cat = s['analysis']['category']
-                categories[cat] = categories.get(cat, 0) + 1
+            f.write(f"- **Total Discoveries:** {stats['total']}\n")
+            f.write(f"- **Startups:** {stats['by_type'].get('startup', 0)}\n")
+            f.write(f"- **Technical Innovations:** {stats['by_type'].get('innovation', 0)}\n")
+            f.write(f"- **Average Score:** {stats['average_score']:.1f}/10\n")
+            f.write(f"- **Top Categories:** {', '.join(f'{k} ({v})' for k, v in stats['categories'][:5])}\n\n")
             
-            f.write(f"- **Top Categories:** {', '.join(f'{k} ({v})' for k, v in sorted(categories.items(), key=lambda x: x[1], reverse=True)[:5])}\n\n")
+            if trends:
+                self._markdown_trends(f, trends)
             
             f.write("## Top Discoveries\n\n")
             
-            for i, startup_data in enumerate(startups):
-                post = startup_data['post']
-                analysis = startup_data['analysis']
+            for i, discovery in enumerate(startups):
+                f.write(f"### {i+1}. {discovery.name} ({discovery.type})\n\n")
+                f.write(f"- **HN Post:** [{discovery.title}](https://news.ycombinator.com/item?id={discovery.id})\n")
+                if discovery.url:
+                    f.write(f"- **URL:** {discovery.url}\n")
+                f.write(f"- **Category:** {discovery.category}\n")
+                f.write(f"- **Stage:** {discovery.stage}\n")
+                f.write(f"- **AI Score:** {discovery.innovation_score}/10\n")
+                f.write(f"- **HN Score:** {discovery.hn_score} points, {discovery.hn_comments} comments\n\n")
                 
-                f.write(f"### {i+1}. {analysis['name']} ({analysis['type']})\n\n")
-                f.write(f"- **HN Post:** [{post['title']}](https://news.ycombinator.com/item?id={post['id']})\n")
-                if post.get('url'):
-                    f.write(f"- **URL:** {post['url']}\n")
-                f.write(f"- **Category:** {analysis['category']}\n")
-                f.write(f"- **Stage:** {analysis['stage']}\n")
-                f.write(f"- **AI Score:** {analysis['ai_score']}/10\n")
-                f.write(f"- **HN Score:** {post.get('score', 0)} points, {post.get('descendants', 0)} comments\n\n")
+                f.write(f"**Summary:** {discovery.summary}\n\n")
                 
-                f.write(f"**Summary:** {analysis['summary']}\n\n")
-                
-                if analysis['key_features']:
+                if discovery.key_features:
                     f.write("**Key Features:**\n")
-                    for feature in analysis['key_features']:
+                    for feature in discovery.key_features:
                         f.write(f"- {feature}\n")
                     f.write("\n")
                 
-                if analysis['target_audience']:
-                    f.write(f"**Target Audience:** {analysis['target_audience']}\n\n")
+                if discovery.target_audience:
+                    f.write(f"**Target Audience:** {discovery.target_audience}\n\n")
                 
-                if analysis['why_interesting']:
-                    f.write(f"**Why It's Interesting:** {analysis['why_interesting']}\n\n")
+                if discovery.why_interesting:
+                    f.write(f"**Why It's Interesting:** {discovery.why_interesting}\n\n")
                 
                 f.write("---\n\n")
         
         return filepath
     
-    def _json_report(self, startups: List[Dict], timestamp: str) -> str:
-        """Generate JSON report"""
-        filename = f"startup_report_{timestamp}.json"
-        filepath = os.path.join(self.report_dir, filename)
+    @staticmethod
+    def _markdown_trends(f, trends: Dict):
+        """Trends section from a trends.json document"""
+        weeks = trends['weeks']
+        f.write(f"## Trends (last {trends['window_weeks']} weeks)\n\n")
+        
+        f.write("| Week | Startups | Innovations | Startup Share | Avg Score |\n")
+        f.write("|------|---------:|------------:|--------------:|----------:|\n")
+        for week in weeks[-4:]:
+            label = f"{week['week']} (so far)" if week['partial'] else week['week']
+            share = f"{week['startup_share']:.0%}" if week['startup_share'] is not None else "-"
+            score = f"{week['avg_score']:.1f}" if week['avg_score'] is not None else "-"
+            f.write(f"| {label} | {week['startups']} | {week['innovations']} | {share} | {score} |\n")
+        f.write("\n")
+        
+        if trends['category_growth'] and trends['growth_week']:
+            f.write(f"**Category Growth ({trends['growth_week']} vs previous week):** ")
+            f.write(', '.join(
+                f"{c['category']} {c['this_week']} ({c['change']:+d})" for c in trends['category_growth']
+            ) + "\n\n")
         
-        # Also save as latest.json for easy access
-        latest_path = os.path.join(self.report_dir, "latest.json")
+        distribution = trends['score_distribution']
+        if distribution['p50'] is not None:
+            f.write(f"**Score Distribution:** median {distribution['p50']}+, 90th percentile {distribution['p90']}+ "
+                    f"(discoveries per point: {' / '.join(str(n) for n in distribution['bins'])})\n\n")
         
+        if trends['top_domains']:
+            domains = ', '.join(f"{d['domain']} ({d['discoveries']})" for d in trends['top_domains'])
+            f.write(f"**Top Domains:** {domains}\n\n")
+    
+    @staticmethod
+    def _report_data(startups: List[Discovery], timestamp: str) -> Dict:
+        """The latest.json document shared by the JSON and HTML formats"""
         # Separate startups and innovations
-        startups_list = [s for s in startups if s['analysis']['type'] == 'startup']
-        innovations_list = [s for s in startups if s['analysis']['type'] == 'innovation']
+        startups_list = [d for d in startups if d.type == 'startup']
+        innovations_list = [d for d in startups if d.type == 'innovation']
         
-        report_data = {
+        return {
             'metadata': {
                 'timestamp': timestamp,
                 'generated_at': datetime.now().isoformat(),
@@ -185,53 +226,35 @@ class Reporter:
                 'total_startups': len(startups_list),
                 'total_innovations': len(innovations_list)
             },
-            'discoveries': []
+            # Already sorted by score in generate_report
+            'discoveries': [d.to_dict() for d in startups]
         }
+    
+    def _json_report(self, report_data: Dict, timestamp: str) -> str:
+        """Generate JSON report"""
+        filename = f"startup_report_{timestamp}.json"
+        filepath = os.path.join(self.report_dir, filename)
         
-        for startup_data in startups:
-            post = startup_data['post']
-            analysis = startup_data['analysis']
-            
-            report_data['discoveries'].append({
-                'id': post['id'],
-                'type': analysis['type'],
-                'title': post['title'],
-                'name': analysis['name'],
-                'url': post.get('url'),
-                'hn_url': f"https://news.ycombinator.com/item?id={post['id']}",
-                'hn_score': post.get('score', 0),
-                'hn_comments': post.get('descendants', 0),
-                'posted_at': datetime.fromtimestamp(post['time']).isoformat(),
-                'category': analysis['category'],
-                'stage': analysis['stage'],
-                'innovation_score': analysis['innovation_score'],
-                'summary': analysis['summary'],
-                'why_interesting': analysis['why_interesting'],
-                'coolness_factor': analysis.get('coolness_factor', ''),
-                'key_features': analysis.get('key_features', []),
-                'target_audience': analysis.get('target_audience', ''),
-                'technical_details': analysis.get('technical_details', ''),
-                'business_model': analysis.get('business_model', ''),
-                'founder_info': analysis.get('founder_info', '')
-            })
-        
-        # Sort by innovation score
-        report_data['discoveries'].sort(key=lambda x: x['innovation_score'], reverse=True)
-        
-        # Save both files
+        # Publish as the next latest.json version (with a delta for clients that
+        # already hold an older one), then archive the same serialized snapshot
+        body = snapshots.publish(report_data, self.report_dir)
         with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(report_data, f, indent=2, ensure_ascii=False)
-        
-        with open(latest_path, 'w', encoding='utf-8') as f:
-            json.dump(report_data, f, indent=2, ensure_ascii=False)
+            f.write(body)
         
         return filepath
     
+    def _html_report(self, report_data: Dict) -> str:
+        """Pre-render the report as static HTML pages (only pages whose content changed)"""
+        site_dir = os.path.join(self.report_dir, 'site')
+        counts = static_site.build(report_data, site_dir)
+        self.console.print(f"[dim]HTML pages: {counts['rendered']} rendered, {counts['unchanged']} unchanged, "
+                           f"{counts['removed']} removed[/dim]")
+        return os.path.join(site_dir, 'index.html')
+    
     def quick_summary(self, new_startups: int, total_processed: int):
         """Print a quick summary after a run"""
         self.console.print(f"\n[green][Success] Run completed successfully[/green]")
         self.console.print(f"  - Processed {total_processed} posts")
         self.console.print(f"  - Found {new_startups} new startups")
 
-# AIDEV-TODO: Add email report functionality
-# AIDEV-TODO: Add HTML report format with better styling
\ No newline at end of file
+# AIDEV-TODO: Add email report functionality
\ No newline at end of file
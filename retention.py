@@ -0,0 +1,196 @@
+import os
+import io
+import gzip
+import json
+import time
+import zlib
+import tarfile
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, Optional
+import config
+from profiling import profiler
+
+# AIDEV-NOTE: Retention engine - keeps the database and reports/ from growing forever
+# Old non-discovery posts are appended to monthly gzip partitions
+# (archive/posts_YYYY-MM.jsonl.gz) and deleted; their IDs stay in archived_post_ids so
+# dedupe still skips them. Old reports are rolled into monthly tar.gz bundles.
+# Works with either backend through its get_archivable_posts/archive_posts/compact_database.
+
+# Timestamped files Reporter and --profile write; latest.json is never bundled
+REPORT_PREFIXES = ('startup_report_', 'profile_')
+REPORT_TIMESTAMP_FORMAT = '%Y-%m-%d_%H-%M-%S'
+
+def _posts_partition(archive_dir: str, created_time: int) -> str:
+    month = datetime.fromtimestamp(created_time).strftime('%Y-%m')
+    return os.path.join(archive_dir, f"posts_{month}.jsonl.gz")
+
+def archive_old_posts(db, retention_days: Optional[int] = None, archive_dir: Optional[str] = None) -> int:
+    """
+    Move non-discovery posts older than the retention window into archive partitions
+
+    Args:
+        db: Database backend module (see storage.get_backend)
+        retention_days: Keep posts newer than this (default: config.POST_RETENTION_DAYS)
+        archive_dir: Partition directory (default: config.ARCHIVE_DIR)
+
+    Returns:
+        Number of posts archived
+    """
+    retention_days = retention_days if retention_days is not None else config.POST_RETENTION_DAYS
+    archive_dir = archive_dir or config.ARCHIVE_DIR
+    cutoff = int(time.time() - retention_days * 24 * 60 * 60)
+    os.makedirs(archive_dir, exist_ok=True)
+
+    archived = 0
+    while True:
+        posts = db.get_archivable_posts(cutoff, config.ARCHIVE_BATCH_SIZE)
+        if not posts:
+            break
+
+        by_partition = defaultdict(list)
+        for post in posts:
+            by_partition[_posts_partition(archive_dir, post['created_time'])].append(post)
+
+        for path, rows in by_partition.items():
+            # Each batch is appended as its own gzip member (readers see one stream).
+            # Compress in memory first so the file only ever grows by whole members.
+            buffer = io.BytesIO()
+            with gzip.GzipFile(fileobj=buffer, mode='wb') as gz:
+                for row in rows:
+                    gz.write((json.dumps(row, ensure_ascii=False, default=str) + '\n').encode('utf-8'))
+            with open(path, 'ab') as f:
+                f.write(buffer.getvalue())
+                f.flush()
+                os.fsync(f.fileno())
+
+        # Delete only once the rows are on disk. A crash in between re-archives the
+        # batch on the next run, and read_archived_posts skips the duplicates.
+        if db.archive_posts([post['id'] for post in posts]) is False:
+            break
+        archived += len(posts)
+
+    return archived
+
+def read_archived_posts(archive_dir: Optional[str] = None, month: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Iterate over archived posts, oldest partition first
+
+    Args:
+        archive_dir: Partition directory (default: config.ARCHIVE_DIR)
+        month: Only read one partition, e.g. "2025-01"
+    """
+    archive_dir = archive_dir or config.ARCHIVE_DIR
+    if not os.path.isdir(archive_dir):
+        return
+
+    names = sorted(name for name in os.listdir(archive_dir)
+                   if name.startswith('posts_') and name.endswith('.jsonl.gz'))
+    if month:
+        names = [name for name in names if name == f"posts_{month}.jsonl.gz"]
+
+    seen = set()
+    for name in names:
+        try:
+            with gzip.open(os.path.join(archive_dir, name), 'rt', encoding='utf-8') as f:
+                for line in f:
+                    post = json.loads(line)
+                    if post['id'] not in seen:
+                        seen.add(post['id'])
+                        yield post
+        except (EOFError, gzip.BadGzipFile, zlib.error) as e:
+            # A member torn by a crash mid-write - everything before it is intact
+            print(f"Warning: archive partition {name} is truncated: {e}")
+
+def _report_time(name: str) -> Optional[datetime]:
+    for prefix in REPORT_PREFIXES:
+        if name.startswith(prefix):
+            stamp = name[len(prefix):len(prefix) + 19]
+            try:
+                return datetime.strptime(stamp, REPORT_TIMESTAMP_FORMAT)
+            except ValueError:
+                return None
+    return None
+
+def bundle_old_reports(report_dir: Optional[str] = None, retention_days: Optional[int] = None,
+                       archive_dir: Optional[str] = None) -> int:
+    """
+    Roll reports older than the retention window into monthly tar.gz bundles
+
+    Bundles live at <archive_dir>/reports/reports_YYYY-MM.tar.gz. A bundle that already
+    exists is rewritten with the new files added, then swapped in atomically.
+
+    Returns:
+        Number of report files bundled
+    """
+    report_dir = report_dir or config.REPORT_DIR
+    retention_days = retention_days if retention_days is not None else config.REPORT_RETENTION_DAYS
+    bundle_dir = os.path.join(archive_dir or config.ARCHIVE_DIR, 'reports')
+    cutoff = datetime.now() - timedelta(days=retention_days)
+
+    if not os.path.isdir(report_dir):
+        return 0
+
+    by_month = defaultdict(list)
+    for name in sorted(os.listdir(report_dir)):
+        created = _report_time(name)
+        if created and created < cutoff:
+            by_month[created.strftime('%Y-%m')].append(name)
+
+    if by_month:
+        os.makedirs(bundle_dir, exist_ok=True)
+
+    bundled = 0
+    for month, names in sorted(by_month.items()):
+        path = os.path.join(bundle_dir, f"reports_{month}.tar.gz")
+        tmp_path = path + '.tmp'
+
+        with tarfile.open(tmp_path, 'w:gz') as bundle:
+            if os.path.exists(path):
+                with tarfile.open(path, 'r:gz') as existing:
+                    for member in existing.getmembers():
+                        if member.name not in names:
+                            bundle.addfile(member, existing.extractfile(member))
+            for name in names:
+                bundle.add(os.path.join(report_dir, name), arcname=name)
+        os.replace(tmp_path, path)
+
+        for name in names:
+            os.remove(os.path.join(report_dir, name))
+        bundled += len(names)
+
+    return bundled
+
+def run_maintenance(db) -> Dict:
+    """
+    Archive old posts, bundle old reports, then compact the database
+
+    Args:
+        db: Database backend module (see storage.get_backend)
+
+    Returns:
+        Summary dict of what was done
+    """
+    print(f"\n[Maintenance] Running retention at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    db.init_database()
+
+    with profiler.span('maintenance.archive_posts'):
+        posts_archived = archive_old_posts(db)
+    with profiler.span('maintenance.bundle_reports'):
+        reports_bundled = bundle_old_reports()
+    with profiler.span('maintenance.compact'):
+        compaction = db.compact_database()
+
+    summary = {'posts_archived': posts_archived, 'reports_bundled': reports_bundled, **compaction}
+
+    import analytics_store
+    if config.ANALYTICS_ENABLED and analytics_store.is_available():
+        with profiler.span('maintenance.compact_analytics'):
+            summary['analytics_partitions_compacted'] = analytics_store.AnalyticsStore().compact()
+
+    print(f"Archived {posts_archived} posts, bundled {reports_bundled} report files")
+    if compaction.get('bytes_before') is not None:
+        print(f"Database: {compaction['bytes_before'] / 1024 / 1024:.1f} MB -> "
+              f"{compaction['bytes_after'] / 1024 / 1024:.1f} MB"
+              f"{' (vacuumed)' if compaction['vacuumed'] else ''}")
+    return summary
@@ -1,7 +1,5 @@
-import schedule
 import time
 from datetime import datetime
-import pytz
 import config
 
 # AIDEV-NOTE: Scheduler module for running the agent at 8 AM IST daily
@@ -31,6 +29,8 @@ class Scheduler:
     
     def start(self):
         """Start the scheduler loop"""
+        import schedule
+        
         print(f"Scheduler started. Will run daily at {config.REFRESH_TIME} IST")
         print(f"Current time: {datetime.now(self.timezone).strftime('%Y-%m-%d %H:%M:%S %Z')}")
         
@@ -0,0 +1,301 @@
+import json
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+import config
+from profiling import combine_telemetry
+
+# AIDEV-NOTE: SQLite-coordinated work queue for sharded historical scans
+# A coordinator splits the candidate item IDs into shards; worker processes (on this
+# host or any host that can reach SHARD_DB_PATH) lease shards, heartbeat while working
+# and mark them done. Expired leases are picked up again, so a dead worker only costs
+# the shard it was holding.
+# A released (failed) shard waits SHARD_RETRY_SECONDS, doubling per attempt, before it can
+# be claimed again - for pending shards lease_expires holds that not-before time. After
+# SHARD_MAX_ATTEMPTS claims it is marked 'failed' and skipped, so one bad shard can't
+# keep the scan from finishing.
+# The LLM request/token budget is per scan, not per worker: workers reserve each request
+# from scan_runs.llm_requests/llm_tokens (see take_budget), so --workers N spends one cap.
+
+# Columns added after the first release, created on existing shard databases too
+_ADDED_COLUMNS = {
+    'scan_runs': [('llm_requests', 'INTEGER DEFAULT 0'), ('llm_tokens', 'INTEGER DEFAULT 0')],
+    # Worker-side run telemetry (JSON) summed over the shard's attempts
+    'scan_shards': [('telemetry', 'TEXT')],
+}
+
+class ShardQueue:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or config.SHARD_DB_PATH
+        self._init_tables()
+
+    @contextmanager
+    def _connect(self):
+        # isolation_level=None so we control transactions with BEGIN IMMEDIATE
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _init_tables(self):
+        with self._connect() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS scan_runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    start_time INTEGER NOT NULL,
+                    end_time INTEGER NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    status TEXT DEFAULT 'running'
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS scan_shards (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    scan_id INTEGER NOT NULL,
+                    item_ids TEXT NOT NULL,
+                    status TEXT DEFAULT 'pending',
+                    owner TEXT,
+                    lease_expires REAL,
+                    attempts INTEGER DEFAULT 0,
+                    posts_found INTEGER,
+                    posts_processed INTEGER,
+                    new_startups INTEGER,
+                    FOREIGN KEY (scan_id) REFERENCES scan_runs (id)
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_scan_shards_scan_status ON scan_shards(scan_id, status)')
+            for table, columns in _ADDED_COLUMNS.items():
+                existing = {row['name'] for row in conn.execute(f'PRAGMA table_info({table})')}
+                for column, column_type in columns:
+                    if column not in existing:
+                        conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {column_type}')
+
+    def create_scan(self, story_ids: List[int], start_time: int, end_time: int,
+                    shard_size: Optional[int] = None) -> int:
+        """
+        Record a new scan and partition its item IDs into pending shards
+
+        Returns:
+            The scan ID workers should claim shards from
+        """
+        shard_size = shard_size or config.SHARD_SIZE
+        story_ids = sorted(story_ids)
+
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            scan_id = conn.execute(
+                'INSERT INTO scan_runs (start_time, end_time) VALUES (?, ?)',
+                (start_time, end_time)
+            ).lastrowid
+            conn.executemany(
+                'INSERT INTO scan_shards (scan_id, item_ids) VALUES (?, ?)',
+                [(scan_id, json.dumps(story_ids[i:i + shard_size]))
+                 for i in range(0, len(story_ids), shard_size)]
+            )
+            conn.execute('COMMIT')
+
+        return scan_id
+
+    def active_scan(self) -> Optional[int]:
+        """Most recent scan that still has unfinished shards"""
+        with self._connect() as conn:
+            row = conn.execute('''
+                SELECT r.id FROM scan_runs r
+                WHERE r.status = 'running'
+                AND EXISTS (SELECT 1 FROM scan_shards s WHERE s.scan_id = r.id
+                            AND s.status NOT IN ('done', 'failed'))
+                ORDER BY r.id DESC LIMIT 1
+            ''').fetchone()
+            return row['id'] if row else None
+
+    def get_scan(self, scan_id: int) -> Optional[Dict]:
+        with self._connect() as conn:
+            row = conn.execute('SELECT * FROM scan_runs WHERE id = ?', (scan_id,)).fetchone()
+            return dict(row) if row else None
+
+    def claim(self, scan_id: int, owner: str) -> Optional[Dict]:
+        """Lease the next pending (or expired) shard of a scan, or None when none are ready"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            # Workers that died holding a shard on its last attempt count as failures too
+            conn.execute('''
+                UPDATE scan_shards SET status = 'failed', owner = NULL, lease_expires = NULL
+                WHERE scan_id = ? AND status = 'leased' AND lease_expires < ? AND attempts >= ?
+            ''', (scan_id, now, config.SHARD_MAX_ATTEMPTS))
+            # Pending shards have no lease_expires until they fail once
+            row = conn.execute('''
+                SELECT s.*, r.start_time, r.end_time FROM scan_shards s
+                JOIN scan_runs r ON r.id = s.scan_id
+                WHERE s.scan_id = ? AND s.status IN ('pending', 'leased')
+                AND (s.lease_expires IS NULL OR s.lease_expires < ?)
+                ORDER BY s.id LIMIT 1
+            ''', (scan_id, now)).fetchone()
+
+            if row is None:
+                conn.execute('COMMIT')
+                return None
+
+            conn.execute('''
+                UPDATE scan_shards SET status = 'leased', owner = ?, lease_expires = ?,
+                attempts = attempts + 1 WHERE id = ?
+            ''', (owner, now + config.SHARD_LEASE_SECONDS, row['id']))
+            conn.execute('COMMIT')
+
+        shard = dict(row)
+        shard['item_ids'] = json.loads(shard['item_ids'])
+        return shard
+
+    def take_budget(self, scan_id: int, tokens_used: int = 0) -> bool:
+        """
+        Reserve one LLM request from the scan's shared budget
+
+        Args:
+            scan_id: Scan whose budget to draw on
+            tokens_used: Tokens this worker has used since its previous call
+
+        Returns:
+            True if the request fits LLM_REQUEST_BUDGET/LLM_TOKEN_BUDGET and was reserved
+        """
+        if not config.LLM_REQUEST_BUDGET and not config.LLM_TOKEN_BUDGET:
+            return True
+
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute('UPDATE scan_runs SET llm_tokens = llm_tokens + ? WHERE id = ?', (tokens_used, scan_id))
+            row = conn.execute('SELECT llm_requests, llm_tokens FROM scan_runs WHERE id = ?',
+                               (scan_id,)).fetchone()
+            requests, tokens = row['llm_requests'], row['llm_tokens']
+
+            fits = not (config.LLM_REQUEST_BUDGET and requests >= config.LLM_REQUEST_BUDGET)
+            if fits and config.LLM_TOKEN_BUDGET:
+                # Same reservation as AIAnalyzer.has_budget(), over all workers' usage.
+                # Requests still in flight count, but their tokens haven't been reported yet.
+                expected = tokens / requests if requests and tokens else config.LLM_TOKENS_PER_REQUEST
+                fits = tokens + expected <= config.LLM_TOKEN_BUDGET
+            if fits:
+                conn.execute('UPDATE scan_runs SET llm_requests = llm_requests + 1 WHERE id = ?', (scan_id,))
+            conn.execute('COMMIT')
+        return fits
+
+    def renew(self, shard_id: int, owner: str) -> bool:
+        """Extend a lease; returns False if the shard was taken over by another worker"""
+        with self._connect() as conn:
+            cursor = conn.execute('''
+                UPDATE scan_shards SET lease_expires = ?
+                WHERE id = ? AND owner = ? AND status = 'leased'
+            ''', (time.time() + config.SHARD_LEASE_SECONDS, shard_id, owner))
+            return cursor.rowcount == 1
+
+    @contextmanager
+    def heartbeat(self, shard_id: int, owner: str):
+        """Keep a shard's lease alive while the block runs"""
+        stop = threading.Event()
+
+        def beat():
+            while not stop.wait(config.SHARD_LEASE_SECONDS / 3):
+                self.renew(shard_id, owner)
+
+        thread = threading.Thread(target=beat, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    @staticmethod
+    def _add_telemetry(conn, shard_id: int, telemetry: Optional[Dict]):
+        """Add one attempt's worker telemetry to what the shard already holds"""
+        if not telemetry:
+            return
+        row = conn.execute('SELECT telemetry FROM scan_shards WHERE id = ?', (shard_id,)).fetchone()
+        if row['telemetry']:
+            telemetry = combine_telemetry(json.loads(row['telemetry']), [telemetry])
+        conn.execute('UPDATE scan_shards SET telemetry = ? WHERE id = ?', (json.dumps(telemetry), shard_id))
+
+    def complete(self, shard_id: int, owner: str, posts_found: int,
+                 posts_processed: int, new_startups: int, telemetry: Optional[Dict] = None):
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            cursor = conn.execute('''
+                UPDATE scan_shards SET status = 'done', lease_expires = NULL,
+                posts_found = ?, posts_processed = ?, new_startups = ?
+                WHERE id = ? AND owner = ?
+            ''', (posts_found, posts_processed, new_startups, shard_id, owner))
+            if cursor.rowcount:
+                self._add_telemetry(conn, shard_id, telemetry)
+            conn.execute('COMMIT')
+
+    def release(self, shard_id: int, owner: str, telemetry: Optional[Dict] = None) -> bool:
+        """
+        Give a shard back after an error so it can be retried after a backoff
+
+        Args:
+            telemetry: Worker telemetry for the failed attempt - its requests still count
+
+        Returns:
+            False if the shard has used up SHARD_MAX_ATTEMPTS and was marked failed instead
+        """
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute('SELECT attempts FROM scan_shards WHERE id = ? AND owner = ?',
+                               (shard_id, owner)).fetchone()
+            if row is None:
+                conn.execute('COMMIT')
+                return True
+            self._add_telemetry(conn, shard_id, telemetry)
+
+            retry = row['attempts'] < config.SHARD_MAX_ATTEMPTS
+            not_before = time.time() + config.SHARD_RETRY_SECONDS * 2 ** (row['attempts'] - 1) if retry else None
+            conn.execute('''
+                UPDATE scan_shards SET status = ?, owner = NULL, lease_expires = ?
+                WHERE id = ? AND owner = ?
+            ''', ('pending' if retry else 'failed', not_before, shard_id, owner))
+            conn.execute('COMMIT')
+        return retry
+
+    def retry_wait(self, scan_id: int) -> Optional[float]:
+        """Seconds until the next backed-off shard can be claimed, or None when none are waiting"""
+        with self._connect() as conn:
+            row = conn.execute('''
+                SELECT MIN(lease_expires) AS not_before FROM scan_shards
+                WHERE scan_id = ? AND status = 'pending'
+            ''', (scan_id,)).fetchone()
+        if row['not_before'] is None:
+            return None
+        return max(row['not_before'] - time.time(), 0.0)
+
+    def progress(self, scan_id: int) -> Dict:
+        """Shard counts by status plus totals from completed shards"""
+        with self._connect() as conn:
+            rows = conn.execute('''
+                SELECT status, COUNT(*) AS shards,
+                       COALESCE(SUM(posts_found), 0) AS posts_found,
+                       COALESCE(SUM(posts_processed), 0) AS posts_processed,
+                       COALESCE(SUM(new_startups), 0) AS new_startups
+                FROM scan_shards WHERE scan_id = ? GROUP BY status
+            ''', (scan_id,)).fetchall()
+
+        progress = {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0,
+                    'posts_found': 0, 'posts_processed': 0, 'new_startups': 0}
+        for row in rows:
+            progress[row['status']] = row['shards']
+            for key in ('posts_found', 'posts_processed', 'new_startups'):
+                progress[key] += row[key]
+        return progress
+
+    def scan_telemetry(self, scan_id: int) -> List[Dict]:
+        """Worker telemetry stored by the scan's shards, one dict per shard that has any"""
+        with self._connect() as conn:
+            rows = conn.execute('SELECT telemetry FROM scan_shards WHERE scan_id = ? AND telemetry IS NOT NULL',
+                                (scan_id,)).fetchall()
+        return [json.loads(row['telemetry']) for row in rows]
+
+    def finish_scan(self, scan_id: int):
+        with self._connect() as conn:
+            conn.execute("UPDATE scan_runs SET status = 'completed' WHERE id = ?", (scan_id,))
@@ -0,0 +1,283 @@
+import os
+import gzip
+import json
+import hashlib
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+import config
+import models
+
+# AIDEV-NOTE: Versioned publishing of latest.json
+# Each published report gets the next version number, and its difference from the
+# previous snapshot is written to reports/deltas/<version>.json as added, updated and
+# removed discoveries. A client holding version N asks changes_since(N) (served as
+# /api/changes?since=N) instead of refetching the whole report.
+# Files are replaced atomically (temp file + os.replace), so readers never see a
+# partial latest.json. Write order - delta, latest.json, manifest - means any version
+# the manifest names already has its delta on disk.
+
+DELTA_DIR = 'deltas'
+MANIFEST = 'index.json'
+
+# AIDEV-NOTE: Time shards - the stored discovery history split by post week (or day)
+# into reports/shards/<period>.<hash>.json, newest first in shards/manifest.json with
+# counts, score range and category facets per shard, so a first visit paints the
+# newest shard and lazy-loads older ones. History is paged from the database newest
+# first and only down to the first closed period already published: closed periods are
+# immutable, so a publish normally re-cuts just the open period (and the one that closed
+# since the last publish). Shard files are named by content hash, so an unchanged shard
+# is never rewritten and can be cached indefinitely.
+SHARD_DIR = 'shards'
+SHARD_MANIFEST = 'manifest.json'
+HISTORY_PAGE_SIZE = 500
+
+def _dumps(data) -> str:
+    return models.dumps(data)
+
+def _write_atomic(path: str, text: str):
+    _write_bytes_atomic(path, text.encode('utf-8'))
+
+def _write_bytes_atomic(path: str, data: bytes):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def _write_precompressed(path: str, data: bytes):
+    """Write a file with .gz (and .br, when brotli is installed) siblings for static serving"""
+    _write_bytes_atomic(f"{path}.gz", gzip.compress(data, compresslevel=9, mtime=0))
+    try:
+        import brotli
+        _write_bytes_atomic(f"{path}.br", brotli.compress(data, quality=11))
+    except ImportError:
+        pass
+    # The plain file goes last - its presence marks the set complete
+    _write_bytes_atomic(path, data)
+
+def _digest(discovery: Dict) -> str:
+    return hashlib.sha1(models.encode(discovery, sort_keys=True)).hexdigest()
+
+def _delta_path(report_dir: str, version: int) -> str:
+    return os.path.join(report_dir, DELTA_DIR, f"{version}.json")
+
+def load_manifest(report_dir: Optional[str] = None) -> Dict:
+    """
+    Published state: latest version, oldest delta still kept, and a content hash per
+    discovery ID in the latest snapshot
+    """
+    path = os.path.join(report_dir or config.REPORT_DIR, DELTA_DIR, MANIFEST)
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {'version': 0, 'oldest': 1, 'hashes': {}}
+
+def publish(report_data: Dict, report_dir: Optional[str] = None) -> str:
+    """
+    Publish a report as the next version of latest.json, with its delta
+
+    Args:
+        report_data: Report with 'metadata' and 'discoveries'; metadata.version is set here
+        report_dir: Report directory (default: config.REPORT_DIR)
+
+    Returns:
+        The serialized snapshot, for callers that also archive it
+    """
+    report_dir = report_dir or config.REPORT_DIR
+    os.makedirs(os.path.join(report_dir, DELTA_DIR), exist_ok=True)
+
+    manifest = load_manifest(report_dir)
+    version = manifest['version'] + 1
+    report_data['metadata']['version'] = version
+
+    hashes = {str(d['id']): _digest(d) for d in report_data['discoveries']}
+    previous = manifest['hashes']
+    delta = {
+        'version': version,
+        'base_version': version - 1,
+        'metadata': report_data['metadata'],
+        'added': [d for d in report_data['discoveries'] if str(d['id']) not in previous],
+        'updated': [d for d in report_data['discoveries']
+                    if previous.get(str(d['id'])) not in (None, hashes[str(d['id'])])],
+        'removed': [int(discovery_id) for discovery_id in previous if discovery_id not in hashes],
+    }
+    _write_atomic(_delta_path(report_dir, version), _dumps(delta))
+
+    body = _dumps(report_data)
+    _write_atomic(os.path.join(report_dir, 'latest.json'), body)
+    write_shards(report_data, report_dir)
+
+    # Keep the last DELTA_RETENTION deltas; clients further behind refetch latest.json
+    oldest = max(manifest.get('oldest', 1), version - config.DELTA_RETENTION + 1, 1)
+    _write_atomic(os.path.join(report_dir, DELTA_DIR, MANIFEST),
+                  _dumps({'version': version, 'oldest': oldest, 'hashes': hashes}))
+    for stale in range(manifest.get('oldest', 1), oldest):
+        try:
+            os.remove(_delta_path(report_dir, stale))
+        except FileNotFoundError:
+            pass
+
+    return body
+
+def changes_since(since: int, report_dir: Optional[str] = None) -> Optional[Dict]:
+    """
+    Everything that changed after snapshot version `since`, merged into one delta
+
+    Returns:
+        Dict with version, metadata and added/updated/removed discoveries, or None
+        when the deltas needed are gone (or `since` is unknown) and the client
+        should refetch latest.json
+    """
+    report_dir = report_dir or config.REPORT_DIR
+    manifest = load_manifest(report_dir)
+    version = manifest['version']
+    if since == version:
+        return {'version': version, 'metadata': None, 'added': [], 'updated': [], 'removed': []}
+    if since < manifest.get('oldest', 1) - 1 or since > version:
+        return None
+
+    # id -> ('added' | 'updated', discovery); removed IDs tracked separately
+    changed, removed, metadata = {}, set(), None
+    for current in range(since + 1, version + 1):
+        try:
+            with open(_delta_path(report_dir, current), encoding='utf-8') as f:
+                delta = json.load(f)
+        except (FileNotFoundError, ValueError):
+            # Pruned or replaced while we were reading
+            return None
+
+        metadata = delta['metadata']
+        for discovery in delta['added']:
+            changed[discovery['id']] = ('added', discovery)
+            removed.discard(discovery['id'])
+        for discovery in delta['updated']:
+            kind = changed.get(discovery['id'], ('updated',))[0]
+            changed[discovery['id']] = (kind, discovery)
+        for discovery_id in delta['removed']:
+            # Added and removed within the window - the client never had it
+            if changed.pop(discovery_id, ('updated',))[0] != 'added':
+                removed.add(discovery_id)
+
+    return {
+        'version': version,
+        'metadata': metadata,
+        'added': [d for kind, d in changed.values() if kind == 'added'],
+        'updated': [d for kind, d in changed.values() if kind == 'updated'],
+        'removed': sorted(removed),
+    }
+
+def _period_key(posted: datetime) -> str:
+    if config.REPORT_SHARD_PERIOD == 'day':
+        return posted.strftime('%Y-%m-%d')
+    year, week, _ = posted.isocalendar()
+    return f"{year}-W{week:02d}"
+
+def _shard_key(discovery: Dict) -> str:
+    return _period_key(datetime.fromisoformat(discovery['posted_at']))
+
+def _shard_facets(discoveries: List[Dict]) -> Dict:
+    categories = Counter(category.strip()
+                         for d in discoveries
+                         for category in (d.get('category') or 'Uncategorized').split(','))
+    scores = [d['innovation_score'] for d in discoveries]
+    posted = [d['posted_at'] for d in discoveries]
+    return {
+        'count': len(discoveries),
+        'startups': sum(1 for d in discoveries if d['type'] == 'startup'),
+        'innovations': sum(1 for d in discoveries if d['type'] == 'innovation'),
+        'min_score': min(scores),
+        'max_score': max(scores),
+        'oldest': min(posted),
+        'newest': max(posted),
+        'categories': dict(categories.most_common()),
+    }
+
+def load_shard_manifest(report_dir: Optional[str] = None) -> Optional[Dict]:
+    path = os.path.join(report_dir or config.REPORT_DIR, SHARD_DIR, SHARD_MANIFEST)
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+def _history_groups(list_page: Callable, published: Dict) -> Dict[str, Dict]:
+    """
+    Stored discoveries by period key (then by ID), newest first, stopping at the first
+    period already in `published`
+    """
+    groups = defaultdict(dict)
+    rows, cursor = list_page(limit=HISTORY_PAGE_SIZE, include_analysis=True)
+    while rows:
+        for row in rows:
+            discovery = models.Discovery.from_row(row).to_dict()
+            key = _shard_key(discovery)
+            if key in published:
+                return groups
+            # A re-analyzed post has several rows - the newest comes first
+            groups[key].setdefault(discovery['id'], discovery)
+        if cursor is None:
+            break
+        rows, cursor = list_page(cursor, limit=HISTORY_PAGE_SIZE, include_analysis=True)
+    return groups
+
+def write_shards(report_data: Dict, report_dir: Optional[str] = None,
+                 list_page: Optional[Callable] = None) -> Dict:
+    """
+    Cut the stored discovery history into time shards plus a manifest
+
+    Args:
+        report_data: Published report (metadata.version already set); its discoveries
+            are only used when the database has no history
+        report_dir: Report directory (default: config.REPORT_DIR)
+        list_page: Keyset pager over stored discoveries, newest first
+            (default: the backend's list_startups)
+
+    Returns:
+        The shard manifest
+    """
+    if list_page is None:
+        from storage import get_backend
+        list_page = get_backend().list_startups
+
+    shard_dir = os.path.join(report_dir or config.REPORT_DIR, SHARD_DIR)
+    os.makedirs(shard_dir, exist_ok=True)
+    previous = load_shard_manifest(report_dir) or {'shards': []}
+
+    # Closed periods already published are immutable; a change of period re-cuts everything
+    closed = {}
+    if previous.get('period') == config.REPORT_SHARD_PERIOD:
+        closed = {shard['key']: shard for shard in previous['shards'] if shard.get('closed')}
+
+    groups = _history_groups(list_page, closed)
+    if not groups and not closed:
+        for discovery in report_data['discoveries']:
+            groups[_shard_key(discovery)][discovery['id']] = discovery
+
+    open_key = _period_key(datetime.now())
+    shards = dict(closed)
+    for key, by_id in groups.items():
+        discoveries = sorted(by_id.values(), key=lambda d: d['innovation_score'], reverse=True)
+        data = _dumps({'shard': key, 'discoveries': discoveries}).encode('utf-8')
+        name = f"{key}.{hashlib.sha1(data).hexdigest()[:12]}.json"
+        path = os.path.join(shard_dir, name)
+        if not os.path.exists(path):
+            _write_precompressed(path, data)
+        shards[key] = {'key': key, 'file': name, 'bytes': len(data), 'closed': key < open_key,
+                       **_shard_facets(discoveries)}
+
+    manifest = {
+        'version': report_data['metadata'].get('version'),
+        'period': config.REPORT_SHARD_PERIOD,
+        'metadata': report_data['metadata'],
+        'shards': [shards[key] for key in sorted(shards, reverse=True)],
+    }
+    _write_atomic(os.path.join(shard_dir, SHARD_MANIFEST), _dumps(manifest))
+
+    # Keep every file either manifest lists - the previous one for clients still paging through it
+    keep = {shard['file'] for shard in manifest['shards'] + previous['shards']}
+    for name in os.listdir(shard_dir):
+        if name != SHARD_MANIFEST and name.split('.json')[0] + '.json' not in keep:
+            os.remove(os.path.join(shard_dir, name))
+
+    return manifest
@@ -1,6 +1,7 @@
 import re
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 import config
+from profiling import profiler
 
 # AIDEV-NOTE: Startup detection module using keyword matching and heuristics
 # This provides initial filtering before AI analysis
@@ -76,6 +77,10 @@ class StartupDetector:
             score += 0.1
             indicators.append("Active discussion")
         
+        if post.get('velocity', 0) >= config.VELOCITY_MIN_POINTS_PER_HOUR:
+            score += 0.1
+            indicators.append(f"Rising fast ({post['velocity']:.0f} points/hour)")
+        
         # Cap score between 0 and 1
         score = max(0.0, min(1.0, score))
         
@@ -92,22 +97,26 @@ class StartupDetector:
         score, _ = self.calculate_startup_score(post)
         return score >= threshold
     
-    def filter_startup_posts(self, posts: List[Dict], threshold: float = 0.3) -> List[Dict]:
+    @profiler.timed('detector.filter')
+    def filter_startup_posts(self, posts: List[Dict], threshold: float = 0.3,
+                             promoted_ids: Optional[Set[int]] = None) -> List[Dict]:
         """
         Filter a list of posts to find likely startup-related ones or technical innovations
         
         Args:
             posts: List of HN posts
             threshold: Minimum score threshold
+            promoted_ids: IDs of fast-rising posts to include regardless of engagement
         """
         startup_posts = []
+        promoted_ids = promoted_ids or set()
         
         for post in posts:
             title = post.get('title', '').lower()
             
             # Be more inclusive - let AI decide if it's interesting
-            # Primary filter is Show HN posts or high engagement
-            if 'show hn:' in title or post.get('score', 0) >= 50:
+            # Primary filter is Show HN posts, high engagement or high velocity
+            if 'show hn:' in title or post.get('score', 0) >= 50 or post['id'] in promoted_ids:
                 score, indicators = self.calculate_startup_score(post)
                 post['startup_score'] = score
                 post['startup_indicators'] = indicators
@@ -0,0 +1,257 @@
+import os
+import json
+import shutil
+import hashlib
+from html import escape
+from string import Template
+from urllib.parse import urlparse
+from typing import Dict, List, Optional
+import config
+import models
+
+# AIDEV-NOTE: Pre-rendered HTML version of latest.json (reports/site/)
+# index.html and page/<n>.html list discoveries by score, REPORT_HTML_PAGE_SIZE per page;
+# d/<id>.html is one discovery. Pages are plain HTML styled by dashboard/style.css, so
+# they paint without JavaScript and can sit behind a CDN as static files.
+# Each page's inputs are hashed (together with the templates) and recorded in
+# .render_hashes.json; a page is rendered and written only when its hash changes, and
+# pages no longer produced are deleted.
+
+HASHES_FILE = '.render_hashes.json'
+STYLESHEET = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dashboard', 'style.css')
+
+# Compiled once at import; $root is the relative path back to the site root
+PAGE = Template('''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>$title</title>
+    <link rel="stylesheet" href="${root}style.css">
+</head>
+<body>
+    <div class="container">
+        <header>
+            <h1><a class="site-home" href="${root}index.html">🚀 Hacker News Discoveries</a></h1>
+            <p class="subtitle">$subtitle</p>
+        </header>
+$body
+    </div>
+</body>
+</html>
+''')
+
+STATS = Template('''        <div class="stats">
+            <div class="stat-card"><div class="stat-number">$total</div><div class="stat-label">Total Discoveries</div></div>
+            <div class="stat-card"><div class="stat-number">$startups</div><div class="stat-label">Startups</div></div>
+            <div class="stat-card"><div class="stat-number">$innovations</div><div class="stat-label">Innovations</div></div>
+            <div class="stat-card"><div class="stat-time">$updated</div><div class="stat-label">Last Updated</div></div>
+        </div>
+''')
+
+CARD = Template('''            <article class="discovery-card">
+                <div class="discovery-header">
+                    <span class="discovery-type type-$type">$type</span>
+                    <span class="discovery-score">$score/10</span>
+                </div>
+                <h3 class="discovery-title"><a href="${root}d/$id.html">$name</a></h3>
+                <div class="discovery-category">$category</div>
+                <p class="discovery-summary">$summary</p>
+$why$features                <div class="discovery-footer">
+                    <div class="discovery-links">
+                        <a href="$hn_url" class="discovery-link">💬 HN Discussion</a>
+$website                    </div>
+                    <div class="discovery-stats">
+                        <span class="discovery-stat">▲ $hn_score</span>
+                        <span class="discovery-stat">💬 $hn_comments</span>
+                    </div>
+                </div>
+            </article>
+''')
+
+DETAIL = Template('''        <article class="discovery-card discovery-detail">
+            <div class="discovery-header">
+                <span class="discovery-type type-$type">$type</span>
+                <span class="discovery-score">$score/10</span>
+            </div>
+            <h2 class="discovery-title">$name</h2>
+            <div class="discovery-category">$category · $stage · posted $posted</div>
+            <p class="discovery-summary">$summary</p>
+$why$features$sections            <div class="discovery-footer">
+                <div class="discovery-links">
+                    <a href="$hn_url" class="discovery-link">💬 $title</a>
+$website                </div>
+                <div class="discovery-stats">
+                    <span class="discovery-stat">▲ $hn_score</span>
+                    <span class="discovery-stat">💬 $hn_comments</span>
+                </div>
+            </div>
+        </article>
+''')
+
+NAV = Template('''        <nav class="pagination">$links</nav>
+''')
+
+# Bump when the rendering code (not just the templates) changes its output, so
+# already-written pages are rendered again
+RENDER_VERSION = '2'
+
+_TEMPLATES_HASH = hashlib.sha1(
+    (RENDER_VERSION + ''.join(t.template for t in (PAGE, STATS, CARD, DETAIL, NAV))).encode('utf-8')
+).hexdigest()
+
+# Detail-page sections shown when the analysis has them
+_SECTIONS = (
+    ('coolness_factor', 'Coolness Factor'),
+    ('target_audience', 'Target Audience'),
+    ('technical_details', 'Technical Details'),
+    ('business_model', 'Business Model'),
+    ('founder_info', 'Founders'),
+)
+
+def _page_path(page: int) -> str:
+    return 'index.html' if page == 1 else f"page/{page}.html"
+
+def _fields(d: Dict, root: str, indent: str) -> Dict:
+    """Escaped substitutions shared by cards and detail pages"""
+    why = (f'{indent}<div class="discovery-why"><strong>Why it\'s interesting:</strong> '
+           f'{escape(d["why_interesting"])}</div>\n' if d['why_interesting'] else '')
+    features = (f'{indent}<div class="discovery-features">'
+                + ''.join(f'<span class="feature-tag">{escape(str(f))}</span>' for f in d['key_features'])
+                + '</div>\n' if d['key_features'] else '')
+    # Only web links - javascript:/data: URLs would still be clickable once escaped
+    website = (f'{indent}        <a href="{escape(d["url"])}" class="discovery-link">🔗 Website</a>\n'
+               if d['url'] and urlparse(d['url']).scheme in ('http', 'https') else '')
+    return {
+        'root': root,
+        'id': d['id'],
+        'type': escape(d['type'] or ''),
+        'score': f"{d['innovation_score']:.1f}",
+        'name': escape(d['name'] or ''),
+        'title': escape(d['title'] or ''),
+        'category': escape(d['category'] or 'Uncategorized'),
+        'summary': escape(d['summary'] or ''),
+        'hn_url': escape(d['hn_url']),
+        'hn_score': d['hn_score'],
+        'hn_comments': d['hn_comments'],
+        'why': why,
+        'features': features,
+        'website': website,
+    }
+
+def render_list_page(discoveries: List[Dict], page: int, pages: int, metadata: Optional[Dict]) -> str:
+    """One page of score-ordered cards; page 1 also carries the summary counts"""
+    root = '' if page == 1 else '../'
+    body = ''
+    if metadata:
+        body += STATS.substitute(
+            total=metadata['total_discoveries'],
+            startups=metadata['total_startups'],
+            innovations=metadata['total_innovations'],
+            updated=escape(metadata['generated_at_ist']),
+        )
+    body += '        <div class="discoveries-grid">\n'
+    body += ''.join(CARD.substitute(_fields(d, root, ' ' * 16)) for d in discoveries)
+    body += '        </div>\n'
+    if pages > 1:
+        links = []
+        for number in range(1, pages + 1):
+            if number == page:
+                links.append(f'<span class="page-current">{number}</span>')
+            else:
+                links.append(f'<a href="{root}{_page_path(number)}">{number}</a>')
+        body += NAV.substitute(links=''.join(links))
+    return PAGE.substitute(
+        root=root,
+        title='HN Discoveries' if page == 1 else f"HN Discoveries - page {page}",
+        subtitle='Startups & Technical Innovations',
+        body=body,
+    )
+
+def render_detail_page(d: Dict) -> str:
+    """Full analysis of one discovery"""
+    fields = _fields(d, '../', ' ' * 12)
+    sections = ''.join(
+        f'            <p class="discovery-summary"><strong>{label}:</strong> {escape(str(d[key]))}</p>\n'
+        for key, label in _SECTIONS if d.get(key)
+    )
+    return PAGE.substitute(
+        root='../',
+        title=f"{fields['name']} - HN Discoveries",
+        subtitle='Startups & Technical Innovations',
+        body=DETAIL.substitute(fields, stage=escape(d['stage'] or 'Unknown'),
+                               posted=escape(d['posted_at'][:10]), sections=sections),
+    )
+
+def _input_hash(*parts) -> str:
+    return hashlib.sha1(_TEMPLATES_HASH.encode('utf-8') + models.encode(parts, sort_keys=True)).hexdigest()
+
+def _load_hashes(path: str) -> Dict:
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def _write(path: str, text: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+def build(report_data: Dict, site_dir: Optional[str] = None) -> Dict:
+    """
+    Render the static site for a report, skipping pages whose inputs are unchanged
+
+    Args:
+        report_data: latest.json document (metadata + score-ordered discoveries)
+        site_dir: Output directory (default: <REPORT_DIR>/site)
+
+    Returns:
+        Counts of pages rendered, unchanged and removed
+    """
+    site_dir = site_dir or os.path.join(config.REPORT_DIR, 'site')
+    os.makedirs(site_dir, exist_ok=True)
+    hashes_path = os.path.join(site_dir, HASHES_FILE)
+    previous = _load_hashes(hashes_path)
+
+    discoveries = report_data['discoveries']
+    size = config.REPORT_HTML_PAGE_SIZE
+    pages = max((len(discoveries) + size - 1) // size, 1)
+
+    # path -> (input hash, render function)
+    jobs = {}
+    for page in range(1, pages + 1):
+        chunk = discoveries[(page - 1) * size:page * size]
+        metadata = report_data['metadata'] if page == 1 else None
+        jobs[_page_path(page)] = (_input_hash(chunk, page, pages, metadata),
+                                  lambda c=chunk, p=page, m=metadata: render_list_page(c, p, pages, m))
+    for d in discoveries:
+        jobs[f"d/{d['id']}.html"] = (_input_hash(d), lambda d=d: render_detail_page(d))
+
+    hashes, rendered = {}, 0
+    for path, (digest, render) in jobs.items():
+        hashes[path] = digest
+        full_path = os.path.join(site_dir, path)
+        if previous.get(path) == digest and os.path.exists(full_path):
+            continue
+        _write(full_path, render())
+        rendered += 1
+
+    removed = 0
+    for path in previous.keys() - hashes.keys():
+        try:
+            os.remove(os.path.join(site_dir, path))
+            removed += 1
+        except FileNotFoundError:
+            pass
+
+    # Same stylesheet as the live dashboard, refreshed when it changes
+    stylesheet = os.path.join(site_dir, 'style.css')
+    if os.path.exists(STYLESHEET) and (not os.path.exists(stylesheet) or
+                                       os.path.getmtime(stylesheet) < os.path.getmtime(STYLESHEET)):
+        shutil.copyfile(STYLESHEET, stylesheet)
+
+    _write(hashes_path, models.dumps(hashes))
+    return {'rendered': rendered, 'unchanged': len(jobs) - rendered, 'removed': removed}
@@ -0,0 +1,24 @@
+import os
+
+# AIDEV-NOTE: Picks the database backend on first use instead of at import time
+# Supabase when SUPABASE_URL is set and the client library is installed, otherwise SQLite.
+# Both backend modules expose the same function interface.
+
+_backend = None
+
+def get_backend():
+    """Return the database backend module, importing it on first call"""
+    global _backend
+    if _backend is None:
+        try:
+            if os.environ.get('SUPABASE_URL'):
+                import database_supabase as backend
+                print("Using Supabase database")
+            else:
+                import database as backend
+                print("Using local SQLite database")
+        except ImportError:
+            import database as backend
+            print("Using local SQLite database (Supabase not available)")
+        _backend = backend
+    return _backend
@@ -25,14 +25,96 @@ CREATE TABLE IF NOT EXISTS discoveries (
     why_interesting TEXT,
     key_features JSONB DEFAULT '[]'::jsonb,
     analysis JSONB DEFAULT '{}'::jsonb,
+    -- Queryable analysis fields, derived from the JSONB document
+    analysis_type TEXT GENERATED ALWAYS AS (analysis->>'type') STORED,
+    stage TEXT GENERATED ALWAYS AS (analysis->>'stage') STORED,
+    confidence REAL GENERATED ALWAYS AS ((analysis->>'confidence')::real) STORED,
     created_at TIMESTAMP DEFAULT NOW()
 );
 
--- Indices for performance
+-- Migration for existing projects:
+-- ALTER TABLE discoveries ADD COLUMN IF NOT EXISTS analysis_type TEXT GENERATED ALWAYS AS (analysis->>'type') STORED;
+-- ALTER TABLE discoveries ADD COLUMN IF NOT EXISTS stage TEXT GENERATED ALWAYS AS (analysis->>'stage') STORED;
+-- ALTER TABLE discoveries ADD COLUMN IF NOT EXISTS confidence REAL GENERATED ALWAYS AS ((analysis->>'confidence')::real) STORED;
+-- Rows saved before analyses were sent as JSON have analysis = '{}' and need re-analysis to populate these.
+
+-- Run history with telemetry
+CREATE TABLE IF NOT EXISTS run_history (
+    id BIGSERIAL PRIMARY KEY,
+    run_time TIMESTAMP DEFAULT NOW(),
+    posts_processed INTEGER DEFAULT 0,
+    new_discoveries_found INTEGER DEFAULT 0,
+    total_posts_fetched INTEGER DEFAULT 0,
+    status VARCHAR(50) DEFAULT 'completed',
+    error_message TEXT,
+    duration_seconds REAL,
+    hn_requests INTEGER,
+    hn_errors INTEGER,
+    llm_requests INTEGER,
+    llm_tokens INTEGER,
+    llm_errors INTEGER,
+    cache_hits INTEGER,
+    cache_misses INTEGER,
+    queue_depth INTEGER,
+    errors INTEGER,
+    telemetry JSONB DEFAULT '{}'::jsonb
+);
+
+-- IDs of posts moved to archive partitions by retention.py, still used for dedupe
+CREATE TABLE IF NOT EXISTS archived_post_ids (
+    id BIGINT PRIMARY KEY
+);
+
+-- Indices for performance (check plans with benchmarks/db_benchmark.py before changing)
 CREATE INDEX IF NOT EXISTS idx_posts_created_time ON posts(created_time DESC);
 CREATE INDEX IF NOT EXISTS idx_posts_item_type ON posts(item_type);
 CREATE INDEX IF NOT EXISTS idx_discoveries_innovation_score ON discoveries(innovation_score DESC);
-CREATE INDEX IF NOT EXISTS idx_discoveries_post_id ON discoveries(post_id);
+-- Covering: leaderboard rebuilds and the partial day in top_discoveries() read
+-- post -> (id, score) with index-only scans. Unique, so save_discoveries() can upsert
+-- with ON CONFLICT (post_id) DO NOTHING and replayed batches never duplicate rows.
+CREATE UNIQUE INDEX IF NOT EXISTS idx_discoveries_post_score ON discoveries(post_id) INCLUDE (id, innovation_score);
+-- find_discoveries() filters on type or stage and sorts by innovation_score by default
+CREATE INDEX IF NOT EXISTS idx_discoveries_type_score ON discoveries(analysis_type, innovation_score DESC);
+CREATE INDEX IF NOT EXISTS idx_discoveries_stage_score ON discoveries(stage, innovation_score DESC);
+CREATE INDEX IF NOT EXISTS idx_discoveries_confidence ON discoveries(confidence DESC);
+
+-- Migration for existing projects - the composite indexes above supersede:
+-- DROP INDEX IF EXISTS idx_discoveries_post_id;
+-- DROP INDEX IF EXISTS idx_discoveries_analysis_type;
+-- DROP INDEX IF EXISTS idx_discoveries_stage;
+-- ANALYZE discoveries;
+-- and idx_discoveries_post_score is now unique - keep the newest discovery per post first:
+-- DELETE FROM discoveries d USING discoveries newer
+--     WHERE newer.post_id = d.post_id AND (newer.created_at, newer.id) > (d.created_at, d.id);
+-- DROP INDEX IF EXISTS idx_discoveries_post_score;
+-- CREATE UNIQUE INDEX idx_discoveries_post_score ON discoveries(post_id) INCLUDE (id, innovation_score);
+
+-- Full-text search: weighted tsvector maintained by trigger (the title lives on posts,
+-- so a generated column can't be used), GIN-indexed and queried through search_discoveries()
+ALTER TABLE discoveries ADD COLUMN IF NOT EXISTS search_vector TSVECTOR;
+
+CREATE OR REPLACE FUNCTION discoveries_search_vector() RETURNS TRIGGER AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce((SELECT title FROM posts WHERE id = NEW.post_id), '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.analysis->>'name', '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.summary, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.category, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.why_interesting, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(NEW.key_features::text, '')), 'C');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS discoveries_search_vector_update ON discoveries;
+CREATE TRIGGER discoveries_search_vector_update
+    BEFORE INSERT OR UPDATE ON discoveries
+    FOR EACH ROW EXECUTE FUNCTION discoveries_search_vector();
+
+CREATE INDEX IF NOT EXISTS idx_discoveries_search ON discoveries USING GIN (search_vector);
+
+-- Backfill for existing projects (fires the trigger on every row):
+-- UPDATE discoveries SET search_vector = NULL;
 
 -- View for easy querying
 CREATE OR REPLACE VIEW discovery_details AS
@@ -43,11 +125,109 @@ SELECT
     d.summary,
     d.why_interesting,
     d.key_features,
-    d.analysis
+    d.analysis,
+    d.analysis_type,
+    d.stage,
+    d.confidence,
+    d.id AS discovery_id
 FROM posts p
 INNER JOIN discoveries d ON p.id = d.post_id
-WHERE p.item_type IN ('startup', 'innovation')
-ORDER BY p.created_time DESC;
+WHERE p.item_type IN ('startup', 'innovation');
+
+-- Aggregates maintained by trigger on discoveries, so reports and the API read
+-- O(result) rows instead of scanning the history
+CREATE TABLE IF NOT EXISTS daily_leaderboard (
+    day DATE NOT NULL,
+    discovery_id UUID NOT NULL,
+    created_time BIGINT NOT NULL,
+    innovation_score DECIMAL(3,1),
+    PRIMARY KEY (day, discovery_id)
+);
+
+CREATE TABLE IF NOT EXISTS daily_stats (
+    day DATE NOT NULL,
+    item_type TEXT NOT NULL,
+    category TEXT NOT NULL,
+    discoveries INTEGER NOT NULL,
+    score_sum NUMERIC NOT NULL,
+    PRIMARY KEY (day, item_type, category)
+);
+
+-- UTC day of a post
+CREATE OR REPLACE FUNCTION post_day(post BIGINT) RETURNS DATE AS $$
+    SELECT (to_timestamp(created_time) AT TIME ZONE 'UTC')::date FROM posts WHERE id = post;
+$$ LANGUAGE sql STABLE;
+
+-- Recompute one day's top 100 from the base tables
+CREATE OR REPLACE FUNCTION rebuild_leaderboard_day(target DATE) RETURNS VOID AS $$
+    DELETE FROM daily_leaderboard WHERE day = target;
+    INSERT INTO daily_leaderboard (day, discovery_id, created_time, innovation_score)
+    SELECT target, d.id, p.created_time, d.innovation_score
+    FROM discoveries d JOIN posts p ON p.id = d.post_id
+    WHERE p.created_time >= extract(epoch FROM target::timestamp AT TIME ZONE 'UTC')
+      AND p.created_time < extract(epoch FROM (target + 1)::timestamp AT TIME ZONE 'UTC')
+    ORDER BY d.innovation_score DESC, d.id
+    LIMIT 100;
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION discoveries_aggregates() RETURNS TRIGGER AS $$
+DECLARE
+    old_day DATE;
+    new_day DATE;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        old_day := post_day(OLD.post_id);
+        UPDATE daily_stats
+        SET discoveries = discoveries - 1, score_sum = score_sum - coalesce(OLD.innovation_score, 0)
+        WHERE day = old_day
+          AND item_type = coalesce(OLD.analysis_type, 'other')
+          AND category = coalesce(OLD.category, 'Uncategorized');
+        DELETE FROM daily_stats WHERE day = old_day AND discoveries <= 0;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        new_day := post_day(NEW.post_id);
+        IF new_day IS NOT NULL THEN
+            INSERT INTO daily_stats (day, item_type, category, discoveries, score_sum)
+            VALUES (new_day, coalesce(NEW.analysis_type, 'other'), coalesce(NEW.category, 'Uncategorized'),
+                    1, coalesce(NEW.innovation_score, 0))
+            ON CONFLICT (day, item_type, category) DO UPDATE SET
+                discoveries = daily_stats.discoveries + 1,
+                score_sum = daily_stats.score_sum + EXCLUDED.score_sum;
+        END IF;
+    END IF;
+
+    IF TG_OP = 'INSERT' THEN
+        IF new_day IS NOT NULL THEN
+            INSERT INTO daily_leaderboard (day, discovery_id, created_time, innovation_score)
+            SELECT new_day, NEW.id, created_time, NEW.innovation_score FROM posts WHERE id = NEW.post_id;
+            DELETE FROM daily_leaderboard WHERE day = new_day AND discovery_id NOT IN (
+                SELECT discovery_id FROM daily_leaderboard WHERE day = new_day
+                ORDER BY innovation_score DESC, discovery_id LIMIT 100
+            );
+        END IF;
+    ELSE
+        -- Removing or rescoring may let a trimmed discovery back in
+        PERFORM rebuild_leaderboard_day(old_day);
+        IF TG_OP = 'UPDATE' AND new_day IS DISTINCT FROM old_day THEN
+            PERFORM rebuild_leaderboard_day(new_day);
+        END IF;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS discoveries_aggregates_update ON discoveries;
+CREATE TRIGGER discoveries_aggregates_update
+    AFTER INSERT OR UPDATE OF post_id, innovation_score, category, analysis OR DELETE ON discoveries
+    FOR EACH ROW EXECUTE FUNCTION discoveries_aggregates();
+
+-- Backfill for existing projects:
+-- SELECT rebuild_leaderboard_day(day) FROM (SELECT DISTINCT post_day(post_id) AS day FROM discoveries) days;
+-- INSERT INTO daily_stats SELECT post_day(post_id), coalesce(analysis_type, 'other'),
+--     coalesce(category, 'Uncategorized'), COUNT(*), SUM(coalesce(innovation_score, 0))
+--     FROM discoveries GROUP BY 1, 2, 3;
 
 -- Grant permissions (Supabase handles this automatically for anon/authenticated roles)
 -- But you may need to enable RLS (Row Level Security) and create policies
@@ -55,6 +235,10 @@ ORDER BY p.created_time DESC;
 -- Enable RLS
 ALTER TABLE posts ENABLE ROW LEVEL SECURITY;
 ALTER TABLE discoveries ENABLE ROW LEVEL SECURITY;
+ALTER TABLE run_history ENABLE ROW LEVEL SECURITY;
+ALTER TABLE archived_post_ids ENABLE ROW LEVEL SECURITY;
+ALTER TABLE daily_leaderboard ENABLE ROW LEVEL SECURITY;
+ALTER TABLE daily_stats ENABLE ROW LEVEL SECURITY;
 
 -- Create policies for read access (adjust as needed)
 CREATE POLICY "Enable read access for all users" ON posts
@@ -63,4 +247,97 @@ CREATE POLICY "Enable read access for all users" ON posts
 CREATE POLICY "Enable read access for all users" ON discoveries
     FOR SELECT USING (true);
 
--- For write access, you'll use the service key which bypasses RLS
\ No newline at end of file
+-- For write access, you'll use the service key which bypasses RLS
+
+-- Ranked search, called via supabase.rpc('search_discoveries', {...})
+CREATE OR REPLACE FUNCTION search_discoveries(
+    search_query TEXT,
+    match_limit INTEGER DEFAULT 20,
+    prefix_match BOOLEAN DEFAULT FALSE
+)
+RETURNS TABLE (
+    id BIGINT,
+    title TEXT,
+    url TEXT,
+    author VARCHAR(255),
+    score INTEGER,
+    num_comments INTEGER,
+    created_time BIGINT,
+    item_type VARCHAR(50),
+    innovation_score DECIMAL(3,1),
+    category TEXT,
+    summary TEXT,
+    why_interesting TEXT,
+    key_features JSONB,
+    analysis JSONB,
+    rank REAL
+) AS $$
+    SELECT p.id, p.title, p.url, p.author, p.score, p.num_comments, p.created_time, p.item_type,
+           d.innovation_score, d.category, d.summary, d.why_interesting, d.key_features, d.analysis,
+           ts_rank(d.search_vector, query) AS rank
+    FROM discoveries d
+    JOIN posts p ON p.id = d.post_id,
+         (SELECT CASE WHEN prefix_match THEN to_tsquery('english', search_query)
+                      ELSE websearch_to_tsquery('english', search_query) END) AS query
+    WHERE d.search_vector @@ query
+    ORDER BY rank DESC
+    LIMIT match_limit;
+$$ LANGUAGE sql STABLE;
+
+-- Non-discovery posts old enough to archive, oldest first
+CREATE OR REPLACE FUNCTION archivable_posts(cutoff_time BIGINT, max_rows INTEGER DEFAULT 5000)
+RETURNS SETOF posts AS $$
+    SELECT p.* FROM posts p
+    WHERE p.created_time < cutoff_time
+      AND NOT EXISTS (SELECT 1 FROM discoveries d WHERE d.post_id = p.id)
+    ORDER BY p.created_time
+    LIMIT max_rows;
+$$ LANGUAGE sql STABLE;
+
+-- Top discoveries since cutoff_time: whole days come from daily_leaderboard and only
+-- the partial day at the cutoff from the base tables (max_rows must be <= 100)
+CREATE OR REPLACE FUNCTION top_discoveries(cutoff_time BIGINT, max_rows INTEGER DEFAULT 50)
+RETURNS SETOF discovery_details AS $$
+    WITH cutoff AS (
+        SELECT (to_timestamp(cutoff_time) AT TIME ZONE 'UTC')::date AS day
+    ),
+    top AS (
+        SELECT discovery_id, innovation_score FROM (
+            SELECT l.discovery_id, l.innovation_score FROM daily_leaderboard l, cutoff
+            WHERE l.day > cutoff.day
+            UNION ALL
+            SELECT d.id, d.innovation_score FROM discoveries d JOIN posts p ON p.id = d.post_id, cutoff
+            WHERE p.created_time > cutoff_time
+              AND p.created_time < extract(epoch FROM (cutoff.day + 1)::timestamp AT TIME ZONE 'UTC')
+        ) candidates
+        ORDER BY innovation_score DESC, discovery_id
+        LIMIT max_rows
+    )
+    SELECT v.* FROM top JOIN discovery_details v ON v.discovery_id = top.discovery_id
+    ORDER BY top.innovation_score DESC, top.discovery_id;
+$$ LANGUAGE sql STABLE;
+
+-- Discovery counts per type and category since a day (all history when NULL)
+CREATE OR REPLACE FUNCTION discovery_stats(since DATE DEFAULT NULL)
+RETURNS TABLE (item_type TEXT, category TEXT, discoveries BIGINT, score_sum NUMERIC) AS $$
+    SELECT s.item_type, s.category, SUM(s.discoveries), SUM(s.score_sum)
+    FROM daily_stats s
+    WHERE since IS NULL OR s.day >= since
+    GROUP BY s.item_type, s.category;
+$$ LANGUAGE sql STABLE;
+
+-- Which of the given post IDs were already processed (live or archived), in one round trip
+CREATE OR REPLACE FUNCTION processed_ids(ids BIGINT[])
+RETURNS TABLE (id BIGINT) AS $$
+    SELECT p.id FROM posts p WHERE p.id = ANY(ids)
+    UNION
+    SELECT a.id FROM archived_post_ids a WHERE a.id = ANY(ids);
+$$ LANGUAGE sql STABLE;
+
+-- Record archived post IDs and delete the posts atomically; returns posts deleted
+CREATE OR REPLACE FUNCTION archive_posts(ids BIGINT[])
+RETURNS INTEGER AS $$
+    INSERT INTO archived_post_ids (id) SELECT unnest(ids) ON CONFLICT DO NOTHING;
+    WITH deleted AS (DELETE FROM posts WHERE id = ANY(ids) RETURNING 1)
+    SELECT count(*)::integer FROM deleted;
+$$ LANGUAGE sql;
@@ -0,0 +1,208 @@
+import os
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+import config
+import models
+
+# AIDEV-NOTE: Trend stage - weekly aggregates over the whole analytics store, published
+# as reports/trends.json and the markdown report's Trends section.
+# Per-week counts (type mix, score bins, categories, domains) are computed in DuckDB and
+# kept in analytics/trend_weeks.json. Each run re-aggregates only from the oldest week
+# that received new rows (usually the last one or two), so cost tracks new data, not
+# history. Needs duckdb (see analytics_queries.py); without it trends are skipped.
+
+TRENDS_FILE = 'trends.json'
+STATE_FILE = 'trend_weeks.json'
+SCORE_BINS = 10
+
+def _week_start(created_time: int) -> int:
+    """Unix time of the Monday 00:00 UTC that starts the post's ISO week"""
+    posted = datetime.fromtimestamp(created_time, tz=timezone.utc)
+    monday = (posted - timedelta(days=posted.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+    return int(monday.timestamp())
+
+def _week_key(created_time: int) -> str:
+    year, week, _ = datetime.fromtimestamp(created_time, tz=timezone.utc).isocalendar()
+    return f"{year}-W{week:02d}"
+
+def _week_keys(last_key: str, count: int) -> List[str]:
+    """The count consecutive ISO week keys ending with last_key, oldest first"""
+    year, week = last_key.split('-W')
+    monday = datetime.fromisocalendar(int(year), int(week), 1).replace(tzinfo=timezone.utc)
+    return [_week_key(int((monday - timedelta(weeks=i)).timestamp())) for i in range(count - 1, -1, -1)]
+
+def _empty_week() -> Dict:
+    return {'startups': 0, 'innovations': 0, 'score_sum': 0.0,
+            'bins': [0] * SCORE_BINS, 'categories': {}, 'domains': {}}
+
+def _write_atomic(path: str, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(models.encode(data))
+    os.replace(tmp_path, path)
+
+def load_state(path: str) -> Dict:
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {'run_time': 0, 'weeks': {}}
+
+def refresh_weeks(queries, state: Dict) -> bool:
+    """
+    Re-aggregate the weeks that received rows since the state was last refreshed
+
+    Args:
+        queries: analytics_queries.AnalyticsQueries over the store
+        state: {'run_time', 'weeks'} as kept in STATE_FILE; updated in place
+
+    Returns:
+        True if any week changed
+    """
+    written = queries.written_since(state['run_time'])
+    if written is None:
+        return False
+
+    since = _week_start(written['oldest_created_time'])
+    first_week = _week_key(since)
+    weeks = {key: week for key, week in state['weeks'].items() if key < first_week}
+
+    def week(key: str) -> Dict:
+        return weeks.setdefault(key, _empty_week())
+
+    for row in queries.weekly_mix(since):
+        week(row['week']).update(startups=row['startups'], innovations=row['innovations'],
+                                 score_sum=float(row['score_sum'] or 0.0))
+    for row in queries.weekly_score_bins(since):
+        week(row['week'])['bins'][row['bin']] = row['discoveries']
+    for row in queries.weekly_categories(since):
+        week(row['week'])['categories'][row['category']] = row['discoveries']
+    for row in queries.weekly_domains(since):
+        week(row['week'])['domains'][row['domain']] = row['discoveries']
+
+    state['weeks'] = weeks
+    state['run_time'] = written['run_time']
+    return True
+
+def _top(counts: Dict, n: int) -> List:
+    return sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:n]
+
+def _sum_counts(weeks: List[Dict], field: str) -> Dict:
+    totals = {}
+    for week in weeks:
+        for key, count in week[field].items():
+            totals[key] = totals.get(key, 0) + count
+    return totals
+
+def _percentile(bins: List[int], fraction: float) -> Optional[int]:
+    """Lower bound of the score bin holding the given fraction of discoveries"""
+    total = sum(bins)
+    if not total:
+        return None
+    seen = 0
+    for score, count in enumerate(bins):
+        seen += count
+        if seen >= total * fraction:
+            return score
+    return len(bins) - 1
+
+def summarize(weeks: Dict, window: Optional[int] = None, top: Optional[int] = None) -> Dict:
+    """
+    Trend summary over the trailing weeks
+
+    Args:
+        weeks: Week key -> aggregates, as kept in STATE_FILE
+        window: Calendar weeks to include, ending with the current one
+            (default: config.TRENDS_WINDOW_WEEKS)
+        top: Categories and domains to list (default: config.TRENDS_TOP_N)
+
+    Returns:
+        The trends.json document
+    """
+    window = window or config.TRENDS_WINDOW_WEEKS
+    top = top or config.TRENDS_TOP_N
+
+    # Calendar weeks ending with the current one; weeks without discoveries count as 0
+    current_week = _week_key(int(datetime.now(timezone.utc).timestamp()))
+    keys = _week_keys(current_week, window)
+    recent = [weeks.get(key) or _empty_week() for key in keys]
+
+    # The current week is still filling up - growth compares the last complete week
+    # with the one before it
+    growth_week, previous_week = _week_keys(current_week, 3)[1::-1]
+    growth_categories = (weeks.get(growth_week) or _empty_week())['categories']
+    previous_categories = (weeks.get(previous_week) or _empty_week())['categories']
+
+    series = []
+    for key, week in zip(keys, recent):
+        total = week['startups'] + week['innovations']
+        series.append({
+            'week': key,
+            'partial': key == current_week,
+            'startups': week['startups'],
+            'innovations': week['innovations'],
+            'startup_share': round(week['startups'] / total, 3) if total else None,
+            'avg_score': round(week['score_sum'] / total, 2) if total else None,
+        })
+
+    # Week-over-week growth of the window's leading categories, with their weekly series
+    categories = []
+    for category, count in _top(_sum_counts(recent, 'categories'), top):
+        counts = [week['categories'].get(category, 0) for week in recent]
+        current = growth_categories.get(category, 0)
+        previous = previous_categories.get(category, 0)
+        categories.append({
+            'category': category,
+            'total': count,
+            'this_week': current,
+            'last_week': previous,
+            'change': current - previous,
+            'change_pct': round((current - previous) / previous * 100, 1) if previous else None,
+            'series': counts,
+        })
+
+    bins = [sum(week['bins'][i] for week in recent) for i in range(SCORE_BINS)]
+    return {
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'window_weeks': len(keys),
+        'growth_week': growth_week,
+        'weeks': series,
+        'category_growth': categories,
+        'score_distribution': {'bins': bins, 'p50': _percentile(bins, 0.5), 'p90': _percentile(bins, 0.9)},
+        'top_domains': [{'domain': domain, 'discoveries': count}
+                        for domain, count in _top(_sum_counts(recent, 'domains'), top)],
+    }
+
+def update(report_dir: Optional[str] = None, analytics_dir: Optional[str] = None) -> Optional[Dict]:
+    """
+    Refresh the weekly aggregates and publish trends.json
+
+    Args:
+        report_dir: Where trends.json goes (default: config.REPORT_DIR)
+        analytics_dir: Analytics store, which also holds the aggregate state
+            (default: config.ANALYTICS_DIR)
+
+    Returns:
+        The trends document, or None when duckdb is missing or the store is empty
+    """
+    from analytics_queries import AnalyticsQueries
+
+    analytics_dir = analytics_dir or config.ANALYTICS_DIR
+    try:
+        queries = AnalyticsQueries(analytics_dir)
+    except ImportError:
+        return None
+
+    state_path = os.path.join(analytics_dir, STATE_FILE)
+    state = load_state(state_path)
+    if refresh_weeks(queries, state):
+        _write_atomic(state_path, state)
+    if not state['weeks']:
+        return None
+
+    trends = summarize(state['weeks'])
+    report_dir = report_dir or config.REPORT_DIR
+    os.makedirs(report_dir, exist_ok=True)
+    _write_atomic(os.path.join(report_dir, TRENDS_FILE), trends)
+    return trends
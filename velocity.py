@@ -0,0 +1,184 @@
+import os
+import sys
+import json
+import time
+import base64
+from array import array
+from typing import Dict, List, Optional, Set
+import config
+
+# AIDEV-NOTE: Score-velocity tracker for early detection of fast-rising posts
+# Each tracked story keeps a delta-encoded, array-backed time series of
+# (sample time, score, comments). Velocity is points gained per hour, which lets
+# young breakout posts into analysis before they reach the static score thresholds.
+
+class ScoreSeries:
+    __slots__ = ('created', 'times', 'scores', 'comments', '_last')
+
+    def __init__(self, created: int):
+        self.created = created
+        # Deltas from the previous sample; the first entry is relative to `created`/0
+        self.times = array('i')
+        self.scores = array('i')
+        self.comments = array('i')
+        self._last = (created, 0, 0)
+
+    def __len__(self):
+        return len(self.times)
+
+    def append(self, sample_time: int, score: int, comments: int) -> bool:
+        """Add a sample; returns False for stale or duplicate samples"""
+        last_time, last_score, last_comments = self._last
+        if self.times and sample_time <= last_time:
+            return False
+
+        self.times.append(sample_time - last_time)
+        self.scores.append(score - last_score)
+        self.comments.append(comments - last_comments)
+        self._last = (sample_time, score, comments)
+        return True
+
+    def samples(self) -> List[tuple]:
+        """Decode into absolute (time, score, comments) tuples"""
+        result = []
+        t, s, c = self.created, 0, 0
+        for dt, ds, dc in zip(self.times, self.scores, self.comments):
+            t, s, c = t + dt, s + ds, c + dc
+            result.append((t, s, c))
+        return result
+
+    @property
+    def latest(self) -> tuple:
+        return self._last
+
+    def velocity(self, window_seconds: int) -> float:
+        """
+        Points gained per hour over the trailing window
+
+        With a single sample (or none inside the window) this falls back to the
+        average rate since the post was created, which is what a first sighting tells us.
+        Stories are submitted with 1 point, so that is the baseline at creation.
+        """
+        last_time, last_score, _ = self._last
+        base_time, base_score = self.created, 1
+        for t, s, _ in self.samples():
+            if t >= last_time - window_seconds and t < last_time:
+                base_time, base_score = t, s
+                break
+
+        elapsed = max(last_time - base_time, 60)
+        return (last_score - base_score) * 3600.0 / elapsed
+
+    def to_record(self) -> Dict:
+        return {
+            'created': self.created,
+            't': _encode(self.times),
+            's': _encode(self.scores),
+            'c': _encode(self.comments)
+        }
+
+    @classmethod
+    def from_record(cls, record: Dict) -> 'ScoreSeries':
+        series = cls(record['created'])
+        series.times = _decode(record['t'])
+        series.scores = _decode(record['s'])
+        series.comments = _decode(record['c'])
+        if series.times:
+            series._last = series.samples()[-1]
+        return series
+
+
+def _encode(values: array) -> str:
+    # Store little-endian so the file is portable between hosts
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return base64.b64encode(values.tobytes()).decode('ascii')
+
+
+def _decode(data: str) -> array:
+    values = array('i')
+    values.frombytes(base64.b64decode(data))
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+class VelocityTracker:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or config.VELOCITY_PATH
+        self.series: Dict[int, ScoreSeries] = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.series = {int(k): ScoreSeries.from_record(v) for k, v in data.items()}
+        except (ValueError, KeyError) as e:
+            print(f"Error loading velocity data, starting fresh: {e}")
+            self.series = {}
+
+    def save(self):
+        """Persist all series atomically"""
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({str(k): v.to_record() for k, v in self.series.items()},
+                      f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+    def sample(self, posts: List[Dict], now: Optional[int] = None):
+        """
+        Record a (score, comments) sample for each post and annotate it with its velocity
+
+        Args:
+            posts: HN posts from the latest sync
+            now: Sample time; defaults to each post's `fetched_at` or the current time
+        """
+        now = now or int(time.time())
+        window = int(config.VELOCITY_WINDOW_HOURS * 3600)
+
+        for post in posts:
+            series = self.series.get(post['id'])
+            if series is None:
+                series = self.series[post['id']] = ScoreSeries(post.get('time', now))
+            series.append(post.get('fetched_at', now), post.get('score', 0), post.get('descendants', 0))
+            post['velocity'] = round(series.velocity(window), 2)
+
+        self.prune(now)
+        self.save()
+
+    def prune(self, now: Optional[int] = None):
+        """Stop tracking stories older than VELOCITY_TRACK_HOURS"""
+        now = now or int(time.time())
+        cutoff = now - int(config.VELOCITY_TRACK_HOURS * 3600)
+        self.series = {k: v for k, v in self.series.items() if v.created >= cutoff}
+
+    def rank(self, posts: List[Dict], now: Optional[int] = None) -> List[Dict]:
+        """Young posts (within VELOCITY_MAX_AGE_HOURS) ordered by velocity, fastest first"""
+        now = now or int(time.time())
+        max_age = config.VELOCITY_MAX_AGE_HOURS * 3600
+        young = [p for p in posts if 'velocity' in p and now - p.get('time', 0) <= max_age]
+        return sorted(young, key=lambda p: p['velocity'], reverse=True)
+
+    def promoted_ids(self, posts: List[Dict], now: Optional[int] = None) -> Set[int]:
+        """
+        IDs of young posts rising faster than VELOCITY_MIN_POINTS_PER_HOUR
+
+        A single sample of a brand-new post says little (a couple of early votes look
+        like a steep rate), so a post needs two samples or VELOCITY_MIN_AGE_MINUTES of
+        age before velocity alone can promote it.
+        """
+        min_age = config.VELOCITY_MIN_AGE_MINUTES * 60
+        promoted = set()
+        for post in self.rank(posts, now):
+            if post['velocity'] < config.VELOCITY_MIN_POINTS_PER_HOUR:
+                break
+            series = self.series.get(post['id'])
+            if series is None:
+                continue
+            if len(series) >= 2 or series.latest[0] - series.created >= min_age:
+                promoted.add(post['id'])
+        return promoted
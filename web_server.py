@@ -1,16 +1,215 @@
 #!/usr/bin/env python3
 
 import os
+import gzip
 import json
+import signal
+import hashlib
 import subprocess
 import threading
-from http.server import HTTPServer, SimpleHTTPRequestHandler
-from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
 import sys
+import config
+import models
+import snapshots
+from models import Discovery
 
 # AIDEV-NOTE: Simple web server to serve the dashboard and handle API requests
+# Requests run on a bounded thread pool (DASHBOARD_WORKERS) over HTTP/1.1 keep-alive, so
+# every response must carry Content-Length. An idle keep-alive connection holds a worker
+# for at most DASHBOARD_KEEPALIVE_TIMEOUT, and responses ask the client to close while
+# other connections are waiting for a worker or the server is shutting down.
+
+_backend = None
+
+class CachedReport:
+    """
+    A report file held in memory with its gzip and brotli bodies, reloaded when the
+    file's mtime or size changes
+    
+    get() returns (etag, {encoding: body}); the ETag is a content hash, so it survives
+    server restarts and identical republishes.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._key = None
+        self._entry = None
+    
+    def get(self):
+        """(etag, bodies) for the current file, or None if it doesn't exist"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        key = (stat.st_mtime_ns, stat.st_size)
+        if key != self._key:
+            with self._lock:
+                if key != self._key:
+                    self._entry = self._load()
+                    self._key = key
+        return self._entry
+    
+    def _load(self):
+        with open(self.path, 'rb') as f:
+            body = f.read()
+        bodies = {'identity': body, 'gzip': gzip.compress(body, compresslevel=6, mtime=0)}
+        try:
+            import brotli
+            bodies['br'] = brotli.compress(body, quality=5)
+        except ImportError:
+            pass
+        return f'"{hashlib.sha1(body).hexdigest()[:20]}"', bodies
+
+LATEST_REPORT = CachedReport(os.path.join(config.REPORT_DIR, 'latest.json'))
+
+def get_backend():
+    """The same database backend main.py writes to, migrated on first use"""
+    global _backend
+    if _backend is None:
+        from storage import get_backend
+        _backend = get_backend()
+        _backend.init_database()  # Make sure run_history and the search index are current
+    return _backend
+
+def get_recent_runs(limit=200):
+    """Load run history from the database"""
+    return get_backend().get_recent_runs(limit)
+
+def search_result(row):
+    """Shape a search row like a latest.json discovery, so the dashboard can render it"""
+    return {**Discovery.from_row(row).to_dict(), 'rank': row.get('rank'), 'snippet': row.get('snippet')}
+
+def _run_timestamp(run):
+    """run_history.run_time is stored as a naive UTC timestamp string"""
+    value = str(run.get('run_time') or '').replace('Z', '')
+    try:
+        return datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        return 0.0
+
+def render_metrics(runs):
+    """Render run telemetry in the Prometheus text exposition format"""
+    lines = []
+    
+    def metric(name, help_text, value, labels=None):
+        if value is None:
+            return
+        label_str = '{' + ','.join(f'{k}="{v}"' for k, v in labels.items()) + '}' if labels else ''
+        if not any(line.startswith(f'# HELP {name} ') for line in lines):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} gauge')
+        lines.append(f'{name}{label_str} {value}')
+    
+    metric('hn_discoveries_runs_recorded', 'Runs present in the inspected run history window', len(runs))
+    
+    if runs:
+        last = runs[0]
+        telemetry = last.get('telemetry') or {}
+        duration = last.get('duration_seconds')
+        
+        metric('hn_discoveries_last_run_timestamp_seconds', 'Unix time of the last run', _run_timestamp(last))
+        metric('hn_discoveries_last_run_success', '1 if the last run completed', int(last.get('status') == 'completed'))
+        metric('hn_discoveries_last_run_duration_seconds', 'Wall time of the last run', duration)
+        metric('hn_discoveries_last_run_posts_fetched', 'Posts fetched in the last run', last.get('total_posts_fetched'))
+        metric('hn_discoveries_last_run_posts_processed', 'Posts analyzed in the last run', last.get('posts_processed'))
+        metric('hn_discoveries_last_run_new_discoveries', 'Discoveries found in the last run',
+               last.get('new_startups_found', last.get('new_discoveries_found')))
+        if duration:
+            metric('hn_discoveries_last_run_posts_per_second', 'Analysis throughput of the last run',
+                   round((last.get('posts_processed') or 0) / duration, 4))
+        
+        for column, help_text in [
+            ('hn_requests', 'HN API requests in the last run'),
+            ('hn_errors', 'Failed HN API requests in the last run'),
+            ('llm_requests', 'LLM requests in the last run'),
+            ('llm_tokens', 'LLM tokens used in the last run'),
+            ('llm_errors', 'Failed LLM requests in the last run'),
+            ('errors', 'Total errors in the last run'),
+            ('queue_depth', 'Candidates left in the analysis queue after the last run'),
+        ]:
+            metric(f'hn_discoveries_last_run_{column}', help_text, last.get(column))
+        
+        hits, misses = last.get('cache_hits') or 0, last.get('cache_misses') or 0
+        if hits + misses:
+            metric('hn_discoveries_last_run_cache_hit_ratio',
+                   'Share of analyses served from the checkpoint journal', round(hits / (hits + misses), 4))
+        
+        for key, help_text in [
+            ('write_lag_avg_seconds', 'Average delay from queuing a row to committing it in the last run'),
+            ('write_lag_max_seconds', 'Longest delay from queuing a row to committing it in the last run'),
+            ('writes_retried', 'Database batch writes retried in the last run'),
+            ('writes_spilled', 'Rows spilled to the local journal because the database rejected them'),
+        ]:
+            metric(f'hn_discoveries_last_run_{key}', help_text, telemetry.get(key))
+        
+        for stage, seconds in sorted((telemetry.get('stage_seconds') or {}).items()):
+            metric('hn_discoveries_last_run_stage_seconds', 'Time spent per pipeline stage in the last run',
+                   seconds, {'stage': stage})
+        
+        # Rolling usage against the configured per-run LLM budget, for quota alerts
+        cutoff = datetime.now(timezone.utc).timestamp() - 24 * 60 * 60
+        recent = [run for run in runs if _run_timestamp(run) >= cutoff]
+        metric('hn_discoveries_llm_tokens_24h', 'LLM tokens used by runs in the last 24 hours',
+               sum(run.get('llm_tokens') or 0 for run in recent))
+        metric('hn_discoveries_llm_requests_24h', 'LLM requests made by runs in the last 24 hours',
+               sum(run.get('llm_requests') or 0 for run in recent))
+    
+    metric('hn_discoveries_llm_token_budget', 'Configured per-run LLM token budget (0 = unlimited)',
+           config.LLM_TOKEN_BUDGET)
+    metric('hn_discoveries_llm_request_budget', 'Configured per-run LLM request budget (0 = unlimited)',
+           config.LLM_REQUEST_BUDGET)
+    
+    return '\n'.join(lines) + '\n'
+
+class DashboardServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer on a fixed-size pool, with a drain on shutdown"""
+    
+    # server_close() waits for in-flight requests instead of abandoning them
+    daemon_threads = False
+    # Listen backlog - the default of 5 drops connection bursts into 1s SYN retries
+    request_queue_size = 128
+    
+    def __init__(self, server_address, handler_class, workers=None):
+        super().__init__(server_address, handler_class)
+        workers = config.DASHBOARD_WORKERS if workers is None else workers
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='dashboard') if workers else None
+        self.draining = False
+        self._waiting = 0
+        self._lock = threading.Lock()
+    
+    def process_request(self, request, client_address):
+        if self.pool is None:
+            # One thread per connection
+            return super().process_request(request, client_address)
+        with self._lock:
+            self._waiting += 1
+        self.pool.submit(self._process_pooled, request, client_address)
+    
+    def _process_pooled(self, request, client_address):
+        with self._lock:
+            self._waiting -= 1
+        self.process_request_thread(request, client_address)
+    
+    def should_close(self):
+        """True when a keep-alive connection should give its worker back"""
+        return self.draining or self._waiting > 0
+    
+    def server_close(self):
+        self.draining = True
+        super().server_close()
+        if self.pool is not None:
+            self.pool.shutdown(wait=True)
 
 class DashboardHandler(SimpleHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Socket timeout - also how long an idle keep-alive connection is kept open
+    timeout = config.DASHBOARD_KEEPALIVE_TIMEOUT
+    
     def __init__(self, *args, **kwargs):
         # Set the directory to serve files from
         super().__init__(*args, directory=".", **kwargs)
@@ -26,6 +225,21 @@ class DashboardHandler(SimpleHTTPRequestHandler):
             # Serve the latest report
             self.serve_latest_report()
             return
+        elif parsed_path.path == '/metrics':
+            self.serve_metrics()
+            return
+        elif parsed_path.path == '/api/search':
+            self.serve_search(parse_qs(parsed_path.query))
+            return
+        elif parsed_path.path == '/api/stats':
+            self.serve_stats(parse_qs(parsed_path.query))
+            return
+        elif parsed_path.path == '/api/changes':
+            self.serve_changes(parse_qs(parsed_path.query))
+            return
+        elif parsed_path.path.startswith('/reports/shards/'):
+            self.serve_shard(parsed_path.path[len('/reports/shards/'):])
+            return
         
         # Default file serving
         super().do_GET()
@@ -37,25 +251,53 @@ class DashboardHandler(SimpleHTTPRequestHandler):
         else:
             self.send_error(404)
     
+    def accepted_encodings(self):
+        """Content codings in Accept-Encoding, minus any refused with q=0"""
+        accepted = set()
+        for entry in self.headers.get('Accept-Encoding', '').split(','):
+            name, *params = [part.strip() for part in entry.split(';')]
+            if not any(param.replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000') for param in params):
+                accepted.add(name)
+        return accepted
+    
     def serve_latest_report(self):
-        """Serve the latest JSON report"""
+        """
+        Serve the latest JSON report from memory, compressed when the client accepts it
+        
+        Responses carry a strong ETag and Cache-Control: no-cache, so polling clients
+        revalidate and get 304 Not Modified until a new report is published.
+        """
         try:
-            report_path = os.path.join('reports', 'latest.json')
-            if os.path.exists(report_path):
+            cached = LATEST_REPORT.get()
+            if cached is not None:
+                etag, bodies = cached
+                accepted = self.accepted_encodings()
+                encoding = next((e for e in ('br', 'gzip') if e in bodies and e in accepted), 'identity')
+                # Each encoding is a different representation, so it gets its own strong tag
+                tag = etag if encoding == 'identity' else f'{etag[:-1]}-{encoding}"'
+                
+                requested = {t.strip().removeprefix('W/') for t in self.headers.get('If-None-Match', '').split(',')}
+                if tag in requested or '*' in requested:
+                    self.send_response(304)
+                    self.send_header('ETag', tag)
+                    self.send_header('Cache-Control', 'no-cache')
+                    self.send_header('Vary', 'Accept-Encoding')
+                    self.end_headers()
+                    return
+                
+                body = bodies[encoding]
                 self.send_response(200)
                 self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
+                if encoding != 'identity':
+                    self.send_header('Content-Encoding', encoding)
+                self.send_header('ETag', tag)
+                self.send_header('Cache-Control', 'no-cache')
+                self.send_header('Vary', 'Accept-Encoding')
+                self.send_header('Content-Length', str(len(body)))
                 self.end_headers()
-                
-                with open(report_path, 'r', encoding='utf-8') as f:
-                    self.wfile.write(f.read().encode())
+                self.wfile.write(body)
             else:
                 # No report exists yet, return empty structure
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                
                 empty_report = {
                     'metadata': {
                         'total_discoveries': 0,
@@ -65,16 +307,141 @@ class DashboardHandler(SimpleHTTPRequestHandler):
                     },
                     'discoveries': []
                 }
-                self.wfile.write(json.dumps(empty_report).encode())
+                body = models.encode(empty_report)
+                
+                self.send_response(200)
+                self.send_header('Content-type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
                 
         except Exception as e:
             self.send_error(500, f"Error serving report: {str(e)}")
     
+    def serve_metrics(self):
+        """Serve run telemetry for Prometheus scraping"""
+        try:
+            body = render_metrics(get_recent_runs()).encode()
+        except Exception as e:
+            self.send_error(500, f"Error collecting metrics: {str(e)}")
+            return
+        
+        self.send_response(200)
+        self.send_header('Content-type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def serve_search(self, params):
+        """Search-as-you-type over all stored discoveries: /api/search?q=...&limit=20 (words match as prefixes)"""
+        query = params.get('q', [''])[0].strip()
+        try:
+            limit = min(max(int(params.get('limit', ['20'])[0]), 1), 100)
+        except ValueError:
+            self.send_error(400, "limit must be an integer")
+            return
+        
+        try:
+            results = [search_result(row) for row in get_backend().search_startups(query, limit=limit, prefix=True)]
+        except Exception as e:
+            self.send_error(500, f"Error searching discoveries: {str(e)}")
+            return
+        
+        body = models.encode({'query': query, 'total': len(results), 'discoveries': results})
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def serve_stats(self, params):
+        """Discovery counts per type and category: /api/stats?days=7 (all history by default)"""
+        try:
+            days = int(params['days'][0]) if 'days' in params else None
+        except ValueError:
+            self.send_error(400, "days must be an integer")
+            return
+        
+        try:
+            stats = get_backend().get_discovery_stats(days=days)
+        except Exception as e:
+            self.send_error(500, f"Error collecting stats: {str(e)}")
+            return
+        
+        body = models.encode({'days': days, **stats})
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def serve_changes(self, params):
+        """
+        Discoveries added, updated or removed since a latest.json version: /api/changes?since=12
+        
+        Responds {"full": true, "version": N} when the client is too far behind (or ahead)
+        and should refetch /reports/latest.json instead.
+        """
+        try:
+            since = int(params['since'][0])
+        except (KeyError, ValueError):
+            self.send_error(400, "since must be an integer version")
+            return
+        
+        changes = snapshots.changes_since(since)
+        if changes is None:
+            changes = {'full': True, 'version': snapshots.load_manifest()['version']}
+        
+        body = models.encode(changes)
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def serve_shard(self, name):
+        """
+        Serve a time shard or the shard manifest, precompressed when the client accepts it
+
+        Shard files are content-hashed and never change, so they are cached for a year;
+        the manifest is revalidated on every load.
+        """
+        shard_dir = os.path.realpath(os.path.join(config.REPORT_DIR, snapshots.SHARD_DIR))
+        path = os.path.realpath(os.path.join(shard_dir, name))
+        if os.path.dirname(path) != shard_dir or not name.endswith('.json') or not os.path.isfile(path):
+            self.send_error(404)
+            return
+        
+        accepted = self.accepted_encodings()
+        encoding = None
+        for candidate, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if candidate in accepted and os.path.isfile(path + suffix):
+                encoding, path = candidate, path + suffix
+                break
+        
+        with open(path, 'rb') as f:
+            body = f.read()
+        
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Vary', 'Accept-Encoding')
+        if name == snapshots.SHARD_MANIFEST:
+            self.send_header('Cache-Control', 'no-cache')
+        else:
+            self.send_header('Cache-Control', 'public, max-age=31536000, immutable')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
     def handle_refresh(self):
         """Handle refresh request by running the agent"""
+        body = json.dumps({'status': 'refresh_started'}).encode()
         self.send_response(200)
         self.send_header('Content-type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Content-Length', str(len(body)))
         self.end_headers()
         
         # Start refresh in background thread
@@ -90,20 +457,35 @@ class DashboardHandler(SimpleHTTPRequestHandler):
         thread.daemon = True
         thread.start()
         
-        response = {'status': 'refresh_started'}
-        self.wfile.write(json.dumps(response).encode())
+        self.wfile.write(body)
     
     def end_headers(self):
-        """Add CORS headers"""
+        """Add CORS headers (for every response - handlers must not add them again)"""
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        # send_error() has already sent Connection: close and set close_connection
+        if self.server.should_close() and not self.close_connection:
+            # Also sets close_connection, so the worker is freed after this response
+            self.send_header('Connection', 'close')
         super().end_headers()
 
-def run_server(port=8080):
-    """Run the web server"""
+def run_server(port=8080, workers=None):
+    """
+    Run the web server until Ctrl+C or SIGTERM, then finish in-flight requests
+    
+    Args:
+        port: Port to listen on
+        workers: Request threads (default: config.DASHBOARD_WORKERS; 0 = one per connection)
+    """
     server_address = ('', port)
-    httpd = HTTPServer(server_address, DashboardHandler)
+    httpd = DashboardServer(server_address, DashboardHandler, workers)
+    
+    # serve_forever() must be stopped from another thread
+    def stop(signum, frame):
+        threading.Thread(target=httpd.shutdown, daemon=True).start()
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, stop)
     
     print(f"Dashboard server running at http://localhost:{port}")
     print(f"Open http://localhost:{port} in your browser to view the dashboard")
@@ -112,14 +494,17 @@ def run_server(port=8080):
     try:
         httpd.serve_forever()
     except KeyboardInterrupt:
-        print("\nShutting down server...")
-        httpd.shutdown()
+        pass
+    print("\nShutting down server...")
+    httpd.server_close()
 
 if __name__ == '__main__':
     import argparse
     
     parser = argparse.ArgumentParser(description='HN Discoveries Dashboard Server')
     parser.add_argument('--port', type=int, default=8080, help='Port to run server on')
+    parser.add_argument('--workers', type=int, default=None,
+                        help=f'Request threads (default: {config.DASHBOARD_WORKERS}; 0 = one per connection)')
     args = parser.parse_args()
     
-    run_server(args.port)
\ No newline at end of file
+    run_server(args.port, args.workers)
\ No newline at end of file